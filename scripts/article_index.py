@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from dedup import SimHashIndex, simhash
+from retry_policy import RETRY_RUNS
+
+logger = logging.getLogger(__name__)
+
+# 定数（リポジトリには記事データ articles_data.json だけをコミットし、索引は実行間のキャッシュに置く）
+INDEX_DB = Path(__file__).parent.parent / ".cache" / "articles.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    date TEXT,
+    status TEXT NOT NULL,
+    content_hash TEXT,
+    discovered_at REAL,
+    fetched_at REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_date ON articles (date);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    id TEXT PRIMARY KEY,
+    simhash TEXT,
+    duplicate_of TEXT
+);
+CREATE TABLE IF NOT EXISTS retry_queue (
+    id TEXT PRIMARY KEY,
+    reason TEXT,
+    attempts INTEGER NOT NULL,
+    queued_at REAL NOT NULL
+);
+"""
+
+
+class ArticleIndex:
+    """
+    取得済みの記事を記録するSQLiteの索引（IDは generate_article_id のハッシュ）
+
+    本文のSimHashも記録し、既存の記事とほぼ同じ本文の記事には duplicate_of（元の記事のID）を付ける。
+    再試行可能な失敗と、画像の一部を取得できなかった記事は再試行キューに入れ、後の実行で先に取り直す。
+    """
+
+    def __init__(self, path=INDEX_DB):
+        """
+        記事索引を開く
+
+        Args:
+            path (Path): データベースファイルのパス
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+        # 発見時の確認をO(1)で行うため、取得済みIDはメモリにも持つ
+        self.fetched_ids = {
+            row[0] for row in self.conn.execute("SELECT id FROM articles WHERE status = 'fetched'")
+        }
+
+        # 重複の判定には、重複ではない記事のSimHashだけを使う（重複の重複は元の記事に寄せる）
+        self.fingerprints = SimHashIndex()
+        for article_id, value in self.conn.execute(
+            "SELECT id, simhash FROM fingerprints WHERE duplicate_of IS NULL AND simhash IS NOT NULL"
+        ):
+            self.fingerprints.add(article_id, int(value, 16))
+        self.backfill_fingerprints()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def is_fetched(self, article_id):
+        """取得済みの記事かどうか"""
+        return article_id in self.fetched_ids
+
+    def record(self, article):
+        """
+        記事の取得結果を記録
+
+        Args:
+            article (dict): 記事情報（エラーの場合は 'error' を含む）
+        """
+        status = 'error' if 'error' in article else 'fetched'
+        content_hash = None
+        if article.get('content'):
+            content_hash = hashlib.sha256(article['content']['content_text'].encode()).hexdigest()
+
+        now = time.time()
+        with self.lock, self.conn:
+            self.update_retry_queue(article, status, now)
+            if status == 'error' and article['id'] in self.fetched_ids:
+                # 取得済みの記事の取り直し（再試行キュー）に失敗した場合は、前回の結果を残す
+                return
+
+            # 本文がほぼ同じ記事があれば、その記事の重複として記録する
+            if article.get('content'):
+                value, duplicate_of = self.fingerprint(article['id'], article['content']['content_text'])
+                self.save_fingerprint(article['id'], value, duplicate_of)
+                if duplicate_of:
+                    article['duplicate_of'] = duplicate_of
+                else:
+                    article.pop('duplicate_of', None)
+            self.conn.execute(
+                """
+                INSERT INTO articles (id, url, title, date, status, content_hash, discovered_at, fetched_at, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    date = excluded.date,
+                    status = excluded.status,
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at,
+                    data = excluded.data
+                """,
+                (
+                    article['id'], article['url'], article.get('title'), article.get('date'),
+                    status, content_hash, now, now, json.dumps(article, ensure_ascii=False)
+                )
+            )
+
+        if status == 'fetched':
+            self.fetched_ids.add(article['id'])
+        else:
+            self.fetched_ids.discard(article['id'])
+
+    def record_all(self, articles):
+        """複数の記事をまとめて記録"""
+        for article in articles:
+            self.record(article)
+
+    def update_retry_queue(self, article, status, now):
+        """
+        再試行キューを更新（再試行可能な失敗と、画像の一部を取得できなかった記事を入れる）
+
+        キューに入ってから RETRY_RUNS 回の実行で取得できなかった記事はキューから外す。
+        """
+        if status == 'error':
+            retry = article.get('retryable', False)
+            reason = article['error']
+        else:
+            retry = bool(article.get('incomplete_images'))
+            reason = f"画像{article.get('incomplete_images', 0)}件を取得できませんでした"
+
+        row = self.conn.execute("SELECT attempts FROM retry_queue WHERE id = ?", (article['id'],)).fetchone()
+        if not retry:
+            if row:
+                self.conn.execute("DELETE FROM retry_queue WHERE id = ?", (article['id'],))
+            return
+
+        attempts = (row[0] if row else 0) + 1
+        if attempts > RETRY_RUNS:
+            logger.warning(f"記事「{article.get('title')}」は{RETRY_RUNS}回の実行で取り直せなかったため、再試行キューから外します")
+            self.conn.execute("DELETE FROM retry_queue WHERE id = ?", (article['id'],))
+            return
+        self.conn.execute(
+            """
+            INSERT INTO retry_queue (id, reason, attempts, queued_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET reason = excluded.reason, attempts = excluded.attempts
+            """,
+            (article['id'], reason, attempts, now)
+        )
+
+    def retry_queue(self):
+        """
+        再試行キューの記事を取得
+
+        Returns:
+            list: 記事情報のリスト（キューに入った順）
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                """
+                SELECT articles.data FROM retry_queue
+                JOIN articles ON articles.id = retry_queue.id
+                ORDER BY retry_queue.queued_at
+                """
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def retry_queue_size(self):
+        """再試行キューの記事数"""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM retry_queue").fetchone()[0]
+
+    def backfill_fingerprints(self):
+        """SimHashが未記録の取得済みの記事について、記録済みの本文から計算して重複を判定する"""
+        rows = self.conn.execute(
+            """
+            SELECT id, data FROM articles
+            WHERE status = 'fetched' AND id NOT IN (SELECT id FROM fingerprints)
+            ORDER BY discovered_at, id
+            """
+        ).fetchall()
+        if not rows:
+            return
+        with self.conn:
+            for article_id, data in rows:
+                article = json.loads(data)
+                content = article.get('content') or {}
+                value, duplicate_of = self.fingerprint(article_id, content.get('content_text', ''))
+                self.save_fingerprint(article_id, value, duplicate_of)
+                if duplicate_of:
+                    article['duplicate_of'] = duplicate_of
+                    self.conn.execute(
+                        "UPDATE articles SET data = ? WHERE id = ?",
+                        (json.dumps(article, ensure_ascii=False), article_id)
+                    )
+        logger.info(f"記事の本文のSimHashを記録しました: {len(rows)}件")
+
+    def fingerprint(self, article_id, text):
+        """
+        本文のSimHashを計算し、ほぼ同じ本文の記事を探す（重複でなければ判定用の索引に加える）
+
+        Returns:
+            tuple: (SimHash（本文が短ければNone）, 元の記事のID（重複でなければNone）)
+        """
+        value = simhash(text)
+        duplicate_of = None
+        if value is not None:
+            duplicate_of = self.fingerprints.find(value, exclude=article_id)
+        if duplicate_of or value is None:
+            self.fingerprints.remove(article_id)
+        else:
+            self.fingerprints.add(article_id, value)
+        return value, duplicate_of
+
+    def save_fingerprint(self, article_id, value, duplicate_of):
+        self.conn.execute(
+            """
+            INSERT INTO fingerprints (id, simhash, duplicate_of) VALUES (?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET simhash = excluded.simhash, duplicate_of = excluded.duplicate_of
+            """,
+            (article_id, None if value is None else format(value, '016x'), duplicate_of)
+        )
+
+    def duplicate_count(self):
+        """本文の重複として記録された記事数"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM fingerprints WHERE duplicate_of IS NOT NULL"
+            ).fetchone()[0]
+
+    def all_articles(self):
+        """
+        索引に記録された全記事を取得
+
+        Returns:
+            list: 記事情報のリスト（新しい順）
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT data FROM articles ORDER BY date DESC, discovered_at DESC"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        """データベースを閉じる"""
+        with self.lock:
+            self.conn.close()
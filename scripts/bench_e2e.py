@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+スクレイパー全体のベンチマーク（模擬サイトを使い、実サイトには接続しない）
+
+fake_site の模擬サイトを起動し、NikkeiXTrendScraper でログイン・記事検索・記事取得を行って
+1分あたりの記事数、ステップごとの所要時間、転送量を表示する。
+出力先は一時ディレクトリで、data/ や docs/ は変更しない。
+--json で結果を保存すれば、コミット間で結果を比較できる。
+
+使い方:
+    python scripts/bench_e2e.py [--articles 20] [--latency 0.05] [--workers 2] [--mode auto|browser]
+
+Chrome と chromedriver が必要。
+"""
+
+import os
+import json
+import argparse
+import logging
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from fake_site import FakeSite, FakeSiteConfig
+from run_metrics import RunMetrics
+from resource_blocking import BlockingConfig
+import browser_startup
+import request_scheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def run_benchmark(args, site, workdir, blocking):
+    """
+    模擬サイトに対してスクレイパーを実行
+
+    Args:
+        args (Namespace): コマンドライン引数
+        site (FakeSite): 模擬サイト
+        workdir (Path): 出力先の一時ディレクトリ
+        blocking (BlockingConfig): ブラウザで読み込まないリソースの設定
+
+    Returns:
+        dict: 計測結果
+    """
+    # 模擬サイトを対象にする設定は、fetch_articles の読み込み前に行う
+    os.environ['NIKKEI_BASE_URL'] = site.base_url
+    os.environ['NIKKEI_FETCH_MODE'] = args.mode
+    import fetch_articles
+    from image_store import ImageStore
+    from image_downloader import ImageDownloader
+    from request_scheduler import RequestScheduler
+
+    # 出力先を一時ディレクトリに向ける
+    fetch_articles.ARTICLES_DIR = workdir / "articles"
+    fetch_articles.IMAGES_DIR = workdir / "images"
+    fetch_articles.DOCS_DIR = workdir / "docs"
+    # プロファイルは指定が無ければ実行ごとに新しく作る（同じディレクトリを指定すると2回目以降は引き継いだ状態で計測できる）
+    browser_startup.PROFILE_DIR = Path(args.profile_dir) if args.profile_dir else workdir / "profile"
+
+    scheduler = RequestScheduler(initial_rate=args.rate, max_rate=max(args.rate, args.max_rate))
+    store = ImageStore(workdir / "images" / "objects", workdir / "images" / "index.json", root=workdir,
+                       checks_file=workdir / "image_checks.json")
+    downloader = ImageDownloader(store=store, scheduler=scheduler)
+    metrics = RunMetrics()
+    # 最初のページ読み込みまでの時間は、この計測の開始から数える
+    fetch_articles.PROCESS_STARTED = metrics.started
+    scraper = None
+    pool = None
+    try:
+        with metrics.stage('browser_startup'):
+            scraper = fetch_articles.NikkeiXTrendScraper(
+                headless=not args.show_browser, image_downloader=downloader, metrics=metrics, blocking=blocking,
+                scheduler=scheduler
+            )
+        with metrics.stage('login'):
+            if not scraper.login('bench@example.com', 'password'):
+                raise RuntimeError("模擬サイトへのログインに失敗しました")
+        scraper.setup_http_session()
+        with metrics.stage('discovery'):
+            articles = scraper.get_yesterday_articles()
+        with metrics.stage('pool_startup'):
+            pool = fetch_articles.ScraperPool(scraper, args.workers, headless=not args.show_browser)
+        with metrics.stage('fetch'):
+            articles = pool.fetch_all(articles)
+        metrics.status = 'ok'
+    finally:
+        if pool:
+            pool.close()
+        if scraper:
+            scraper.close()
+        downloader.close()
+
+    waits = {}
+    for article in articles:
+        for step, timing in article.get('wait_timings', {}).items():
+            waits.setdefault(step, Counter()).update(timing)
+
+    metrics.info['resource_blocking'] = blocking.describe()
+    metrics.info['request_scheduler'] = scheduler.describe()
+    summary = metrics.summary()
+    fetched = summary['articles'] - summary['errors']
+    fetch_elapsed = summary['stages']['fetch']
+    return dict(
+        summary,
+        config=vars(args),
+        articles_per_minute=round(fetched / fetch_elapsed * 60, 2) if fetch_elapsed else None,
+        articles_per_minute_total=summary['articles_per_minute'],
+        waits={step: {k: round(v, 3) for k, v in entry.items()} for step, entry in waits.items()},
+        server=site.stats(),
+        article_metrics=[a.to_dict() for a in metrics.articles]
+    )
+
+
+def report(result):
+    """計測結果を表示"""
+    logger.info(f"記事数: {result['articles']}件（エラー {result['errors']}件）")
+    logger.info(
+        f"記事取得: {result['articles_per_minute']}件/分、"
+        f"起動からの全体: {result['articles_per_minute_total']}件/分"
+    )
+    for name, seconds in result['stages'].items():
+        logger.info(f"  {name}: {seconds:.2f}秒")
+    logger.info(f"記事あたりの取得時間: {result['article_total']}")
+    for step, dist in result['article_steps'].items():
+        logger.info(f"  {step}: {dist}")
+    logger.info(f"取得経路: {result['fetch_paths']}")
+    for step, entry in result['waits'].items():
+        logger.info(f"待機「{step}」: {entry}")
+    logger.info(f"カウンター: {result['counters']}")
+    server = result['server']
+    logger.info(f"転送量: 合計 {sum(server['bytes'].values())}バイト {server['bytes']}")
+    logger.info(f"リクエスト数: {server['requests']}")
+
+
+def compare_blocking(on, off):
+    """リソースの遮断あり・なしでページ読み込み時間と転送量を比較"""
+    def page_load(result):
+        return result['article_steps'].get('page_load', {}).get('mean')
+
+    def browser_bytes(result):
+        counters = result['counters']
+        return counters.get('page_bytes', 0) + counters.get('resource_bytes', 0)
+
+    def server_bytes(result):
+        return sum(result['server']['bytes'].values())
+
+    logger.info("===== リソースの遮断の効果（あり / なし） =====")
+    logger.info(f"記事あたりのページ読み込み時間（平均）: {page_load(on)}秒 / {page_load(off)}秒")
+    logger.info(f"ブラウザの転送量: {browser_bytes(on)}バイト / {browser_bytes(off)}バイト")
+    logger.info(f"模擬サイトの送信量: {server_bytes(on)}バイト / {server_bytes(off)}バイト")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="模擬サイトを使ったスクレイパー全体のベンチマーク")
+    parser.add_argument('--articles', type=int, default=20, help="昨日公開の記事数")
+    parser.add_argument('--older-articles', type=int, default=20, help="それより前に公開された記事数")
+    parser.add_argument('--latency', type=float, default=0.05, help="模擬サイトの応答遅延（秒）")
+    parser.add_argument('--paragraphs', type=int, default=30, help="記事ごとの段落数")
+    parser.add_argument('--images', type=int, default=3, help="記事ごとの画像数")
+    parser.add_argument('--image-size', type=int, default=50000, help="画像1枚のバイト数")
+    parser.add_argument('--button-ratio', type=float, default=0.5, help="「続き」ボタンを持つ記事の割合")
+    parser.add_argument('--workers', type=int, default=2, help="ブラウザセッション数")
+    parser.add_argument('--mode', choices=['auto', 'browser'], default='auto', help="記事の取得モード")
+    parser.add_argument('--rate', type=float, default=request_scheduler.INITIAL_RATE,
+                        help="ホストごとの開始時のリクエスト数/秒")
+    parser.add_argument('--max-rate', type=float, default=request_scheduler.MAX_RATE,
+                        help="ホストごとのリクエスト数/秒の上限")
+    parser.add_argument('--capacity', type=float, default=0,
+                        help="模擬サイトが1秒あたりに受け付けるリクエスト数（超えた分は429。0なら制限なし）")
+    parser.add_argument('--error-rate', type=float, default=0, help="模擬サイトが503を返すリクエストの割合")
+    parser.add_argument('--blocking', choices=['on', 'off', 'both'], default='on',
+                        help="リソースの遮断（both: 遮断あり・なしの両方を計測して比較）")
+    parser.add_argument('--block-images', action='store_true', help="遮断ありの場合に画像も読み込まない")
+    parser.add_argument('--block-css', action='store_true', help="遮断ありの場合にスタイルシートも読み込まない")
+    parser.add_argument('--profile-dir', help="実行間で引き継ぐブラウザのプロファイル（省略時は毎回新しく作る）")
+    parser.add_argument('--show-browser', action='store_true', help="ヘッドレスモードを使わない")
+    parser.add_argument('--json', help="計測結果を保存するJSONファイル")
+    args = parser.parse_args()
+
+    config = FakeSiteConfig(
+        articles=args.articles, older_articles=args.older_articles, latency=args.latency,
+        paragraphs=args.paragraphs, images=args.images, image_size=args.image_size,
+        button_ratio=args.button_ratio, capacity=args.capacity, error_rate=args.error_rate
+    )
+    settings = {
+        'on': BlockingConfig(images=args.block_images, css=args.block_css),
+        'off': BlockingConfig.disabled()
+    }
+    names = ['on', 'off'] if args.blocking == 'both' else [args.blocking]
+
+    results = {}
+    site = FakeSite(config).start()
+    try:
+        for name in names:
+            # 実行ごとに画像ストアと送信量の集計を空にする
+            site.reset_stats()
+            with tempfile.TemporaryDirectory() as tmp:
+                logger.info(f"リソースの遮断: {name}")
+                results[name] = run_benchmark(args, site, Path(tmp), settings[name])
+    finally:
+        site.stop()
+
+    for name, result in results.items():
+        logger.info(f"===== リソースの遮断: {name} =====")
+        report(result)
+    if len(results) > 1:
+        compare_blocking(results['on'], results['off'])
+
+    if args.json:
+        output = results if len(results) > 1 else results[names[0]]
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        logger.info(f"計測結果を保存しました: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
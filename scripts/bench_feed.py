@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+フィード配信の負荷試験（feed_server をローカルで起動して計測する）
+
+圧縮なし・gzip・brotli・条件付きリクエスト（304）のそれぞれで、同時接続数を指定して
+同じパスへリクエストを繰り返し、1秒あたりのリクエスト数と1リクエストあたりの転送量を表示する。
+
+使い方:
+    python scripts/bench_feed.py [--path feed.xml] [--requests 2000] [--concurrency 8]
+"""
+
+import time
+import argparse
+import logging
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from feed_server import FeedServer
+from precompress import DOCS_DIR
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SCENARIOS = {
+    'identity': {},
+    'gzip': {'Accept-Encoding': 'gzip'},
+    'br': {'Accept-Encoding': 'br, gzip'},
+    'conditional': {'Accept-Encoding': 'br, gzip'},  # 1回目のETagを If-None-Match に付ける
+}
+
+
+def run_client(base_url, path, headers, count):
+    """1つの接続でリクエストを繰り返す"""
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port)
+    received = 0
+    statuses = {}
+    try:
+        for _ in range(count):
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            received += len(response.read())
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+    finally:
+        conn.close()
+    return received, statuses
+
+
+def run_scenario(server, path, name, requests, concurrency):
+    """
+    1つのシナリオを計測
+
+    Returns:
+        dict: リクエスト数・秒数・リクエスト/秒・1リクエストあたりのバイト数・ステータスごとの件数
+    """
+    headers = dict(SCENARIOS[name])
+    if name == 'conditional':
+        url = urlparse(server.base_url)
+        conn = http.client.HTTPConnection(url.hostname, url.port)
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        conn.close()
+        headers['If-None-Match'] = response.getheader('ETag')
+
+    per_client = max(1, requests // concurrency)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda _: run_client(server.base_url, path, headers, per_client), range(concurrency)
+        ))
+    elapsed = time.perf_counter() - started
+
+    total = per_client * concurrency
+    statuses = {}
+    for _, client_statuses in results:
+        for status, count in client_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    return {
+        'requests': total,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(total / elapsed, 1),
+        'bytes_per_request': round(sum(r[0] for r in results) / total),
+        'statuses': statuses
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="フィード配信の負荷試験")
+    parser.add_argument('--root', default=str(DOCS_DIR), help="配信するディレクトリ")
+    parser.add_argument('--path', default='/feed.xml', help="リクエストするパス")
+    parser.add_argument('--requests', type=int, default=2000, help="シナリオごとのリクエスト数")
+    parser.add_argument('--concurrency', type=int, default=8, help="同時接続数")
+    args = parser.parse_args()
+
+    path = '/' + args.path.lstrip('/')
+    server = FeedServer(args.root, port=0).start()
+    try:
+        for name in SCENARIOS:
+            result = run_scenario(server, path, name, args.requests, args.concurrency)
+            logger.info(
+                f"{name}: {result['requests_per_second']}リクエスト/秒、"
+                f"{result['bytes_per_request']}バイト/リクエスト、ステータス {result['statuses']}"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
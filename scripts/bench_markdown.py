@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+markdown_to_html のマイクロベンチマーク
+
+save_article_as_markdown と同じ形式の合成記事を生成し、変更前の実装
+（legacy_markdown_to_html）と現在の実装の処理時間を比較する。
+計測前に、合成記事とランダムな入力の両方で出力が一致することを確認する。
+
+使い方:
+    python scripts/bench_markdown.py [--articles 2000] [--repeat 5]
+"""
+
+import re
+import random
+import argparse
+import logging
+import timeit
+
+from generate_rss import markdown_to_html
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+WORDS = ["日経", "クロストレンド", "マーケティング", "消費者", "データ", "戦略", "AI", "店舗", "ブランド", "顧客体験"]
+
+def legacy_markdown_to_html(md_content, article):
+    """
+    変更前の実装（文書全体に正規表現を6回以上かける）。比較用
+    
+    Args:
+        md_content (str): Markdown形式の記事内容
+        article (dict): 記事情報
+        
+    Returns:
+        str: HTML形式の記事内容
+    """
+    # 簡易的なMarkdown→HTML変換
+    # 実際のプロジェクトではmarkdown2やmistune等のライブラリを使うことを推奨
+    
+    # タイトル（H1）
+    html = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', md_content, flags=re.MULTILINE)
+    
+    # 見出し（H2）
+    html = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    
+    # 太字
+    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
+    
+    # 段落
+    paragraphs = []
+    for line in html.split('\n\n'):
+        line = line.strip()
+        if line and not line.startswith('<h') and not line.startswith('!['):
+            paragraphs.append(f'<p>{line}</p>')
+        else:
+            paragraphs.append(line)
+    
+    html = '\n\n'.join(paragraphs)
+    
+    # 画像
+    def replace_image(match):
+        alt_text = match.group(1)
+        image_path = match.group(2)
+        
+        # 相対パスを絶対URLに変換（GitHub Pages用）
+        if image_path.startswith('/'):
+            image_path = image_path[1:]  # 先頭の/を削除
+        
+        # GitHub Pagesのベースパス
+        repo_name = "nikkei-xt-rss"  # リポジトリ名
+        base_url = f"https://USERNAME.github.io/{repo_name}"  # USERNAME部分は後で置き換え
+        
+        image_url = f"{base_url}/{image_path}"
+        
+        return f'<img src="{image_url}" alt="{alt_text}" />'
+    
+    html = re.sub(r'!\[(.*?)\]\((.*?)\)', replace_image, html)
+    
+    # リンク
+    html = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', html)
+    
+    return html
+
+def make_article(rng, i):
+    """save_article_as_markdown と同じ構造の合成記事を生成"""
+    md = f"# 合成記事 {i} {rng.choice(WORDS)}の最前線\n\n"
+    md += f"**公開日**: 2025.06.{rng.randint(1, 28):02d}\n\n"
+    md += f"**カテゴリ**: {rng.choice(WORDS)}\n\n"
+    paragraphs = []
+    for _ in range(rng.randint(10, 40)):
+        sentence = "、".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))) + "。"
+        if rng.random() < 0.1:
+            sentence += f"**{rng.choice(WORDS)}**が重要だ。"
+        paragraphs.append(sentence * rng.randint(1, 4))
+    md += "\n\n".join(paragraphs) + "\n\n"
+    images = rng.randint(0, 6)
+    if images:
+        md += "## 画像\n\n"
+        for j in range(images):
+            md += f"![図{j+1} {rng.choice(WORDS)}](/data/images/objects/ab/{i:04d}{j}.jpg)\n\n"
+    md += "**著者**: 日経クロストレンド\n\n"
+    url = f"https://xtrend.nikkei.com/atcl/contents/casestudy/00012/{i:05d}/"
+    md += f"**元記事**: [{url}]({url})\n"
+    return md
+
+def make_fuzz_input(rng):
+    """記号の組み合わせを多く含むランダムな入力を生成"""
+    tokens = ["# ", "## ", "**", "*", "![", "[", "]", "(", ")", "](", "\n", "\n\n", "\n\n\n", " ", "\u3000", "\r", "<h", "a", "記事", "/x"]
+    return "".join(rng.choice(tokens) for _ in range(rng.randint(0, 60)))
+
+def check_equivalence(corpus, rng, fuzz_cases):
+    """新旧の実装の出力が一致することを確認"""
+    for md in corpus + [make_fuzz_input(rng) for _ in range(fuzz_cases)]:
+        expected = legacy_markdown_to_html(md, {})
+        actual = markdown_to_html(md, {})
+        if expected != actual:
+            raise AssertionError(f"出力が一致しません: {md!r}\n期待: {expected!r}\n実際: {actual!r}")
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="markdown_to_html のマイクロベンチマーク")
+    parser.add_argument('--articles', type=int, default=2000, help="合成記事の数")
+    parser.add_argument('--repeat', type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument('--fuzz', type=int, default=20000, help="一致確認に使うランダム入力の数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = [make_article(rng, i) for i in range(args.articles)]
+    total_chars = sum(len(md) for md in corpus)
+    logger.info(f"合成記事: {len(corpus)}件、{total_chars:,}文字")
+
+    check_equivalence(corpus, rng, args.fuzz)
+    logger.info(f"出力の一致を確認しました（合成記事 {len(corpus)}件 + ランダム入力 {args.fuzz}件）")
+
+    def run(func):
+        return min(timeit.repeat(lambda: [func(md, {}) for md in corpus], number=1, repeat=args.repeat))
+
+    legacy = run(legacy_markdown_to_html)
+    current = run(markdown_to_html)
+    logger.info(f"変更前: {legacy:.3f}秒（{len(corpus) / legacy:,.0f}記事/秒）")
+    logger.info(f"現在:   {current:.3f}秒（{len(corpus) / current:,.0f}記事/秒）")
+    logger.info(f"高速化: {legacy / current:.2f}倍")
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
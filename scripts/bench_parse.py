@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ページ解析（記事一覧の解析・記事本文の抽出）のベンチマーク
+
+保存したページ（--fixtures で指定したディレクトリ内の *.html）または合成ページを使い、
+変更前の実装（ページ全体を html.parser で解析し、要素ごとに全体を探索する）と
+page_parser の実装を、利用可能なパーサーごとに比較する。
+計測前に、変更前の実装と結果が一致することを確認する。
+
+使い方:
+    python scripts/bench_parse.py [--fixtures DIR] [--repeat 5]
+"""
+
+import re
+import random
+import importlib.util
+import argparse
+import logging
+import timeit
+from pathlib import Path
+from bs4 import BeautifulSoup
+
+from page_parser import parse_listing, parse_listing_soup, parse_article_soup, make_soup
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://xtrend.nikkei.com/"
+WORDS = ["日経", "クロストレンド", "マーケティング", "消費者", "データ", "戦略", "AI", "店舗", "ブランド", "顧客体験"]
+
+
+def legacy_parse_listing(html, base_url):
+    """変更前の実装（ページ全体を解析してから項目を探す）。比較用"""
+    return parse_listing_soup(BeautifulSoup(html, 'html.parser'), base_url)
+
+
+def legacy_parse_article(html):
+    """変更前の実装（項目ごとに文書全体を探索する）。比較用"""
+    soup = BeautifulSoup(html, 'html.parser')
+
+    title_elem = soup.find('h1')
+    title = title_elem.get_text(strip=True) if title_elem else "タイトルなし"
+
+    date_elem = soup.find('time') or soup.find(class_=lambda c: c and 'date' in c.lower())
+    publish_date = None
+    if date_elem:
+        date_match = re.search(r'(\d{4})[\.年](\d{1,2})[\.月](\d{1,2})', date_elem.get_text(strip=True))
+        if date_match:
+            year, month, day = date_match.groups()
+            publish_date = f"{year}.{month.zfill(2)}.{day.zfill(2)}"
+
+    category_elem = soup.find(class_=lambda c: c and ('category' in c.lower() or 'cat' in c.lower()))
+    category = category_elem.get_text(strip=True) if category_elem else None
+
+    content_elem = None
+    for selector in ['article', '.article-body', '.article-content', 'main', '#article-body', '.content']:
+        content_elem = soup.select_one(selector)
+        if content_elem and len(content_elem.get_text(strip=True)) > 100:
+            break
+
+    if not content_elem:
+        paragraphs = soup.find_all('p')
+        content_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50])
+    else:
+        for elem in content_elem.select('.ad, .advertisement, .related, .share, .social, nav, footer, .footer'):
+            elem.decompose()
+        paragraphs = content_elem.find_all('p')
+        if paragraphs:
+            content_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
+        else:
+            content_text = content_elem.get_text(strip=True)
+
+    author_elem = soup.find(class_=lambda c: c and 'author' in c.lower())
+    author = author_elem.get_text(strip=True) if author_elem else "日経クロストレンド"
+
+    return {
+        'title': title,
+        'publish_date': publish_date,
+        'category': category,
+        'content_text': content_text,
+        'author': author
+    }
+
+
+def sentence(rng, low=8, high=30):
+    return "、".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))) + "。"
+
+
+def make_chrome(rng):
+    """ヘッダー・ナビゲーション・広告など本文以外の要素"""
+    nav = "".join(f'<li class="nav-item"><a href="/atcl/group/{i}/">{rng.choice(WORDS)}</a></li>' for i in range(60))
+    scripts = "".join(f'<script>window.dataLayer=window.dataLayer||[];dataLayer.push({{"id":{i}}});</script>' for i in range(20))
+    return f'<header class="site-header"><nav><ul>{nav}</ul></nav></header>{scripts}'
+
+
+def make_top_page(rng, articles=150):
+    """トップページの合成データ"""
+    items = []
+    for i in range(articles):
+        href = f"/atcl/contents/casestudy/00012/{i:05d}/"
+        if i % 3 == 0:
+            items.append(f'<div class="card"><a href="{href}"><h3>{sentence(rng, 3, 6)}</h3><img src="/img/{i}.jpg"></a></div>')
+        else:
+            items.append(f'<div class="card"><a href="{href}">{sentence(rng, 3, 6)}</a><span class="date">2025.06.{i % 28 + 1:02d}</span></div>')
+    return f'<html><head><title>top</title></head><body>{make_chrome(rng)}<main>{"".join(items)}</main><footer class="footer">{make_chrome(rng)}</footer></body></html>'
+
+
+def make_article_page(rng, i):
+    """記事ページの合成データ"""
+    body = "".join(f"<p>{sentence(rng)}</p>" for _ in range(rng.randint(20, 60)))
+    ads = '<div class="ad"><p>広告テキスト広告テキスト</p></div><div class="related"><p>関連記事</p></div>'
+    return (
+        f'<html><head><title>記事{i}</title></head><body>{make_chrome(rng)}'
+        f'<div class="breadcrumb"><a href="/">トップ</a></div>'
+        f'<h1>合成記事 {i} {rng.choice(WORDS)}</h1>'
+        f'<span class="p-category">{rng.choice(WORDS)}</span>'
+        f'<time>2025年6月{i % 28 + 1}日</time>'
+        f'<article><div class="article-body">{body}{ads}</div>'
+        f'<div class="p-author">{rng.choice(WORDS)} 記者</div></article>'
+        f'<footer class="footer">{make_chrome(rng)}</footer></body></html>'
+    )
+
+
+def load_pages(args):
+    """ベンチマークに使うトップページと記事ページを読み込む（無ければ合成する）"""
+    if args.fixtures:
+        fixtures = sorted(Path(args.fixtures).glob('*.html'))
+        pages = [p.read_text(encoding='utf-8') for p in fixtures]
+        logger.info(f"保存したページを使用します: {len(pages)}件")
+        return pages, pages
+
+    rng = random.Random(args.seed)
+    top_pages = [make_top_page(rng) for _ in range(5)]
+    article_pages = [make_article_page(rng, i) for i in range(args.articles)]
+    logger.info(f"合成ページを使用します: トップ {len(top_pages)}件、記事 {len(article_pages)}件")
+    return top_pages, article_pages
+
+
+def available_parsers():
+    """利用可能なパーサー"""
+    parsers = ['html.parser']
+    if importlib.util.find_spec('lxml'):
+        parsers.append('lxml')
+    return parsers
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="ページ解析のベンチマーク")
+    parser.add_argument('--fixtures', help="保存したページ（*.html）のディレクトリ")
+    parser.add_argument('--articles', type=int, default=50, help="合成する記事ページの数")
+    parser.add_argument('--repeat', type=int, default=5, help="計測の繰り返し回数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    args = parser.parse_args()
+
+    top_pages, article_pages = load_pages(args)
+
+    def measure(func):
+        return min(timeit.repeat(func, number=1, repeat=args.repeat))
+
+    legacy_links = measure(lambda: [legacy_parse_listing(html, BASE_URL) for html in top_pages])
+    legacy_article = measure(lambda: [legacy_parse_article(html) for html in article_pages])
+    logger.info(f"変更前 (html.parser): 一覧解析 {legacy_links:.3f}秒 / 記事抽出 {legacy_article:.3f}秒")
+
+    for name in available_parsers():
+        # 結果が変更前と一致することを確認
+        for html in top_pages:
+            if parse_listing(html, BASE_URL, parser=name) != legacy_parse_listing(html, BASE_URL):
+                logger.warning(f"{name}: 一覧解析の結果が変更前と一致しません")
+                break
+        for html in article_pages:
+            if parse_article_soup(make_soup(html, parser=name)) != legacy_parse_article(html):
+                logger.warning(f"{name}: 記事抽出の結果が変更前と一致しません")
+                break
+
+        links = measure(lambda: [parse_listing(html, BASE_URL, parser=name) for html in top_pages])
+        article = measure(lambda: [parse_article_soup(make_soup(html, parser=name)) for html in article_pages])
+        logger.info(
+            f"{name}: 一覧解析 {links:.3f}秒（{legacy_links / links:.2f}倍） / "
+            f"記事抽出 {article:.3f}秒（{legacy_article / article:.2f}倍）"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+リクエストのスケジューラー（request_scheduler）のベンチマーク
+
+模擬サイト（fake_site）を1秒あたりの受付数に上限を付けて起動し、複数のスレッドから
+RequestScheduler を通して画像を取得し続ける。1秒ごとのレート・受け付けられたリクエスト数・429の数を表示し、
+最後に、従来の固定間隔（セッションごとに2秒）での取得とスループットを比べる。
+ブラウザは使わない。
+
+使い方:
+    python scripts/bench_scheduler.py [--capacity 10] [--seconds 60] [--workers 8]
+"""
+
+import time
+import argparse
+import logging
+import threading
+from collections import Counter
+
+import requests
+
+from fake_site import FakeSite, FakeSiteConfig
+from request_scheduler import RequestScheduler
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+FIXED_INTERVAL = 2  # 従来の取得間隔（秒）
+FIXED_SESSIONS = 2  # 従来のセッション数
+
+
+def worker(fetch, urls, deadline, counts, lock):
+    """期限まで画像を取得し続ける"""
+    session = requests.Session()
+    i = 0
+    while time.monotonic() < deadline:
+        url = urls[i % len(urls)]
+        i += 1
+        try:
+            status = fetch(session, url)
+        except requests.RequestException:
+            status = 'error'
+        with lock:
+            counts[status] += 1
+    session.close()
+
+
+def run(site, fetch, workers, seconds, on_tick=None):
+    """
+    workers 個のスレッドで seconds 秒間取得する
+
+    Returns:
+        Counter: ステータスごとの件数
+    """
+    urls = [f"{site.base_url}img/{n}.jpg" for n in range(50)]
+    counts = Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+    threads = [
+        threading.Thread(target=worker, args=(fetch, urls, deadline, counts, lock), daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    previous = Counter()
+    while any(thread.is_alive() for thread in threads):
+        time.sleep(1)
+        if on_tick:
+            with lock:
+                current = Counter(counts)
+            on_tick(current - previous)
+            previous = current
+    return counts
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="リクエストのスケジューラーのベンチマーク")
+    parser.add_argument('--capacity', type=float, default=10, help="模擬サイトが1秒あたりに受け付けるリクエスト数")
+    parser.add_argument('--seconds', type=int, default=60, help="計測する秒数")
+    parser.add_argument('--workers', type=int, default=8, help="取得するスレッド数")
+    parser.add_argument('--max-rate', type=float, default=50, help="スケジューラーのレートの上限")
+    parser.add_argument('--latency', type=float, default=0.02, help="模擬サイトの応答遅延（秒）")
+    args = parser.parse_args()
+
+    site = FakeSite(FakeSiteConfig(latency=args.latency, image_size=5000, capacity=args.capacity)).start()
+    try:
+        scheduler = RequestScheduler(max_concurrency=args.workers, max_rate=args.max_rate)
+        host = site.base_url.split('/')[2]
+
+        def scheduled_fetch(session, url):
+            with scheduler.request(url, kind='image') as outcome:
+                return outcome.response(session.get(url, timeout=10)).status_code
+
+        def tick(delta):
+            state = scheduler.describe().get(host, {})
+            logger.info(f"レート {state.get('rate', 0):5.2f}/秒  200: {delta[200]:3d}  429: {delta[429]:3d}")
+
+        logger.info(f"スケジューラー（受付上限 {args.capacity}/秒、{args.workers}スレッド、{args.seconds}秒）")
+        scheduled = run(site, scheduled_fetch, args.workers, args.seconds, tick)
+
+        def fixed_fetch(session, url):
+            started = time.monotonic()
+            status = session.get(url, timeout=10).status_code
+            time.sleep(max(0, FIXED_INTERVAL - (time.monotonic() - started)))
+            return status
+
+        logger.info(f"固定間隔（{FIXED_SESSIONS}セッション、{FIXED_INTERVAL}秒間隔）")
+        site.recent.clear()
+        fixed = run(site, fixed_fetch, FIXED_SESSIONS, args.seconds)
+    finally:
+        site.stop()
+
+    for name, counts in (("スケジューラー", scheduled), ("固定間隔", fixed)):
+        total = sum(counts.values())
+        logger.info(
+            f"{name}: 成功 {counts[200] / args.seconds:.2f}件/秒、"
+            f"429の割合 {counts[429] / total if total else 0:.1%}（{dict(counts)}）"
+        )
+    logger.info(f"スケジューラーの状態: {scheduler.describe()}")
+
+
+if __name__ == "__main__":
+    main()
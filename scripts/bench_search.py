@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+全文検索の索引（search_index）のベンチマーク
+
+合成した記事（save_article_as_markdown と同じ形式のMarkdown）で索引を最初から作成し、
+続けて1日分ずつ記事を追加したときの差分更新の時間と書き出すファイル、シャード・記事情報のファイルサイズを計測する。
+いくつかの検索語について、検索時に読み込むファイル数とバイト数も表示する。
+出力は一時ディレクトリに書き込む。
+
+使い方:
+    python scripts/bench_search.py [--articles 10000] [--added 20] [--days 30] [--chars 2000] [--shards 1024]
+"""
+
+import gzip
+import itertools
+import time
+import random
+import argparse
+import logging
+import tempfile
+from pathlib import Path
+
+import search_index
+from search_index import SearchIndex, tokenize, term_shard
+from run_metrics import distribution
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+KANJI = "日本経済新聞市場消費者戦略販売店舗顧客体験商品開発企業広告価格需要調査分析技術導入活用成長投資売上利益事業展開地域社会生活情報" \
+        "時代変化世界若者女性家族健康食品飲料化粧品旅行観光自動車住宅金融保険通信教育医療"
+KATAKANA = "マーケティングデジタルブランドサービスプラットフォームコンテンツデータアプリショップキャンペーンメディアコミュニティ"
+HIRAGANA = "のにはをがでとしてからまでもよりへやなどいるあるするなったれた"
+
+
+def make_vocabulary(rng, size):
+    """漢字・カタカナの語をランダムに作る"""
+    words = set()
+    while len(words) < size:
+        if rng.random() < 0.7:
+            words.add(''.join(rng.choice(KANJI) for _ in range(rng.randint(2, 4))))
+        else:
+            start = rng.randrange(len(KATAKANA) - 6)
+            words.add(KATAKANA[start:start + rng.randint(3, 6)])
+    return sorted(words)
+
+
+def make_text(rng, vocabulary, cum_weights, chars):
+    """語と助詞を並べた本文（語の出現頻度はZipf分布に近づける）"""
+    parts = []
+    length = 0
+    while length < chars:
+        for word in rng.choices(vocabulary, cum_weights=cum_weights, k=20):
+            parts.append(word + rng.choice(HIRAGANA))
+            length += len(word) + 1
+        parts.append("。\n\n")
+    return ''.join(parts)
+
+
+def make_corpus(articles_dir, count, chars, seed, start=0):
+    """合成記事を作成"""
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(random.Random(0), 5000)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    articles = []
+    for i in range(start, start + count):
+        article_id = f"{i:08x}"
+        title = make_text(rng, vocabulary, cum_weights, 20).replace("\n", "")
+        date = f"2025.{1 + i % 12:02d}.{1 + i % 28:02d}"
+        body = make_text(rng, vocabulary, cum_weights, chars)
+        (articles_dir / f"{article_id}.md").write_text(
+            f"# {title}\n\n**公開日**: {date}\n\n{body}\n\n**元記事**: [url](https://example.com/{i})\n",
+            encoding='utf-8'
+        )
+        articles.append({'id': article_id, 'title': title, 'url': f"https://example.com/{i}", 'date': date})
+    return articles, vocabulary
+
+
+def file_sizes(out_dir, prefix):
+    """索引ファイルのサイズ（元のサイズとgzip後のサイズ）"""
+    raw, compressed = [], []
+    for path in out_dir.glob(f"{prefix}*.json"):
+        data = path.read_bytes()
+        raw.append(len(data))
+        compressed.append(len(gzip.compress(data)))
+    return raw, compressed
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description="全文検索の索引のベンチマーク")
+    parser.add_argument('--articles', type=int, default=10000, help="最初に索引を作る記事数")
+    parser.add_argument('--added', type=int, default=20, help="1日の差分更新で追加する記事数")
+    parser.add_argument('--days', type=int, default=30, help="差分更新を繰り返す日数")
+    parser.add_argument('--chars', type=int, default=2000, help="記事1件あたりの本文の文字数")
+    parser.add_argument('--shards', type=int, default=search_index.SHARD_COUNT, help="シャード数")
+    parser.add_argument('--seed', type=int, default=1, help="乱数のシード")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        articles_dir = tmp / "articles"
+        articles_dir.mkdir()
+        out_dir = tmp / "search"
+        state_file = tmp / "search_index.json"
+
+        started = time.perf_counter()
+        articles, vocabulary = make_corpus(articles_dir, args.articles, args.chars, args.seed)
+        logger.info(f"合成記事を作成しました: {len(articles)}件（{time.perf_counter() - started:.1f}秒）")
+
+        started = time.perf_counter()
+        SearchIndex(out_dir, state_file, args.shards).update(articles, articles_dir)
+        logger.info(f"索引の作成: {time.perf_counter() - started:.2f}秒（{args.articles}件）")
+
+        # 1日分ずつ記事を追加する（セグメントの統合を含む、毎日書き出すファイル数とバイト数）
+        written = []
+        for day in range(args.days):
+            before = {p.name for p in out_dir.iterdir()}
+            added, _ = make_corpus(articles_dir, args.added, args.chars, args.seed + 1 + day,
+                                   start=args.articles + day * args.added)
+            articles += added
+            started = time.perf_counter()
+            result = SearchIndex(out_dir, state_file, args.shards).update(articles, articles_dir)
+            new_files = [p for p in out_dir.iterdir() if p.name not in before or p.name == search_index.MANIFEST_NAME]
+            written.append(sum(p.stat().st_size for p in new_files))
+            logger.info(
+                f"差分更新（{day + 1}日目）: {time.perf_counter() - started:.2f}秒"
+                f"（{args.added}件追加、{result['files']}ファイル書き出し、{written[-1] / 1e3:.0f}KB）"
+            )
+        index = SearchIndex(out_dir, state_file, args.shards)
+        logger.info(f"セグメント: {[s['postings'] for s in index.manifest['segments']]}")
+        logger.info(f"1日あたりの書き出し（バイト）: {distribution(written)}")
+
+        for label, prefix in (("シャード", "s"), ("記事情報", "d")):
+            raw, compressed = file_sizes(out_dir, prefix)
+            logger.info(
+                f"{label}: {len(raw)}ファイル、合計 {sum(raw) / 1e6:.1f}MB（gzip後 {sum(compressed) / 1e6:.1f}MB）"
+            )
+            logger.info(f"  サイズ（バイト）: {distribution(raw)}")
+            logger.info(f"  gzip後（バイト）: {distribution(compressed)}")
+
+        # 検索時に読み込むファイル（マニフェスト・検索語のシャード・結果の記事情報）
+        index = SearchIndex(out_dir, state_file, args.shards)
+        rng = random.Random(args.seed)
+        for query in [rng.choice(vocabulary) for _ in range(3)] + [f"{vocabulary[0]} {vocabulary[1]}"]:
+            shards = {segment['shards'][key] for t in tokenize(query) for segment in index.manifest['segments']
+                      if (key := str(term_shard(t, segment['shard_count']))) in segment['shards']}
+            shard_bytes = sum((out_dir / name).stat().st_size for name in shards)
+            started = time.perf_counter()
+            found = index.search(query)
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"検索「{query}」: {len(found)}件、シャード{len(shards)}個（{shard_bytes / 1e3:.0f}KB）、{elapsed * 1000:.1f}ミリ秒"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import logging
+
+from page_parser import CONTENT_SELECTORS, NOISE_SELECTOR, DATE_PATTERN, DEFAULT_AUTHOR
+
+logger = logging.getLogger(__name__)
+
+# 広告やアイコンとみなす画像URLのキーワード
+AD_IMAGE_KEYWORDS = ['ad', 'advertisement', 'banner', 'icon', 'logo', 'button']
+
+# ブラウザ内で記事を抽出するスクリプト
+# page_parser.parse_article_soup と同じ規則で、本文・メタデータ・画像候補を1回の呼び出しでまとめて返す。
+# DOMは変更せず、不要な要素の除去は本文要素の複製に対して行う。
+EXTRACT_SCRIPT = r"""
+const [contentSelectors, noiseSelector, adKeywords] = arguments;
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+
+// BeautifulSoupの get_text(strip=True) と同じく、テキストノードごとに前後の空白を除いて連結する
+function text(el) {
+    const parts = [];
+    const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT, {
+        acceptNode: (node) => {
+            for (let p = node.parentElement; p && p !== el.parentElement; p = p.parentElement) {
+                if (SKIP.has(p.tagName)) return NodeFilter.FILTER_REJECT;
+            }
+            return NodeFilter.FILTER_ACCEPT;
+        }
+    });
+    while (walker.nextNode()) {
+        const t = walker.currentNode.nodeValue.trim();
+        if (t) parts.push(t);
+    }
+    return parts.join('');
+}
+
+function hasClass(el, keywords) {
+    for (const c of el.classList) {
+        const lower = c.toLowerCase();
+        if (keywords.some((k) => lower.includes(k))) return true;
+    }
+    return false;
+}
+
+// タイトル・公開日・カテゴリは文書を1回走査して最初の要素を使う
+let titleEl = null, timeEl = null, dateEl = null, categoryEl = null;
+const authorEls = [];
+for (const el of document.body.getElementsByTagName('*')) {
+    if (!titleEl && el.tagName === 'H1') titleEl = el;
+    if (!timeEl && el.tagName === 'TIME') timeEl = el;
+    if (el.classList.length) {
+        if (!dateEl && hasClass(el, ['date'])) dateEl = el;
+        if (!categoryEl && hasClass(el, ['category', 'cat'])) categoryEl = el;
+        if (hasClass(el, ['author'])) authorEls.push(el);
+    }
+}
+
+// 本文（候補を優先順に試す）
+let contentEl = null;
+for (const selector of contentSelectors) {
+    contentEl = document.querySelector(selector);
+    if (contentEl && text(contentEl).length > 100) break;
+}
+
+let paragraphs = null, contentText = null;
+if (!contentEl) {
+    paragraphs = Array.from(document.querySelectorAll('p'), text).filter((t) => t.length > 50);
+} else {
+    const clone = contentEl.cloneNode(true);
+    clone.querySelectorAll(noiseSelector).forEach((el) => el.remove());
+    const ps = clone.querySelectorAll('p');
+    if (ps.length) {
+        paragraphs = Array.from(ps, text).filter((t) => t);
+    } else {
+        contentText = text(clone);
+    }
+}
+
+// 著者（本文から除去される要素の中にあるものは除く）
+const authorEl = authorEls.find((el) => {
+    if (!contentEl || !contentEl.contains(el)) return true;
+    const noise = el.closest(noiseSelector);
+    return !(noise && contentEl.contains(noise));
+});
+
+// 画像候補（URLで広告やアイコンと判定できるものは除外）
+const images = [];
+Array.from(document.images).forEach((img, index) => {
+    const src = img.src;
+    if (!src || adKeywords.some((k) => src.toLowerCase().includes(k))) return;
+    images.push({
+        index: index,
+        src: src,
+        width: img.getAttribute('width') || (img.naturalWidth ? String(img.naturalWidth) : null),
+        height: img.getAttribute('height') || (img.naturalHeight ? String(img.naturalHeight) : null),
+        alt: img.getAttribute('alt') || ''
+    });
+});
+
+// ページ本体とサブリソースの転送量（計測用。Timing-Allow-Originの無い他ドメインのリソースは0になる）
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+
+return {
+    title: titleEl ? text(titleEl) : null,
+    dateText: (timeEl || dateEl) ? text(timeEl || dateEl) : null,
+    category: categoryEl ? text(categoryEl) : null,
+    author: authorEl ? text(authorEl) : null,
+    paragraphs: paragraphs,
+    contentText: contentText,
+    images: images,
+    transfer: {
+        page_bytes: navigation ? (navigation.transferSize || navigation.encodedBodySize || 0) : 0,
+        resource_bytes: resources.reduce((sum, r) => sum + (r.transferSize || 0), 0),
+        resources: resources.length
+    }
+};
+"""
+
+
+def extract_in_browser(driver):
+    """
+    ブラウザ内で記事を抽出（WebDriverとの通信は1回）
+
+    Args:
+        driver (webdriver): 記事ページを表示中のWebDriver
+
+    Returns:
+        tuple: (記事コンテンツ情報, 画像候補のリスト, 転送量 {'page_bytes', 'resource_bytes', 'resources'})
+    """
+    payload = driver.execute_script(EXTRACT_SCRIPT, CONTENT_SELECTORS, NOISE_SELECTOR, AD_IMAGE_KEYWORDS)
+    return payload_to_content(payload), payload['images'], payload.get('transfer') or {}
+
+
+def payload_to_content(payload):
+    """
+    ブラウザから返された抽出結果を記事コンテンツ情報に変換
+
+    Args:
+        payload (dict): EXTRACT_SCRIPT の戻り値
+
+    Returns:
+        dict: 記事コンテンツ情報（page_parser.parse_article_soup と同じ形式）
+    """
+    publish_date = None
+    if payload.get('dateText'):
+        date_match = DATE_PATTERN.search(payload['dateText'])
+        if date_match:
+            year, month, day = date_match.groups()
+            publish_date = f"{year}.{month.zfill(2)}.{day.zfill(2)}"
+
+    if payload.get('paragraphs') is not None:
+        content_text = "\n\n".join(payload['paragraphs'])
+    else:
+        content_text = payload.get('contentText') or ""
+
+    return {
+        'title': payload['title'] if payload.get('title') is not None else "タイトルなし",
+        'publish_date': publish_date,
+        'category': payload.get('category'),
+        'content_text': content_text,
+        'author': payload['author'] if payload.get('author') is not None else DEFAULT_AUTHOR
+    }
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+ブラウザの起動を速くするための設定
+
+- chromedriverのパスを一度だけ解決してキャッシュし、次回以降はネットワークにアクセスせずに再利用する
+- セッションごとに永続的なプロファイル（ディスクキャッシュを含む）を使い、実行間で引き継ぐ
+- 起動済みのブラウザ（このスクリプトで起動できる）があれば、新しく起動せずに接続する
+
+常駐するブラウザの起動:
+    python scripts/browser_startup.py [--port 9222]
+    NIKKEI_CHROME_DEBUGGER_ADDRESS=127.0.0.1:9222 python scripts/fetch_articles.py
+"""
+
+import os
+import json
+import time
+import shutil
+import argparse
+import logging
+import threading
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+DRIVER_CACHE_FILE = CACHE_DIR / "chromedriver.json"
+
+# chromedriverのパス（指定した場合は解決もキャッシュも行わない）
+CHROMEDRIVER_PATH = os.environ.get('NIKKEI_CHROMEDRIVER')
+
+# 永続的なプロファイルの保存先（NIKKEI_CHROME_PROFILE=0 で毎回新しいプロファイルを使う）
+USE_PROFILE = os.environ.get('NIKKEI_CHROME_PROFILE', '1') != '0'
+PROFILE_DIR = Path(os.environ.get('NIKKEI_CHROME_PROFILE_DIR') or CACHE_DIR / "chrome-profile")
+DISK_CACHE_SIZE = 100 * 1024 * 1024  # プロファイルごとのディスクキャッシュの上限（バイト）
+
+# 起動済みのブラウザのアドレス（host:port）。指定すると最初のセッションはこのブラウザに接続する
+DEBUGGER_ADDRESS = os.environ.get('NIKKEI_CHROME_DEBUGGER_ADDRESS')
+
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome')
+
+_driver_path = None
+_driver_lock = threading.Lock()
+
+
+def resolve_driver_path(refresh=False):
+    """
+    chromedriverのパスを取得
+
+    NIKKEI_CHROMEDRIVER の指定、プロセス内のキャッシュ、ファイルのキャッシュの順に使い、
+    いずれも無い（またはファイルが無くなった）場合のみ webdriver_manager で解決する。
+
+    Args:
+        refresh (bool): キャッシュを使わずに解決し直す（Chromeの更新でバージョンが合わなくなった場合）
+
+    Returns:
+        str: chromedriverのパス
+    """
+    global _driver_path
+
+    if CHROMEDRIVER_PATH:
+        return CHROMEDRIVER_PATH
+
+    with _driver_lock:
+        if not refresh:
+            if _driver_path:
+                return _driver_path
+
+            cached = load_cached_driver_path()
+            if cached:
+                logger.info(f"キャッシュしたchromedriverを使用します: {cached}")
+                _driver_path = cached
+                return cached
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        started = time.monotonic()
+        _driver_path = ChromeDriverManager().install()
+        logger.info(f"chromedriverを解決しました（{time.monotonic() - started:.2f}秒）: {_driver_path}")
+        save_cached_driver_path(_driver_path)
+        return _driver_path
+
+
+def load_cached_driver_path():
+    """キャッシュしたchromedriverのパス（ファイルが実行可能な場合のみ）"""
+    try:
+        with open(DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+            path = json.load(f).get('path')
+    except (OSError, ValueError):
+        return None
+    if path and os.access(path, os.X_OK):
+        return path
+    return None
+
+
+def save_cached_driver_path(path):
+    """chromedriverのパスをキャッシュ"""
+    try:
+        DRIVER_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'path': path, 'resolved_at': time.time()}, f)
+    except OSError as e:
+        logger.warning(f"chromedriverのパスをキャッシュできませんでした: {e}")
+
+
+def profile_arguments(session_index):
+    """
+    永続的なプロファイルを使うためのChromeの起動オプション
+
+    Chromeは同じプロファイルを複数のプロセスで共有できないため、セッションごとに別のディレクトリを使う。
+
+    Args:
+        session_index (int): ブラウザセッションの番号
+
+    Returns:
+        list: 起動オプション
+    """
+    if not USE_PROFILE:
+        return []
+
+    profile = PROFILE_DIR / f"session-{session_index}"
+    profile.mkdir(parents=True, exist_ok=True)
+
+    # 前回の実行が異常終了した場合に残るロックを削除（残っているとChromeが起動できない）
+    for name in ('SingletonLock', 'SingletonSocket', 'SingletonCookie'):
+        lock = profile / name
+        if lock.is_symlink() or lock.exists():
+            lock.unlink()
+
+    return [
+        f"--user-data-dir={profile}",
+        f"--disk-cache-size={DISK_CACHE_SIZE}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+
+
+def find_chrome_binary():
+    """Chromeの実行ファイルを探す（NIKKEI_CHROME_BINARY で指定可能）"""
+    binary = os.environ.get('NIKKEI_CHROME_BINARY')
+    if binary:
+        return binary
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def serve(port, headless=True):
+    """
+    接続用のブラウザを起動し、終了されるまで常駐させる
+
+    Args:
+        port (int): リモートデバッグのポート
+        headless (bool): ヘッドレスモードで起動するか
+    """
+    binary = find_chrome_binary()
+    if not binary:
+        logger.error("Chromeが見つかりません。NIKKEI_CHROME_BINARY で指定してください")
+        return 1
+
+    profile = PROFILE_DIR / "attached"
+    profile.mkdir(parents=True, exist_ok=True)
+    command = [
+        binary,
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={profile}",
+        f"--disk-cache-size={DISK_CACHE_SIZE}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--window-size=1920,1080",
+    ]
+    if headless:
+        command.append("--headless")
+
+    process = subprocess.Popen(command)
+    logger.info(f"ブラウザを起動しました。NIKKEI_CHROME_DEBUGGER_ADDRESS=127.0.0.1:{port} で接続できます")
+    try:
+        return process.wait()
+    except KeyboardInterrupt:
+        process.terminate()
+        return process.wait()
+
+
+def main():
+    """接続用のブラウザを起動"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description="スクレイパーが接続する常駐ブラウザを起動")
+    parser.add_argument('--port', type=int, default=9222, help="リモートデバッグのポート")
+    parser.add_argument('--show-browser', action='store_true', help="ヘッドレスモードを使わない")
+    args = parser.parse_args()
+    return serve(args.port, headless=not args.show_browser)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import hashlib
+import logging
+import unicodedata
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+# URLの正規化で取り除くクエリパラメータ（計測用のパラメータと、記事の2ページ目以降を表す P）
+IGNORED_QUERY_PARAMS = {'n_cid', 'i_cid', 'fbclid', 'gclid', 'yclid', 'ref', 'P'}
+IGNORED_QUERY_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# 本文の類似の判定
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 4  # 本文を区切る文字数（日本語は単語の区切りが無いため文字単位）
+MIN_TEXT_LENGTH = 200  # これより短い本文（会員限定の案内だけなど）は判定しない
+# 異なるビット数がこの値以下なら重複とみなす（NIKKEI_DUPLICATE_DISTANCE で変更可能）
+MAX_DISTANCE = int(os.environ.get('NIKKEI_DUPLICATE_DISTANCE', '3'))
+
+SPACE_PATTERN = re.compile(r'\s+')
+
+# 64ビットのハッシュの各ビットを32ビットずつの区画に広げる表（バイトの位置ごと）。
+# 特徴ごとに64回ビットを調べる代わりに、広げた整数を足し合わせて全ビットの重みを一度に集計する
+LANE_BITS = 32
+SPREAD_TABLES = [
+    [sum(1 << (LANE_BITS * (8 * position + bit)) for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+    for position in range(SIMHASH_BITS // 8)
+]
+
+
+def canonicalize_url(url):
+    """
+    同じ記事を指すURLを1つの形に揃える（記事IDはこのURLから作る）
+
+    スキームとホスト名を小文字にしてhttpsに揃え、既定のポート・フラグメント・計測用のパラメータを取り除き、
+    残りのクエリパラメータを並べ替える。
+
+    Args:
+        url (str): URL
+
+    Returns:
+        str: 正規化したURL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    if path.endswith('/index.html'):
+        path = path[:-len('index.html')]
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key not in IGNORED_QUERY_PARAMS and not key.startswith(IGNORED_QUERY_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
+def shingles(text):
+    """
+    本文を SHINGLE_SIZE 文字ずつずらして切り出す
+
+    Returns:
+        Counter: 切り出した文字列ごとの出現回数（本文が短い場合は空）
+    """
+    text = SPACE_PATTERN.sub('', unicodedata.normalize('NFKC', text).lower())
+    if len(text) < MIN_TEXT_LENGTH:
+        return Counter()
+    return Counter(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def simhash(text):
+    """
+    本文のSimHash（似た本文ほど異なるビットが少ない64ビットの値）
+
+    Args:
+        text (str): 本文
+
+    Returns:
+        int: SimHash（本文が短く判定できない場合はNone）
+    """
+    features = shingles(text)
+    if not features:
+        return None
+
+    totals = 0
+    for feature, weight in features.items():
+        digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=SIMHASH_BITS // 8).digest()
+        spread = 0
+        for position, byte in enumerate(digest):
+            spread |= SPREAD_TABLES[position][byte]
+        totals += spread * weight
+
+    # 重みの過半数でビットが立っている位置を1にする
+    half = sum(features.values()) / 2
+    mask = (1 << LANE_BITS) - 1
+    value = 0
+    for bit in range(SIMHASH_BITS):
+        if (totals >> (LANE_BITS * bit)) & mask > half:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a, b):
+    """2つのSimHashで異なるビットの数"""
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    SimHashの近傍検索の索引
+
+    64ビットを (MAX_DISTANCE + 1) 個の区画に分け、区画の値ごとに記事IDを記録する。
+    異なるビットが MAX_DISTANCE 以下の2つの値は、鳩の巣原理により少なくとも1つの区画が完全に一致するため、
+    全記事と比較せずに、区画が一致した候補だけを調べればよい。
+    """
+
+    def __init__(self, max_distance=MAX_DISTANCE):
+        """
+        Args:
+            max_distance (int): 重複とみなす異なるビット数の上限
+        """
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        # 区画の (開始ビット, ビット数)
+        self.bands = [
+            (SIMHASH_BITS * i // bands, SIMHASH_BITS * (i + 1) // bands - SIMHASH_BITS * i // bands)
+            for i in range(bands)
+        ]
+        self.tables = [{} for _ in self.bands]
+        self.hashes = {}
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def band_keys(self, value):
+        return [(value >> start) & ((1 << width) - 1) for start, width in self.bands]
+
+    def add(self, article_id, value):
+        """記事のSimHashを登録（登録済みなら置き換える）"""
+        self.remove(article_id)
+        self.hashes[article_id] = value
+        for table, key in zip(self.tables, self.band_keys(value)):
+            table.setdefault(key, set()).add(article_id)
+
+    def remove(self, article_id):
+        """記事を索引から外す"""
+        value = self.hashes.pop(article_id, None)
+        if value is None:
+            return
+        for table, key in zip(self.tables, self.band_keys(value)):
+            ids = table.get(key)
+            if ids:
+                ids.discard(article_id)
+                if not ids:
+                    del table[key]
+
+    def find(self, value, exclude=None):
+        """
+        似た本文の記事を探す
+
+        Args:
+            value (int): SimHash
+            exclude (str): 候補から除く記事ID（記事自身）
+
+        Returns:
+            str: 最も近い記事のID（無ければNone）
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for table, key in zip(self.tables, self.band_keys(value)):
+            for candidate in table.get(key, ()):
+                if candidate == exclude:
+                    continue
+                distance = hamming_distance(value, self.hashes[candidate])
+                if distance < best_distance or (distance == best_distance and best is not None and candidate < best):
+                    best, best_distance = candidate, distance
+        return best
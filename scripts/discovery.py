@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import datetime
+from collections import deque
+from urllib.parse import urlparse, urldefrag
+
+from dedup import canonicalize_url
+from page_parser import parse_listing
+
+logger = logging.getLogger(__name__)
+
+# 日付フォーマット
+DATE_FORMAT = "%Y.%m.%d"
+
+# 取得対象の期間（昨日から遡る日数。1なら昨日のみ）
+DISCOVERY_DAYS = int(os.environ.get('NIKKEI_DISCOVERY_DAYS', '1'))
+
+# トップページ以外に巡回を始めるセクションページ（カンマ区切りのパス）
+DISCOVERY_SECTIONS = [p.strip() for p in os.environ.get('NIKKEI_DISCOVERY_SECTIONS', '').split(',') if p.strip()]
+
+# 巡回するページ数の上限
+MAX_DISCOVERY_PAGES = int(os.environ.get('NIKKEI_DISCOVERY_MAX_PAGES', '30'))
+
+
+def target_window(days=DISCOVERY_DAYS, now=None):
+    """
+    取得対象の公開日の範囲（日本時間）
+
+    Args:
+        days (int): 昨日から遡る日数
+        now (datetime): 現在時刻（省略時は現在の日本時間）
+
+    Returns:
+        tuple: (開始日, 終了日)。どちらも YYYY.MM.DD 形式で、両端を含む
+    """
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
+    end = now - datetime.timedelta(days=1)
+    start = end - datetime.timedelta(days=max(1, days) - 1)
+    return start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
+
+
+class DiscoveryCrawler:
+    """
+    トップページとセクションページを巡回し、対象期間に公開された記事を集める
+
+    未訪問のページを待ち行列（frontier）で管理し、訪問済みのURLは再訪しない。
+    一覧は新しい順に並んでいる前提で、ページ末尾の項目が対象期間より古くなったら
+    そのセクションの次のページには進まない。
+    """
+
+    def __init__(self, load_page, start_urls, window, max_pages=MAX_DISCOVERY_PAGES):
+        """
+        Args:
+            load_page (callable): URLを受け取り (HTML, 最終的なURL) を返す関数
+            start_urls (list): 巡回を始めるページ（先頭はトップページ）
+            window (tuple): (開始日, 終了日)。target_window の戻り値
+            max_pages (int): 巡回するページ数の上限
+        """
+        self.load_page = load_page
+        self.start_urls = start_urls
+        self.window = window
+        self.max_pages = max_pages
+        self.host = urlparse(start_urls[0]).netloc
+        self.pages = 0
+
+    def crawl(self):
+        """
+        巡回して記事を集める
+
+        Returns:
+            list: {'url', 'title', 'date'} のリスト（見つけた順、正規化したURLの重複なし）。
+                一覧に日付が無い記事の date はNone
+        """
+        start, end = self.window
+        # (URL, セクションへのリンクをたどるか)。セクションへはトップページなどの起点からのみ進む
+        frontier = deque((url, True) for url in self.start_urls)
+        seen_pages = set(self.start_urls)
+        found = {}
+        skipped_old = 0
+
+        while frontier and self.pages < self.max_pages:
+            url, follow_sections = frontier.popleft()
+            try:
+                html, page_url = self.load_page(url)
+            except Exception as e:
+                logger.warning(f"一覧ページを取得できませんでした: {url}: {e}")
+                continue
+            self.pages += 1
+
+            listing = parse_listing(html, page_url)
+            last_date = None
+            for article_url, title, date in listing['entries']:
+                # 計測用のパラメータなどが異なるだけのURLは同じ記事として扱う
+                article_url = canonicalize_url(article_url)
+                if date:
+                    last_date = date
+                if date and date < start:
+                    skipped_old += 1
+                    continue
+                if date and date > end:
+                    continue
+                entry = found.setdefault(article_url, {'url': article_url, 'title': title, 'date': date})
+                if entry['date'] is None and date:
+                    entry['date'] = date
+
+            # ページ末尾が対象期間より古ければ、このセクションの続きは見ない
+            reached_old = last_date is not None and last_date < start
+            links = [] if reached_old else [(u, False) for u in listing['next_pages']]
+            if follow_sections:
+                links += [(u, False) for u in listing['sections']]
+
+            for link, follow in links:
+                link = urldefrag(link)[0]
+                if link not in seen_pages and urlparse(link).netloc == self.host:
+                    seen_pages.add(link)
+                    frontier.append((link, follow))
+
+        if frontier:
+            logger.info(f"巡回ページ数の上限（{self.max_pages}）に達したため、{len(frontier)}ページを残して終了します")
+        logger.info(
+            f"{self.pages}ページを巡回し、対象期間（{start}〜{end}）の記事候補を{len(found)}件見つけました"
+            f"（期間より古い項目: {skipped_old}件）"
+        )
+        return list(found.values())
@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+日経クロストレンドの代わりにローカルで動かす模擬サイト
+
+fetch_articles.py が利用するページだけを再現する:
+- /auth/login/        LA7010Form01 のログインフォーム（POSTでセッションCookieを発行）
+- /                   /atcl/contents/ への記事リンク（公開日付き）を並べたトップページ
+- /atcl/group/N/      セクションごとの記事一覧（新しい順、「次へ」でページ送り）
+- /atcl/contents/...  記事ページ（一部は「続き」「続きを見る」ボタンで隠れた本文を表示する）
+- /img/..., /static/  記事内の画像とアイコン、スタイルシート・計測スクリプト・Webフォント
+
+応答の遅延・記事の長さ・画像サイズなどを変更でき、送信したバイト数を種類ごとに集計する。
+--capacity を指定すると、直近1秒間のリクエスト数がそれを超えた分には 429（Retry-After付き）を返す。
+--error-rate を指定すると、その割合のリクエストに 503 を返す（再試行の確認用）。
+
+使い方:
+    python scripts/fake_site.py [--port 8000] [--latency 0.05]
+"""
+
+import re
+import time
+import datetime
+import random
+import hashlib
+import argparse
+import logging
+import threading
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+WORDS = ["日経", "クロストレンド", "マーケティング", "消費者", "データ", "戦略", "AI", "店舗", "ブランド", "顧客体験"]
+SESSION_COOKIE = "xtsession"
+ARTICLE_PATH = re.compile(r'^/atcl/contents/casestudy/00012/(\d{5})/$')
+SECTION_PATH = re.compile(r'^/atcl/group/(\d+)/$')
+IMAGE_PATH = re.compile(r'^/img/(\d+)\.jpg$')
+
+
+class FakeSiteConfig:
+    """模擬サイトの設定"""
+
+    def __init__(self, articles=20, latency=0.05, paragraphs=30, images=3, image_size=50000,
+                 button_ratio=0.5, shared_images=1, seed=0, older_articles=20, sections=2,
+                 top_size=10, page_size=10, asset_size=100000, capacity=0, error_rate=0):
+        """
+        Args:
+            articles (int): 昨日（日本時間）公開の記事数
+            latency (float): 各応答の遅延（秒）
+            paragraphs (int): 記事ごとの段落数
+            images (int): 記事ごとの画像数（共有画像を含む）
+            image_size (int): 画像1枚のバイト数
+            button_ratio (float): 「続き」ボタンを持つ記事の割合
+            shared_images (int): 全記事で共通して使う画像の数
+            seed (int): 乱数シード
+            older_articles (int): それより前に公開された記事数（1日5件ずつ遡る）
+            sections (int): セクション数（記事は番号順に各セクションへ振り分ける）
+            top_size (int): トップページに並べる新しい記事の数
+            page_size (int): セクションページ1ページあたりの記事数
+            asset_size (int): 計測スクリプトとWebフォントのバイト数（リソース遮断の効果の確認用）
+            capacity (float): 1秒あたりに受け付けるリクエスト数（超えた分は429。0なら制限なし）
+            error_rate (float): 503を返すリクエストの割合
+        """
+        self.articles = articles
+        self.latency = latency
+        self.paragraphs = paragraphs
+        self.images = images
+        self.image_size = image_size
+        self.button_ratio = button_ratio
+        self.shared_images = shared_images
+        self.seed = seed
+        self.older_articles = older_articles
+        self.sections = sections
+        self.top_size = top_size
+        self.page_size = page_size
+        self.asset_size = asset_size
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+
+class FakeSite:
+    """模擬サイトのHTTPサーバー（別スレッドで動作）"""
+
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        """
+        Args:
+            config (FakeSiteConfig): 設定
+            host (str): 待ち受けるアドレス
+            port (int): 待ち受けるポート（0なら空いているポート）
+        """
+        self.config = config or FakeSiteConfig()
+        jst_now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
+        self.yesterday = (jst_now - datetime.timedelta(days=1)).date()
+        self.sessions = set()
+        self.lock = threading.Lock()
+        self.bytes_sent = Counter()
+        self.requests = Counter()
+        self.recent = deque()  # 直近1秒間に受け付けたリクエストの時刻
+        self.errors = random.Random(self.config.seed)  # 503を返すかの乱数
+
+        site = self
+
+        class Handler(FakeSiteHandler):
+            pass
+        Handler.site = site
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """サーバーを別スレッドで起動"""
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"模擬サイトを起動しました: {self.base_url}")
+        return self
+
+    def stop(self):
+        """サーバーを停止"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def record(self, kind, size):
+        """送信したバイト数を集計"""
+        with self.lock:
+            self.bytes_sent[kind] += size
+            self.requests[kind] += 1
+
+    def overloaded(self):
+        """直近1秒間のリクエスト数が capacity を超えているか（超えていなければ受け付けたものとして数える）"""
+        if not self.config.capacity:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] > 1.0:
+                self.recent.popleft()
+            if len(self.recent) >= self.config.capacity:
+                return True
+            self.recent.append(now)
+            return False
+
+    def reset_stats(self):
+        """集計をクリア"""
+        with self.lock:
+            self.bytes_sent.clear()
+            self.requests.clear()
+
+    def stats(self):
+        """
+        種類ごとの送信バイト数とリクエスト数
+
+        Returns:
+            dict: {'bytes': {...}, 'requests': {...}}
+        """
+        with self.lock:
+            return {'bytes': dict(self.bytes_sent), 'requests': dict(self.requests)}
+
+    # ページの生成
+
+    def rng(self, *key):
+        """ページごとに決まった内容を生成するための乱数"""
+        return random.Random(f"{self.config.seed}:{':'.join(map(str, key))}")
+
+    def sentence(self, rng):
+        return "、".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))) + "。"
+
+    def article_title(self, number):
+        rng = self.rng('title', number)
+        return f"模擬記事{number} {rng.choice(WORDS)}と{rng.choice(WORDS)}の最前線"
+
+    def login_page(self):
+        return """<!DOCTYPE html>
+<html lang="ja"><head><meta charset="UTF-8"><title>ログイン</title></head>
+<body>
+<form id="LA7010Form01" method="post" action="/auth/login/">
+  <input type="text" id="LA7010Form01:LA7010Email" name="email">
+  <input type="password" id="LA7010Form01:LA7010Password" name="password">
+  <button type="submit" id="LA7010Form01:LA7010Login">ログイン</button>
+</form>
+</body></html>"""
+
+    def article_date(self, number):
+        """記事の公開日（番号が小さいほど新しい）"""
+        older = number - self.config.articles
+        if older < 0:
+            return self.yesterday
+        return self.yesterday - datetime.timedelta(days=1 + older // 5)
+
+    def article_count(self):
+        return self.config.articles + self.config.older_articles
+
+    def listing_item(self, number):
+        href = f"/atcl/contents/casestudy/00012/{number:05d}/"
+        date = self.article_date(number).strftime("%Y.%m.%d")
+        if number % 3 == 0:
+            link = f'<a href="{href}"><h3>{self.article_title(number)}</h3></a>'
+        else:
+            link = f'<a href="{href}">{self.article_title(number)}</a>'
+        return f'<div class="card">{link}<span class="date">{date}</span></div>'
+
+    def listing_page(self, title, items, next_href=None):
+        nav = "".join(f'<li><a href="/atcl/group/{i}/">セクション{i}</a></li>' for i in range(self.config.sections))
+        pager = f'<div class="pager"><a href="{next_href}" rel="next">次へ</a></div>' if next_href else ""
+        return f"""<!DOCTYPE html>
+<html lang="ja"><head><meta charset="UTF-8"><title>{title}</title></head>
+<body>
+<header><img src="/static/logo.png" width="120" height="30" alt="logo"><nav><ul>{nav}</ul></nav></header>
+<main>{''.join(items)}{pager}</main>
+<footer class="footer">模擬サイト</footer>
+</body></html>"""
+
+    def top_page(self):
+        numbers = range(min(self.config.top_size, self.article_count()))
+        return self.listing_page("日経クロストレンド", [self.listing_item(n) for n in numbers])
+
+    def section_page(self, section, page):
+        numbers = [n for n in range(self.article_count()) if n % self.config.sections == section]
+        size = self.config.page_size
+        chunk = numbers[(page - 1) * size:page * size]
+        next_href = f"/atcl/group/{section}/?page={page + 1}" if page * size < len(numbers) else None
+        return self.listing_page(f"セクション{section}", [self.listing_item(n) for n in chunk], next_href)
+
+    def article_page(self, number):
+        config = self.config
+        rng = self.rng('article', number)
+        paragraphs = [f"<p>{self.sentence(rng)}</p>" for _ in range(config.paragraphs)]
+
+        # 記事の一部は「続き」ボタンを押すまで後半を表示しない
+        has_button = rng.random() < config.button_ratio
+        visible = paragraphs
+        hidden = ""
+        if has_button:
+            half = len(paragraphs) // 2
+            visible = paragraphs[:half]
+            label = rng.choice(["続きを読む", "続きを見る"])
+            hidden = (
+                f'<button type="button" onclick="'
+                f"document.getElementById('more').style.display='block';this.remove();"
+                f'">{label}</button>'
+                f'<div id="more" style="display:none">{"".join(paragraphs[half:])}</div>'
+            )
+
+        images = []
+        for i in range(config.images):
+            if i < config.shared_images:
+                image_id = i  # 全記事で共通の画像
+            else:
+                image_id = 1000 + number * config.images + i
+            images.append(f'<img src="/img/{image_id}.jpg" width="640" height="480" alt="図{i+1}">')
+
+        return f"""<!DOCTYPE html>
+<html lang="ja"><head><meta charset="UTF-8"><title>{self.article_title(number)}</title>
+<link rel="stylesheet" href="/static/site.css"><script src="/static/analytics.js"></script></head>
+<body>
+<header><img src="/static/logo.png" width="120" height="30" alt="logo"></header>
+<h1>{self.article_title(number)}</h1>
+<span class="p-category">{rng.choice(WORDS)}</span>
+<time>{self.article_date(number).strftime("%Y年%m月%d日")}</time>
+<article><div class="article-body">{''.join(visible)}{''.join(images)}{hidden}
+<div class="ad"><p>広告</p></div></div>
+<div class="p-author">{rng.choice(WORDS)} 記者</div></article>
+<footer class="footer">模擬サイト</footer>
+</body></html>"""
+
+    def asset(self, name):
+        """
+        静的ファイル
+
+        Returns:
+            tuple: (内容, Content-Type)。存在しない場合はNone
+        """
+        size = self.config.asset_size
+        if name == 'site.css':
+            css = ("@font-face{font-family:Site;src:url(/static/font.woff2) format('woff2')}"
+                   "body{font-family:Site,sans-serif}.ad{display:none}")
+            return css.encode('utf-8'), 'text/css'
+        if name == 'analytics.js':
+            return ("/*" + "x" * max(0, size - 4) + "*/").encode('ascii'), 'application/javascript'
+        if name == 'font.woff2':
+            return self.rng('font').randbytes(size), 'font/woff2'
+        if name == 'logo.png':
+            return b'\x89PNG\r\n\x1a\n' + b'\0' * 200, 'image/png'
+        return None
+
+    def image(self, image_id):
+        """画像ごとに決まった内容のバイト列（JPEGのヘッダーのみ本物）"""
+        rng = self.rng('image', image_id)
+        return b'\xff\xd8\xff\xe0' + rng.randbytes(max(0, self.config.image_size - 4))
+
+
+class FakeSiteHandler(BaseHTTPRequestHandler):
+    """模擬サイトのリクエスト処理"""
+
+    site = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def logged_in(self):
+        cookies = self.headers.get('Cookie', '')
+        for part in cookies.split(';'):
+            name, _, value = part.strip().partition('=')
+            if name == SESSION_COOKIE and value in self.site.sessions:
+                return True
+        return False
+
+    def send_body(self, kind, body, content_type='text/html; charset=utf-8', status=200, headers=None):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        time.sleep(self.site.config.latency)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        self.site.record(kind, len(body))
+
+    def redirect(self, location, headers=None):
+        time.sleep(self.site.config.latency)
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.site.record('redirect', 0)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        site = self.site
+
+        if site.overloaded():
+            return self.send_body('throttled', 'too many requests', status=429, headers={'Retry-After': '1'})
+        if site.config.error_rate:
+            with site.lock:
+                failed = site.errors.random() < site.config.error_rate
+            if failed:
+                return self.send_body('unavailable', 'service unavailable', status=503)
+
+        if path == '/auth/login/':
+            if self.logged_in():
+                return self.redirect('/')
+            return self.send_body('login', site.login_page())
+
+        if path == '/':
+            return self.send_body('top', site.top_page())
+
+        match = SECTION_PATH.match(path)
+        if match:
+            page = int(parse_qs(urlparse(self.path).query).get('page', ['1'])[0])
+            return self.send_body('section', site.section_page(int(match.group(1)), page))
+
+        match = ARTICLE_PATH.match(path)
+        if match:
+            if not self.logged_in():
+                return self.redirect('/auth/login/')
+            return self.send_body('article', site.article_page(int(match.group(1))))
+
+        match = IMAGE_PATH.match(path)
+        if match:
+            body = site.image(int(match.group(1)))
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get('If-None-Match') == etag:
+                time.sleep(site.config.latency)
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return site.record('not_modified', 0)
+            return self.send_body('image', body, 'image/jpeg', headers={'ETag': etag})
+
+        if path.startswith('/static/'):
+            asset = site.asset(path[len('/static/'):])
+            if asset:
+                return self.send_body('static', asset[0], asset[1])
+
+        return self.send_body('not_found', 'not found', status=404)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+
+        if path == '/auth/login/' and form.get('email') and form.get('password'):
+            token = hashlib.sha256(f"{form['email'][0]}:{time.time()}".encode()).hexdigest()
+            with self.site.lock:
+                self.site.sessions.add(token)
+            return self.redirect('/', headers={'Set-Cookie': f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+
+        return self.send_body('login', self.site.login_page(), status=401)
+
+
+def main():
+    """模擬サイトを単体で起動"""
+    parser = argparse.ArgumentParser(description="日経クロストレンドの模擬サイト")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--articles', type=int, default=20)
+    parser.add_argument('--older-articles', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--paragraphs', type=int, default=30)
+    parser.add_argument('--images', type=int, default=3)
+    parser.add_argument('--image-size', type=int, default=50000)
+    parser.add_argument('--button-ratio', type=float, default=0.5)
+    parser.add_argument('--capacity', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    args = parser.parse_args()
+
+    config = FakeSiteConfig(
+        articles=args.articles, older_articles=args.older_articles, latency=args.latency,
+        paragraphs=args.paragraphs, images=args.images, image_size=args.image_size,
+        button_ratio=args.button_ratio, capacity=args.capacity, error_rate=args.error_rate
+    )
+    site = FakeSite(config, port=args.port).start()
+    try:
+        site.thread.join()
+    except KeyboardInterrupt:
+        site.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+PAGES_MANIFEST_FILE = Path(__file__).parent.parent / ".cache" / "feed_pages.json"
+DOCS_DIR = Path(__file__).parent.parent / "docs"
+
+
+def fingerprint(*parts):
+    """ページの内容を決める値（JSONに変換できるもの）から指紋を計算"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+class FeedPages:
+    """
+    出力するページ（フィード・インデックス）ごとに内容の指紋を記録し、変わったページだけを書き出させる
+
+    指紋は生成日時を含まない入力（記事と変換結果、リンク先）から計算するため、
+    記事が変わらなければ前回のファイルをそのまま残す。
+    """
+
+    def __init__(self, path=PAGES_MANIFEST_FILE, root=DOCS_DIR):
+        """
+        前回の指紋を読み込む
+
+        Args:
+            path (Path): 指紋を保存するファイル
+            root (Path): ページの出力先のルート（指紋はここからの相対パスで記録する）
+        """
+        self.path = Path(path)
+        self.root = Path(root)
+        self.previous = {}
+        self.current = {}
+        self.written = 0
+        self.kept = 0
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.previous = json.load(f)
+            except ValueError as e:
+                logger.warning(f"ページの指紋を読み込めませんでした: {e}")
+
+    def changed(self, page, page_fingerprint):
+        """
+        ページを書き出す必要があるか（指紋は書き出すものとして記録する）
+
+        Args:
+            page (Path): ページのパス
+            page_fingerprint (str): fingerprint で計算した指紋
+
+        Returns:
+            bool: 前回と指紋が異なるか、ファイルが無ければTrue
+        """
+        key = Path(page).relative_to(self.root).as_posix()
+        self.current[key] = page_fingerprint
+        if self.previous.get(key) == page_fingerprint and Path(page).exists():
+            self.kept += 1
+            return False
+        self.written += 1
+        return True
+
+    def remove_stale(self, directory, pattern="*.xml"):
+        """
+        今回出力しなかったページを削除（カテゴリが無くなった場合など）
+
+        Args:
+            directory (Path): 対象のディレクトリ
+            pattern (str): 対象のファイル名のパターン
+        """
+        directory = Path(directory)
+        if not directory.exists():
+            return
+        for page in directory.glob(pattern):
+            if page.relative_to(self.root).as_posix() not in self.current:
+                page.unlink()
+                logger.info(f"不要になったページを削除しました: {page}")
+
+    def save(self):
+        """今回の指紋を保存"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.current, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        logger.info(f"ページ: {self.written}件生成、{self.kept}件は変更なし")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+docs/ を配信する小さな静的サーバー（フィードを自前で配信する場合や、配信の負荷試験用）
+
+precompress が作成した圧縮版（.br / .gz）を Accept-Encoding に応じて返し、
+etags.json の強いETagと更新時刻で条件付きリクエスト（If-None-Match / If-Modified-Since）に304を返す。
+
+使い方:
+    python scripts/feed_server.py [--port 8000] [--root docs]
+"""
+
+import os
+import argparse
+import logging
+import mimetypes
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, unquote
+
+from precompress import DOCS_DIR, MANIFEST_NAME, ENCODING_SUFFIXES, load_manifest, content_hash
+
+logger = logging.getLogger(__name__)
+
+# 定数
+CONTENT_TYPES = {
+    '.xml': 'application/rss+xml; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+}
+CACHE_CONTROL = "public, max-age=300"
+
+
+def parse_accept_encoding(header):
+    """
+    Accept-Encoding から受け入れ可能な形式を取得
+
+    Returns:
+        set: q=0 を除いた形式（小文字）
+    """
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0
+        if q > 0:
+            accepted.add(name)
+    return accepted
+
+
+def etag_matches(header, etag):
+    """If-None-Match に ETag が含まれるか（弱い比較）"""
+    if header.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in header.split(',')]
+    return etag in tags or f"W/{etag}" in tags
+
+
+class FeedServer:
+    """docs/ を配信するHTTPサーバー（別スレッドで動作）"""
+
+    def __init__(self, root=DOCS_DIR, host='127.0.0.1', port=8000):
+        """
+        Args:
+            root (Path): 配信するディレクトリ
+            host (str): 待ち受けるアドレス
+            port (int): 待ち受けるポート（0なら空いているポート）
+        """
+        self.root = Path(root).resolve()
+        self.manifest = load_manifest(self.root)
+        self.manifest_mtime = self.manifest_stat()
+        self.verified = {}  # パス→etags.json の値と一致を確認したときのファイルの状態
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def manifest_stat(self):
+        try:
+            return (self.root / MANIFEST_NAME).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def entry(self, key):
+        """ファイルのETagなどを取得（etags.json が更新されていれば読み直す）"""
+        mtime = self.manifest_stat()
+        if mtime != self.manifest_mtime:
+            with self.lock:
+                self.manifest = load_manifest(self.root)
+                self.manifest_mtime = mtime
+        return self.manifest.get(key)
+
+    def current_entry(self, key, source, stat):
+        """
+        etags.json の値のうち、現在のファイルの内容に対応するものを取得
+
+        etags.json の更新前に書き換えられたファイル（同じサイズの場合も含む）には使わない。
+        ハッシュはファイルの更新時刻かサイズが変わったときだけ計算し直す。
+
+        Args:
+            key (str): ルートからの相対パス
+            source (Path): ファイル
+            stat (os.stat_result): ファイルの状態
+
+        Returns:
+            dict: etags.json の値（無いか内容が異なればNone）
+        """
+        entry = self.entry(key)
+        if not entry:
+            return None
+        state = (stat.st_mtime_ns, stat.st_size, entry['hash'])
+        with self.lock:
+            if self.verified.get(key) == state:
+                return entry
+        if entry['size'] != stat.st_size or content_hash(source.read_bytes()) != entry['hash']:
+            return None
+        with self.lock:
+            self.verified[key] = state
+        return entry
+
+    def resolve(self, url_path):
+        """
+        URLのパスをファイルに対応付ける
+
+        Returns:
+            Path: 配信するファイル（ルートの外や存在しない場合はNone）
+        """
+        path = unquote(urlparse(url_path).path)
+        if path.endswith('/'):
+            path += 'index.html'
+        target = (self.root / path.lstrip('/')).resolve()
+        if target != self.root and self.root not in target.parents:
+            return None
+        return target if target.is_file() else None
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # ヘッダーと本文を別々に送るため、Nagleアルゴリズムで応答が遅れないようにする
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_HEAD(self):
+                self.respond(send_body=False)
+
+            def do_GET(self):
+                self.respond(send_body=True)
+
+            def respond(self, send_body):
+                source = server.resolve(self.path)
+                if source is None:
+                    self.send_error(404)
+                    return
+
+                key = source.relative_to(server.root).as_posix()
+                stat = source.stat()
+                # etags.json の更新前に書き換えられたファイルは、その場でETagを計算する
+                entry = server.current_entry(key, source, stat)
+
+                # 圧縮版があり、クライアントが受け入れるなら使う（brを優先）
+                body_file, encoding = source, None
+                etag = entry['etag'] if entry else f'"{content_hash(source.read_bytes())}"'
+                if entry:
+                    accepted = parse_accept_encoding(self.headers.get('Accept-Encoding'))
+                    for name in ('br', 'gzip'):
+                        variant = source.with_name(source.name + ENCODING_SUFFIXES[name])
+                        if name in accepted and name in entry['encodings'] and variant.exists():
+                            body_file, encoding = variant, name
+                            etag = entry['encodings'][name]['etag']
+                            break
+
+                # 内容が変わらない限り同じ値になるよう、etags.json の更新日時を優先する
+                last_modified = entry.get('last_modified') if entry else None
+                last_modified = last_modified or formatdate(stat.st_mtime, usegmt=True)
+                if self.not_modified(etag, parsedate_to_datetime(last_modified).timestamp()):
+                    self.send_response(304)
+                    self.send_common_headers(etag, last_modified)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                body = body_file.read_bytes()
+                self.send_response(200)
+                self.send_common_headers(etag, last_modified)
+                self.send_header('Content-Type', CONTENT_TYPES.get(source.suffix)
+                                 or mimetypes.guess_type(source.name)[0] or 'application/octet-stream')
+                if encoding:
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+
+            def not_modified(self, etag, mtime):
+                """条件付きリクエストの条件を満たすか（If-None-Match があれば If-Modified-Since より優先）"""
+                if_none_match = self.headers.get('If-None-Match')
+                if if_none_match is not None:
+                    return etag_matches(if_none_match, etag)
+                if_modified_since = self.headers.get('If-Modified-Since')
+                if if_modified_since:
+                    try:
+                        return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+                    except (TypeError, ValueError):
+                        return False
+                return False
+
+            def send_common_headers(self, etag, last_modified):
+                self.send_header('ETag', etag)
+                self.send_header('Last-Modified', last_modified)
+                self.send_header('Cache-Control', CACHE_CONTROL)
+                self.send_header('Vary', 'Accept-Encoding')
+
+        return Handler
+
+    def start(self):
+        """別スレッドで待ち受けを開始"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """待ち受けを終了"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    """メイン処理"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description="docs/ を圧縮版と条件付きリクエストに対応して配信")
+    parser.add_argument('--host', default='127.0.0.1', help="待ち受けるアドレス")
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', '8000')), help="待ち受けるポート")
+    parser.add_argument('--root', default=str(DOCS_DIR), help="配信するディレクトリ")
+    args = parser.parse_args()
+
+    server = FeedServer(args.root, args.host, args.port)
+    logger.info(f"{server.root} を {server.base_url} で配信します")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,23 +3,44 @@
 
 import os
 import time
-import re
+
+# 起動から最初のページ読み込みまでの時間を計測するため、他のモジュールの読み込みより先に記録する
+PROCESS_STARTED = time.monotonic()
+
 import json
 import logging
-import datetime
 import requests
 import hashlib
+import queue
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import SessionNotCreatedException
+from wait_engine import WaitEngine
+from session_cache import SessionCache
+from image_downloader import ImageDownloader
+from article_index import ArticleIndex
+from dedup import canonicalize_url
+from page_parser import make_soup, parse_article_soup
+from browser_extract import extract_in_browser, AD_IMAGE_KEYWORDS
+from run_metrics import RunMetrics
+from discovery import DiscoveryCrawler, DISCOVERY_SECTIONS, target_window
+from run_journal import RunJournal
+from resource_blocking import BlockingConfig
+from browser_startup import resolve_driver_path, profile_arguments, DEBUGGER_ADDRESS, USE_PROFILE
+from generate_rss import generate_rss_feed, write_atomic, image_paths
+from image_variants import ImageVariants
+from request_scheduler import RequestScheduler
+from retry_policy import RetryPolicy, FetchError, RETRYABLE_STATUSES, status_error, is_retryable
 
 # ロギング設定
 logging.basicConfig(
@@ -29,26 +50,74 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # 定数
-BASE_URL = "https://xtrend.nikkei.com/"
-LOGIN_URL = "https://xtrend.nikkei.com/auth/login/"
+BASE_URL = os.environ.get('NIKKEI_BASE_URL', "https://xtrend.nikkei.com/")  # 模擬サイトで計測する場合に上書き
+LOGIN_URL = urljoin(BASE_URL, "auth/login/")
 ARTICLES_DIR = Path(__file__).parent.parent / "data" / "articles"
 IMAGES_DIR = Path(__file__).parent.parent / "data" / "images"
 DOCS_DIR = Path(__file__).parent.parent / "docs"
+ARTICLES_DATA_FILE = Path(__file__).parent.parent / "data" / "articles_data.json"
 
 # 日付フォーマット
 DATE_FORMAT = "%Y.%m.%d"
 RSS_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# 並列取得の設定（リクエストの間隔は RequestScheduler がホストごとに調整する）
+FETCH_WORKERS = int(os.environ.get('NIKKEI_FETCH_WORKERS', '2'))  # ブラウザセッション数
+
+# 記事の取得モード
+# auto: まずHTTPで取得し、「続き」ボタンの展開が必要な場合や本文が短い場合のみブラウザを使う
+# browser: 常にブラウザで取得する
+FETCH_MODE = os.environ.get('NIKKEI_FETCH_MODE', 'auto')
+HTTP_TIMEOUT = 15  # HTTP取得のタイムアウト（秒）
+MIN_HTTP_CONTENT_LENGTH = 300  # HTTPで取得した本文がこの文字数未満ならブラウザで取り直す
+
+# ブラウザ間で引き継ぐCookieの属性
+COOKIE_KEYS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+def cdp_cookie(cookie):
+    """
+    WebDriverのCookieをDevToolsの Network.setCookies の形式に変換
+    
+    Args:
+        cookie (dict): export_cookiesで取得したCookie
+        
+    Returns:
+        dict: Network.CookieParam
+    """
+    param = {k: cookie[k] for k in COOKIE_KEYS if k != 'expiry' and cookie.get(k) is not None}
+    if cookie.get('expiry'):
+        param['expires'] = cookie['expiry']
+    if not param.get('domain'):
+        param['url'] = BASE_URL
+    return param
+
 class NikkeiXTrendScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, image_downloader=None, metrics=None, blocking=None, session_index=0,
+                 scheduler=None):
         """
         日経クロストレンドスクレイパーの初期化
         
         Args:
             headless (bool): ヘッドレスモードで実行するかどうか
+            image_downloader (ImageDownloader): 共有する画像ダウンローダー（省略時は専用のものを作成）
+            metrics (RunMetrics): 記事ごとの計測値の記録先（省略時は専用のものを作成）
+            blocking (BlockingConfig): ブラウザで読み込まないリソースの設定（省略時は環境変数から作成）
+            session_index (int): ブラウザセッションの番号（プロファイルの保存先を分けるために使う）
+            scheduler (RequestScheduler): 共有するリクエストのスケジューラー（省略時は専用のものを作成）
         """
         self.setup_dirs()
+        self.metrics = metrics or RunMetrics()
+        self.blocking = blocking or BlockingConfig.from_env()
+        self.session_index = session_index
+        self.attached = False
+        self.scheduler = scheduler or RequestScheduler()
+        self.retry_policy = RetryPolicy()
+        self.owns_image_downloader = image_downloader is None
+        self.image_downloader = image_downloader or ImageDownloader(scheduler=self.scheduler)
         self.driver = self.setup_browser(headless)
+        self.waiter = WaitEngine(self.driver)
+        self.http = None
+        self.path_stats = Counter()
         self.articles_data = []
         
     def setup_dirs(self):
@@ -68,17 +137,73 @@ class NikkeiXTrendScraper:
             webdriver: 設定されたWebDriverインスタンス
         """
         chrome_options = Options()
-        if headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.implicitly_wait(10)
+        if DEBUGGER_ADDRESS and self.session_index == 0:
+            # 常駐しているブラウザに接続する（起動オプションは起動時のものが使われる）
+            chrome_options.debugger_address = DEBUGGER_ADDRESS
+            self.attached = True
+        else:
+            if headless:
+                chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--window-size=1920,1080")
+            # プロファイルとディスクキャッシュを実行間で引き継ぐ
+            for argument in profile_arguments(self.session_index) + self.blocking.browser_arguments():
+                chrome_options.add_argument(argument)
+        
+        with self.metrics.stage('driver_resolve'):
+            driver_path = resolve_driver_path()
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        except SessionNotCreatedException as e:
+            # Chromeが更新されてキャッシュしたchromedriverのバージョンが合わなくなった場合は解決し直す
+            logger.warning(f"ブラウザを起動できなかったため、chromedriverを解決し直します: {e}")
+            with self.metrics.stage('driver_resolve'):
+                driver_path = resolve_driver_path(refresh=True)
+            driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+        # 要素が無い場合にfind_elementsが毎回待たされないよう、暗黙の待機は使わず明示的に待機する
+        driver.implicitly_wait(0)
+        
+        # 広告・計測・Webフォントなど本文の抽出に不要なリソースを読み込まない
+        try:
+            self.blocking.apply(driver)
+        except Exception as e:
+            logger.warning(f"リソースの遮断を設定できませんでした: {e}")
         return driver
     
+    def navigate(self, url):
+        """
+        ブラウザでページを開く
+        
+        スケジューラーの枠を確保してから開き、ページのステータスをレートの調整に使う。
+        プロセスの起動から最初のページ読み込みが終わるまでの時間を記録する。
+        
+        Args:
+            url (str): 開くURL
+            
+        Raises:
+            FetchError: ページを開けなかった場合や、429/5xxが返された場合（再試行可能）
+        """
+        with self.scheduler.request(url, kind='browser') as outcome:
+            self.driver.get(url)
+            outcome.status = self.navigation_status()
+            # 接続できない場合、ブラウザは例外ではなくエラーページを表示する
+            if self.driver.current_url.startswith('chrome-error://'):
+                raise FetchError(f"ページを開けませんでした: {url}")
+            if outcome.status in RETRYABLE_STATUSES:
+                raise status_error(outcome.status, url)
+        self.metrics.record_once('time_to_first_page', time.monotonic() - PROCESS_STARTED)
+    
+    def navigation_status(self):
+        """直前のページ遷移のHTTPステータス（Navigation Timing の responseStatus。取得できなければNone）"""
+        try:
+            return self.driver.execute_script(
+                "const entry = performance.getEntriesByType('navigation')[0];"
+                "return entry && entry.responseStatus ? entry.responseStatus : null;"
+            )
+        except Exception:
+            return None
+    
     def login(self, username, password):
         """
         日経クロストレンドにログイン
@@ -92,7 +217,7 @@ class NikkeiXTrendScraper:
         """
         try:
             logger.info("ログイン処理を開始します")
-            self.driver.get(LOGIN_URL)
+            self.navigate(LOGIN_URL)
             
             # ログインフォームが表示されるまで待機
             WebDriverWait(self.driver, 10).until(
@@ -108,7 +233,7 @@ class NikkeiXTrendScraper:
             
             # ログイン成功の確認（トップページにリダイレクトされるか、ログイン後の要素が表示されるか）
             WebDriverWait(self.driver, 10).until(
-                EC.url_contains("xtrend.nikkei.com")
+                EC.url_contains(urlparse(BASE_URL).netloc)
             )
             
             logger.info("ログインに成功しました")
@@ -118,71 +243,178 @@ class NikkeiXTrendScraper:
             logger.error(f"ログイン中にエラーが発生しました: {e}")
             return False
     
-    def get_yesterday_articles(self):
+    def login_with_cache(self, username, password, cache):
+        """
+        キャッシュしたセッションを再利用してログイン（無効ならフォームからログイン）
+        
+        Args:
+            username (str): ログイン用ユーザー名/メールアドレス
+            password (str): ログイン用パスワード
+            cache (SessionCache): セッションキャッシュ
+            
+        Returns:
+            bool: ログイン成功したかどうか
+        """
+        cookies = cache.load()
+        if cookies:
+            self.import_cookies(cookies)
+            if self.is_logged_in():
+                logger.info("キャッシュしたセッションでログインしました")
+                return True
+            logger.info("キャッシュしたセッションが無効になっていたため、再ログインします")
+            cache.clear()
+            self.driver.delete_all_cookies()
+        
+        if not self.login(username, password):
+            return False
+        
+        cache.save(self.export_cookies())
+        return True
+    
+    def is_logged_in(self):
+        """
+        現在のCookieでログイン済みかどうかを確認
+        
+        キャッシュしたセッションの確認はこの1回の遷移だけで行う（import_cookiesはページを開かない）。
+        
+        Returns:
+            bool: ログインページでフォームが表示されなければログイン済みとみなす
+        """
+        try:
+            self.navigate(LOGIN_URL)
+            self.waiter.document_ready()
+            return not self.driver.find_elements(By.ID, "LA7010Form01:LA7010Email")
+        except Exception as e:
+            logger.warning(f"ログイン状態の確認中にエラーが発生しました: {e}")
+            return False
+    
+    def export_cookies(self):
+        """
+        ログイン済みセッションのCookieを取得
+        
+        Returns:
+            list: Cookie情報のリスト
+        """
+        return self.driver.get_cookies()
+    
+    def import_cookies(self, cookies):
+        """
+        他のセッションで取得したCookieを設定してログイン状態を共有
+        
+        Args:
+            cookies (list): export_cookiesで取得したCookie情報のリスト
+        """
+        # DevToolsで設定できればページを開く必要が無く、ログイン状態の確認の1回の遷移だけで済む
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': [cdp_cookie(c) for c in cookies]})
+            return
+        except Exception as e:
+            logger.debug(f"DevToolsでCookieを設定できなかったため、ページを開いて設定します: {e}")
+        
+        # Cookieを設定するには対象ドメインのページを開いている必要がある
+        self.navigate(BASE_URL)
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie({k: v for k, v in cookie.items() if k in COOKIE_KEYS})
+            except Exception as e:
+                logger.warning(f"Cookie「{cookie.get('name')}」の設定に失敗しました: {e}")
+    
+    def setup_http_session(self, cookies=None):
+        """
+        ブラウザのCookieを引き継いだHTTPセッションを作成
+        
+        Args:
+            cookies (list): 使用するCookie（省略時はこのブラウザのCookie）
         """
-        昨日公開された記事のURLとタイトルを取得
+        if cookies is None:
+            cookies = self.export_cookies()
         
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        # ブラウザと同じUser-Agentを使う
+        session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent;")
+        for cookie in cookies:
+            session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie.get('domain'),
+                path=cookie.get('path', '/')
+            )
+        
+        self.http = session
+    
+    def get_yesterday_articles(self, index=None, window=None):
+        """
+        昨日（NIKKEI_DISCOVERY_DAYS で指定した期間）に公開された記事のURLとタイトルを取得
+        
+        トップページとセクションページを巡回し、一覧に書かれた公開日で絞り込む。
+        
+        Args:
+            index (ArticleIndex): 記事索引（取得済みの記事を除外する）
+            window (tuple): 検索対象の期間（省略時は target_window()）
+            
         Returns:
             list: 記事情報のリスト（辞書形式）
         """
         logger.info("昨日公開された記事を検索します")
         
-        # トップページにアクセス
-        self.driver.get(BASE_URL)
+        window = window or target_window()
+        logger.info(f"検索対象日: {window[0]}〜{window[1]}")
         
-        # 昨日の日付を取得（日本時間）
-        jst_now = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9)))
-        yesterday = jst_now - datetime.timedelta(days=1)
-        yesterday_str = yesterday.strftime(DATE_FORMAT)
-        logger.info(f"検索対象日: {yesterday_str}")
+        start_urls = [BASE_URL] + [urljoin(BASE_URL, path) for path in DISCOVERY_SECTIONS]
+        crawler = DiscoveryCrawler(self.load_listing_page, start_urls, window)
+        entries = crawler.crawl()
+        self.metrics.add('discovery_pages', crawler.pages)
         
-        # ページ内の記事リンクを取得
+        # 一覧に日付が無い記事は対象期間の最終日としておき、取得後に記事ページの公開日で置き換える
         articles = []
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        
-        # 記事リンクを探索
-        article_links = soup.find_all('a', href=True)
-        
-        for link in article_links:
-            href = link.get('href')
-            # 記事URLのパターンに一致するか確認
-            if href and re.match(r'/atcl/contents/', href):
-                # 完全なURLを構築
-                article_url = urljoin(BASE_URL, href)
-                
-                # タイトルを取得（リンクのテキストまたは親要素内のタイトル要素）
-                title = link.get_text(strip=True)
-                if not title:
-                    title_elem = link.find('h2') or link.find('h3') or link.find('h4')
-                    if title_elem:
-                        title = title_elem.get_text(strip=True)
-                
-                if title and len(title) > 5:  # 有効なタイトルのみ追加
-                    article_id = self.generate_article_id(article_url)
-                    articles.append({
-                        'id': article_id,
-                        'url': article_url,
-                        'title': title,
-                        'date': yesterday_str
-                    })
+        for entry in entries:
+            articles.append({
+                'id': self.generate_article_id(entry['url']),
+                'url': entry['url'],
+                'title': entry['title'],
+                'date': entry['date'] or window[1]
+            })
         
         logger.info(f"{len(articles)}件の記事候補を見つけました")
         
-        # 重複を除去
-        unique_articles = []
-        seen_urls = set()
+        # 取得済みの記事を除外
+        if index is not None:
+            articles = [a for a in articles if not index.is_fetched(a['id'])]
+            logger.info(f"未取得の記事: {len(articles)}件")
+        
+        return articles
+    
+    def load_listing_page(self, url):
+        """
+        記事一覧ページを取得（HTTPで取得できればブラウザを使わない）
         
-        for article in articles:
-            if article['url'] not in seen_urls:
-                seen_urls.add(article['url'])
-                unique_articles.append(article)
+        Args:
+            url (str): ページのURL
+            
+        Returns:
+            tuple: (HTML, 最終的なURL)
+        """
+        if FETCH_MODE == 'auto' and self.http:
+            try:
+                with self.scheduler.request(url) as outcome:
+                    response = outcome.response(self.http.get(url, timeout=HTTP_TIMEOUT))
+                # 記事リンクが含まれていなければ、スクリプトで描画されるページとしてブラウザで取得する
+                if response.status_code == 200 and '/atcl/contents/' in response.text:
+                    return response.text, response.url
+            except requests.RequestException as e:
+                logger.info(f"一覧ページをHTTPで取得できなかったためブラウザで取得します: {e}")
         
-        logger.info(f"重複除去後: {len(unique_articles)}件の記事")
-        return unique_articles
+        self.navigate(url)
+        self.waiter.page_settled()
+        return self.driver.page_source, self.driver.current_url
     
     def generate_article_id(self, url):
-        """URLからユニークなIDを生成"""
-        return hashlib.md5(url.encode()).hexdigest()
+        """URLからユニークなIDを生成（正規化したURLから作るため、同じ記事のURLの違いではIDが変わらない）"""
+        return hashlib.md5(canonicalize_url(url).encode()).hexdigest()
     
     def fetch_article_content(self, article):
         """
@@ -197,74 +429,248 @@ class NikkeiXTrendScraper:
         url = article['url']
         logger.info(f"記事「{article['title']}」の内容を取得します: {url}")
         
-        try:
+        metrics = self.metrics.article(article)
+        # 再試行キューから取り直す記事は、前回の失敗の記録を消しておく
+        for key in ('error', 'retryable', 'incomplete_images'):
+            article.pop(key, None)
+        
+        # タイムアウト・接続エラー・429/5xxは指数バックオフで再試行し、それ以外の失敗は再試行しない
+        attempt = 0
+        while True:
+            attempt += 1
+            self.waiter.reset()
+            try:
+                self.fetch_article_once(article, metrics)
+                metrics.finish(article['fetch_path'])
+                return article
+            except Exception as e:
+                delay = self.retry_policy.delay(attempt, e) if self.retry_policy.should_retry(attempt, e) else None
+                if delay is not None:
+                    logger.warning(
+                        f"記事「{article['title']}」の取得に失敗したため、{delay:.1f}秒後に再試行します（{attempt}回目）: {e}"
+                    )
+                    metrics.add('fetch_retries')
+                    time.sleep(delay)
+                    continue
+                
+                logger.error(f"記事「{article['title']}」の取得中にエラーが発生しました: {e}")
+                article['error'] = str(e)
+                # 再試行可能な失敗は再試行キューに入れ、後の実行で取り直す
+                article['retryable'] = is_retryable(e)
+                metrics.finish(article.get('fetch_path'), str(e))
+                return article
+    
+    def fetch_article_once(self, article, metrics):
+        """
+        記事の全文と画像を1回取得（失敗した場合は例外を送出する）
+        
+        Args:
+            article (dict): 記事情報（取得結果で更新する）
+            metrics (ArticleMetrics): 記事の計測値
+        """
+        url = article['url']
+        # まずHTTPのみで取得を試みる
+        fetched = None
+        if FETCH_MODE == 'auto' and self.http:
+            fetched = self.fetch_article_via_http(url, metrics)
+            if not fetched:
+                # HTTPで取得できず、ブラウザで取り直す
+                metrics.add('retries')
+        
+        if fetched:
+            content, image_candidates = fetched
+            article['fetch_path'] = 'http'
+        else:
             # 記事ページにアクセス
-            self.driver.get(url)
+            with metrics.step('page_load'):
+                self.navigate(url)
+                self.waiter.document_ready()
             
             # 「続き」ボタンがあれば全てクリック
-            self.click_all_continue_buttons()
-            
-            # 記事本文を取得
-            content = self.extract_article_content()
+            with metrics.step('button_expansion'):
+                self.click_all_continue_buttons()
             
-            # 記事内の画像をダウンロード
-            images = self.download_article_images(article['id'])
+            # 記事本文と画像候補をまとめて取得
+            with metrics.step('extraction'):
+                content, image_candidates, transfer = self.extract_article_in_browser()
+            for key, value in transfer.items():
+                metrics.add(key, value)
+            article['fetch_path'] = 'browser'
+        
+        self.path_stats[article['fetch_path']] += 1
+        
+        # 記事内の画像をダウンロード
+        image_stats = Counter()
+        with metrics.step('image_download'):
+            images = self.download_article_images(article['id'], image_candidates, image_stats)
+        for key, value in image_stats.items():
+            metrics.add(f"image_{key}", value)
+        if image_stats['failed']:
+            # 取得できなかった画像がある記事は、フィードに載せたうえで後の実行で取り直す
+            article['incomplete_images'] = image_stats['failed']
+        
+        # 記事情報を更新（公開日は記事ページの表記を優先する）
+        if content.get('publish_date'):
+            article['date'] = content['publish_date']
+        article['content'] = content
+        article['images'] = images
+        article['wait_timings'] = self.waiter.summary()
+        
+        # Markdown形式で保存
+        with metrics.step('markdown_write'):
+            metrics.add('markdown_bytes', self.save_article_as_markdown(article))
+    
+    def fetch_article_via_http(self, url, metrics):
+        """
+        ブラウザを使わずにHTTPで記事を取得
+        
+        Args:
+            url (str): 記事URL
+            metrics (ArticleMetrics): 記事の計測値
             
-            # 記事情報を更新
-            article['content'] = content
-            article['images'] = images
+        Returns:
+            tuple: (記事コンテンツ情報, 画像候補のリスト)。ブラウザでの取得が必要な場合はNone
             
-            # Markdown形式で保存
-            self.save_article_as_markdown(article)
+        Raises:
+            FetchError: 429/5xxが返された場合
+            requests.RequestException: タイムアウトや接続エラーの場合
+        """
+        try:
+            with metrics.step('page_load'), self.scheduler.request(url) as outcome:
+                response = outcome.response(self.http.get(url, timeout=HTTP_TIMEOUT))
+        except requests.RequestException as e:
+            # サイトに接続できない場合はブラウザでも取得できないため、記事ごと再試行する
+            if is_retryable(e):
+                raise
+            logger.info(f"HTTPでの取得に失敗したためブラウザで取得します: {e}")
+            return None
+        if response.status_code in RETRYABLE_STATUSES:
+            raise status_error(response.status_code, url)
+        metrics.add('page_bytes', len(response.content))
+        
+        with metrics.step('extraction'):
+            return self.parse_http_article(response)
+    
+    def parse_http_article(self, response):
+        """
+        HTTPで取得した記事ページを解析
+        
+        Args:
+            response (requests.Response): 記事ページの応答
             
-            return article
+        Returns:
+            tuple: (記事コンテンツ情報, 画像候補のリスト)。ブラウザでの取得が必要な場合はNone
+        """
+        # ログインページにリダイレクトされた場合はセッションが使えない
+        if response.status_code != 200 or urlparse(response.url).path.startswith('/auth/'):
+            logger.info(f"HTTPでの取得結果が不正なためブラウザで取得します（status={response.status_code}）")
+            return None
+        
+        soup = make_soup(response.content)
+        
+        # 「続き」ボタンの展開が必要な記事はブラウザで取得する
+        if soup.find(lambda tag: tag.name == 'button' and '続き' in tag.get_text()):
+            logger.info("「続き」ボタンがあるためブラウザで取得します")
+            return None
+        
+        # 本文抽出で要素が削除されるため、先に画像候補を集める
+        image_candidates = self.collect_images_from_soup(soup, response.url)
+        content = parse_article_soup(soup)
+        if len(content['content_text']) < MIN_HTTP_CONTENT_LENGTH:
+            logger.info(f"HTTPで取得した本文が短いためブラウザで取得します（{len(content['content_text'])}文字）")
+            return None
+        
+        return content, image_candidates
+    
+    def collect_images_from_soup(self, soup, page_url):
+        """
+        HTMLから画像候補を収集
+        
+        Args:
+            soup (BeautifulSoup): 記事ページ
+            page_url (str): 相対URLの基準となるページURL
             
-        except Exception as e:
-            logger.error(f"記事「{article['title']}」の取得中にエラーが発生しました: {e}")
-            article['error'] = str(e)
-            return article
+        Returns:
+            list: 画像候補（src, width, height, alt）のリスト
+        """
+        candidates = []
+        for img in soup.find_all('img'):
+            src = img.get('src') or img.get('data-src')
+            if not src:
+                continue
+            candidates.append({
+                'src': urljoin(page_url, src),
+                'width': img.get('width'),
+                'height': img.get('height'),
+                'alt': img.get('alt') or ""
+            })
+        return candidates
     
     def click_all_continue_buttons(self):
         """記事ページ内の「続き」ボタンを全てクリック"""
         try:
             # 「続き」ボタンを探して全てクリック
-            continue_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), '続き')]")
-            
-            if continue_buttons:
-                logger.info(f"{len(continue_buttons)}個の「続き」ボタンを見つけました")
-                
-                for i, button in enumerate(continue_buttons):
-                    try:
-                        # ボタンが表示されるまでスクロール
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                        time.sleep(1)  # スクロール後少し待機
-                        
-                        # ボタンをクリック
-                        button.click()
-                        logger.info(f"「続き」ボタン {i+1}/{len(continue_buttons)} をクリックしました")
-                        time.sleep(2)  # コンテンツ読み込み待機
-                    except Exception as e:
-                        logger.warning(f"ボタン {i+1} のクリックに失敗しました: {e}")
-            else:
+            clicked = self.click_buttons("//button[contains(text(), '続き')]", "続き")
+            if not clicked:
                 logger.info("「続き」ボタンは見つかりませんでした")
                 
             # 他の可能性のあるボタンも探す
-            other_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), '続きを見る')]")
-            if other_buttons:
-                logger.info(f"{len(other_buttons)}個の「続きを見る」ボタンを見つけました")
-                for i, button in enumerate(other_buttons):
-                    try:
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-                        time.sleep(1)
-                        button.click()
-                        logger.info(f"「続きを見る」ボタン {i+1}/{len(other_buttons)} をクリックしました")
-                        time.sleep(2)
-                    except Exception as e:
-                        logger.warning(f"「続きを見る」ボタン {i+1} のクリックに失敗しました: {e}")
+            self.click_buttons("//button[contains(text(), '続きを見る')]", "続きを見る")
                         
         except Exception as e:
             logger.error(f"「続き」ボタンの処理中にエラーが発生しました: {e}")
     
+    def click_buttons(self, xpath, label):
+        """
+        XPathに一致するボタンを順にクリックし、内容が展開されるまで待機
+        
+        Args:
+            xpath (str): ボタンを探すXPath
+            label (str): ログ表示用のボタン名
+            
+        Returns:
+            int: 見つかったボタンの数
+        """
+        buttons = self.driver.find_elements(By.XPATH, xpath)
+        if not buttons:
+            return 0
+        
+        logger.info(f"{len(buttons)}個の「{label}」ボタンを見つけました")
+        for i, button in enumerate(buttons):
+            try:
+                # ボタンが表示されるまでスクロール（scrollIntoViewは同期的に完了する）
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
+                
+                # ボタンをクリック
+                button.click()
+                logger.info(f"「{label}」ボタン {i+1}/{len(buttons)} をクリックしました")
+                
+                # ボタンが消え、追加された本文の描画が落ち着くまで待機
+                self.waiter.expanded(button)
+            except Exception as e:
+                logger.warning(f"「{label}」ボタン {i+1} のクリックに失敗しました: {e}")
+        
+        return len(buttons)
+    
+    def extract_article_in_browser(self):
+        """
+        ブラウザ内で記事本文・メタデータ・画像候補をまとめて抽出
+        
+        ページ全体のHTMLや画像ごとの属性を個別に取得しないため、WebDriverとの通信回数が少ない。
+        スクリプトが失敗した場合はページのHTMLを解析する方法に切り替える。
+        
+        Returns:
+            tuple: (記事コンテンツ情報, 画像候補のリスト, 転送量の内訳)
+        """
+        # ページの読み込みが落ち着くまで待機
+        self.waiter.page_settled()
+        
+        try:
+            return extract_in_browser(self.driver)
+        except Exception as e:
+            logger.warning(f"ブラウザ内での抽出に失敗したため、HTMLを解析します: {e}")
+            return self.extract_article_content(), self.collect_images_from_driver(), {}
+    
     def extract_article_content(self):
         """
         記事本文を抽出
@@ -272,81 +678,39 @@ class NikkeiXTrendScraper:
         Returns:
             dict: 記事コンテンツ情報
         """
-        # ページが完全に読み込まれるまで少し待機
-        time.sleep(3)
-        
-        soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-        
-        # 記事タイトル
-        title_elem = soup.find('h1')
-        title = title_elem.get_text(strip=True) if title_elem else "タイトルなし"
-        
-        # 公開日
-        date_elem = soup.find('time') or soup.find(class_=lambda c: c and 'date' in c.lower())
-        publish_date = None
-        if date_elem:
-            date_text = date_elem.get_text(strip=True)
-            # 日付形式を抽出（YYYY.MM.DD または YYYY年MM月DD日）
-            date_match = re.search(r'(\d{4})[\.年](\d{1,2})[\.月](\d{1,2})', date_text)
-            if date_match:
-                year, month, day = date_match.groups()
-                publish_date = f"{year}.{month.zfill(2)}.{day.zfill(2)}"
-        
-        # カテゴリ
-        category_elem = soup.find(class_=lambda c: c and ('category' in c.lower() or 'cat' in c.lower()))
-        category = category_elem.get_text(strip=True) if category_elem else None
-        
-        # 記事本文
-        # 複数の可能性のあるセレクタを試す
-        content_selectors = [
-            'article', 
-            '.article-body', 
-            '.article-content',
-            'main',
-            '#article-body',
-            '.content'
-        ]
-        
-        content_elem = None
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem and len(content_elem.get_text(strip=True)) > 100:
-                break
-        
-        # コンテンツ要素が見つからない場合は、本文らしき段落を全て取得
-        if not content_elem:
-            paragraphs = soup.find_all('p')
-            content_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 50])
-        else:
-            # 不要な要素を除去（ナビゲーション、広告、関連記事など）
-            for elem in content_elem.select('.ad, .advertisement, .related, .share, .social, nav, footer, .footer'):
-                elem.decompose()
-            
-            # 本文テキストを取得
-            paragraphs = content_elem.find_all('p')
-            if paragraphs:
-                content_text = "\n\n".join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])
-            else:
-                content_text = content_elem.get_text(strip=True)
+        # ページの読み込みが落ち着くまで待機
+        self.waiter.page_settled()
         
-        # 著者情報
-        author_elem = soup.find(class_=lambda c: c and 'author' in c.lower())
-        author = author_elem.get_text(strip=True) if author_elem else "日経クロストレンド"
+        soup = make_soup(self.driver.page_source)
+        return parse_article_soup(soup)
+    
+    def collect_images_from_driver(self):
+        """
+        ブラウザで表示中のページから画像候補を収集
         
-        return {
-            'title': title,
-            'publish_date': publish_date,
-            'category': category,
-            'content_text': content_text,
-            'author': author
-        }
+        Returns:
+            list: 画像候補（src, width, height, alt）のリスト
+        """
+        candidates = []
+        for img in self.driver.find_elements(By.TAG_NAME, "img"):
+            src = img.get_attribute("src")
+            candidate = {'src': src, 'width': None, 'height': None, 'alt': ""}
+            # URLで除外できる画像は追加の属性を取得しない
+            if src and not self.is_ad_or_icon_image(src):
+                candidate['width'] = img.get_attribute("width")
+                candidate['height'] = img.get_attribute("height")
+                candidate['alt'] = img.get_attribute("alt") or ""
+            candidates.append(candidate)
+        return candidates
     
-    def download_article_images(self, article_id):
+    def download_article_images(self, article_id, candidates=None, stats=None):
         """
         記事内の画像をダウンロード
         
         Args:
             article_id (str): 記事ID
+            candidates (list): 画像候補のリスト（省略時はブラウザで表示中のページから収集）
+            stats (Counter): この記事の画像取得の統計を加算する
             
         Returns:
             list: ダウンロードした画像情報のリスト
@@ -354,44 +718,33 @@ class NikkeiXTrendScraper:
         images = []
         
         try:
-            # 記事ページ内の画像要素を取得
-            img_elements = self.driver.find_elements(By.TAG_NAME, "img")
+            # 記事ページ内の画像候補を取得
+            if candidates is None:
+                candidates = self.collect_images_from_driver()
             
-            # 記事ID用のディレクトリを作成
-            article_img_dir = IMAGES_DIR / article_id
-            article_img_dir.mkdir(exist_ok=True)
-            
-            for i, img in enumerate(img_elements):
-                try:
-                    # 画像URLを取得
-                    img_url = img.get_attribute("src")
+            jobs = []
+            for i, img in enumerate(candidates):
+                # ブラウザ内で事前に絞り込んだ候補は元のページ内での順番を持つ
+                i = img.get('index', i)
+                
+                # 画像URLを取得
+                img_url = img['src']
+                
+                # 有効なURLかつ広告やアイコンでない場合のみ処理
+                if img_url and not self.is_ad_or_icon_image(img_url, img['width'], img['height']):
+                    # 画像ファイル名を生成
+                    img_filename = f"{i+1}_{Path(urlparse(img_url).path).name}"
+                    if not img_filename.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
+                        img_filename += '.jpg'
                     
-                    # 有効なURLかつ広告やアイコンでない場合のみ処理
-                    if img_url and not self.is_ad_or_icon_image(img_url, img):
-                        # 画像ファイル名を生成
-                        img_filename = f"{i+1}_{Path(urlparse(img_url).path).name}"
-                        if not img_filename.endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-                            img_filename += '.jpg'
-                        
-                        img_path = article_img_dir / img_filename
-                        
-                        # 画像をダウンロード
-                        response = requests.get(img_url, stream=True)
-                        if response.status_code == 200:
-                            with open(img_path, 'wb') as f:
-                                for chunk in response.iter_content(1024):
-                                    f.write(chunk)
-                            
-                            # 画像情報を記録
-                            alt_text = img.get_attribute("alt") or ""
-                            images.append({
-                                'filename': img_filename,
-                                'path': str(img_path.relative_to(Path(__file__).parent.parent)),
-                                'alt': alt_text
-                            })
-                            logger.info(f"画像をダウンロードしました: {img_filename}")
-                except Exception as e:
-                    logger.warning(f"画像 {i+1} のダウンロード中にエラーが発生しました: {e}")
+                    jobs.append({
+                        'url': img_url,
+                        'filename': img_filename,
+                        'alt': img['alt']
+                    })
+            
+            # 画像を並列に取得（保存先は内容のハッシュで決まり、記事間で共有される）
+            images = self.image_downloader.download_all(jobs, stats)
             
             logger.info(f"{len(images)}個の画像をダウンロードしました")
             return images
@@ -400,16 +753,14 @@ class NikkeiXTrendScraper:
             logger.error(f"画像ダウンロード処理中にエラーが発生しました: {e}")
             return images
     
-    def is_ad_or_icon_image(self, img_url, img_element):
+    def is_ad_or_icon_image(self, img_url, width=None, height=None):
         """広告やアイコン画像かどうかを判定"""
         # URLに基づく判定
-        if any(keyword in img_url.lower() for keyword in ['ad', 'advertisement', 'banner', 'icon', 'logo', 'button']):
+        if any(keyword in img_url.lower() for keyword in AD_IMAGE_KEYWORDS):
             return True
         
         # サイズに基づく判定（小さすぎる画像はアイコンの可能性）
         try:
-            width = img_element.get_attribute("width")
-            height = img_element.get_attribute("height")
             if width and height:
                 if int(width) < 100 or int(height) < 100:
                     return True
@@ -424,6 +775,9 @@ class NikkeiXTrendScraper:
         
         Args:
             article (dict): 記事情報
+            
+        Returns:
+            int: 書き込んだバイト数
         """
         article_id = article['id']
         content = article['content']
@@ -457,25 +811,144 @@ class NikkeiXTrendScraper:
         # 元記事URL
         md_content += f"**元記事**: [{article['url']}]({article['url']})\n"
         
-        # ファイルに保存
-        with open(md_file, 'w', encoding='utf-8') as f:
-            f.write(md_content)
+        # ファイルに保存（書き込み途中で中断しても不完全なファイルが残らないようにする）
+        write_atomic(md_file, [md_content])
         
         logger.info(f"記事をMarkdown形式で保存しました: {md_file}")
+        return len(md_content.encode('utf-8'))
     
     def generate_rss(self):
         """RSSフィードを生成"""
-        from generate_rss import generate_rss_feed
         generate_rss_feed()
     
     def close(self):
         """ブラウザを閉じる"""
+        if self.http:
+            self.http.close()
+        if self.owns_image_downloader:
+            self.image_downloader.close()
         if self.driver:
+            # 常駐しているブラウザに接続した場合、quitはセッションを終了するだけでブラウザは閉じない
             self.driver.quit()
-            logger.info("ブラウザを閉じました")
+            logger.info("ブラウザとの接続を終了しました" if self.attached else "ブラウザを閉じました")
+
+class ScraperPool:
+    """ログイン状態を共有する複数のブラウザセッションで記事を並列取得"""
+    
+    def __init__(self, primary, size, headless=True):
+        """
+        スクレイパープールの初期化
+        
+        Args:
+            primary (NikkeiXTrendScraper): ログイン済みのスクレイパー
+            size (int): 同時に使用するブラウザセッション数
+            headless (bool): ヘッドレスモードで実行するかどうか
+        """
+        self.primary = primary
+        self.scrapers = [primary]
+        
+        # ログインは一度だけ行い、Cookieを他のセッションへコピーする
+        cookies = primary.export_cookies()
+        if primary.http is None:
+            primary.setup_http_session(cookies)
+        for i in range(1, max(1, size)):
+            scraper = None
+            try:
+                scraper = NikkeiXTrendScraper(
+                    headless=headless,
+                    image_downloader=primary.image_downloader,
+                    metrics=primary.metrics,
+                    blocking=primary.blocking,
+                    session_index=i,
+                    scheduler=primary.scheduler
+                )
+                scraper.import_cookies(cookies)
+                scraper.setup_http_session(cookies)
+                self.scrapers.append(scraper)
+            except Exception as e:
+                logger.warning(f"ブラウザセッション {i+1} の起動に失敗しました: {e}")
+                if scraper:
+                    scraper.close()
+        
+        logger.info(f"{len(self.scrapers)}個のブラウザセッションで記事を取得します")
+        
+        self.idle = queue.Queue()
+        for scraper in self.scrapers:
+            self.idle.put(scraper)
+    
+    def path_stats(self):
+        """
+        取得経路ごとの記事数を集計
+        
+        Returns:
+            dict: {'http': 件数, 'browser': 件数}
+        """
+        stats = Counter()
+        for scraper in self.scrapers:
+            stats.update(scraper.path_stats)
+        return dict(stats)
+    
+    def fetch_all(self, articles, on_done=None):
+        """
+        記事を並列に取得
+        
+        Args:
+            articles (list): 記事情報のリスト
+            on_done (callable): 記事1件の取得が終わるたびに、更新された記事情報を渡して呼び出す
+            
+        Returns:
+            list: 更新された記事情報のリスト（入力と同じ順序）
+        """
+        with ThreadPoolExecutor(max_workers=len(self.scrapers)) as executor:
+            return list(executor.map(lambda article: self._fetch_one(article, on_done), articles))
+    
+    def _fetch_one(self, article, on_done=None):
+        """空いているセッションを借りて記事を1件取得"""
+        scraper = self.idle.get()
+        try:
+            # エラーは fetch_article_content 内で article['error'] に記録される
+            article = scraper.fetch_article_content(article)
+            if on_done:
+                on_done(article)
+            return article
+        finally:
+            # サーバー負荷に応じた間隔は、各リクエストが RequestScheduler で待つ
+            self.idle.put(scraper)
+    
+    def close(self):
+        """プライマリ以外のブラウザを閉じる"""
+        for scraper in self.scrapers:
+            if scraper is not self.primary:
+                scraper.close()
+        self.scrapers = [self.primary]
+
+def interrupted_articles(articles, finished):
+    """
+    中断した実行の記事を、索引に記録する形にする（未取得の記事は再試行可能な失敗とする）
+
+    Args:
+        articles (list): 中断した実行で発見した記事のリスト
+        finished (dict): {記事ID: 取得が終わった記事}
+
+    Returns:
+        list: 記事情報のリスト
+    """
+    result = []
+    for article in articles:
+        if article['id'] in finished:
+            result.append(finished[article['id']])
+        else:
+            result.append(dict(article, error="実行が中断したため取得できませんでした", retryable=True))
+    logger.info(f"中断した実行の記事を引き継ぎます: 取得済み{len(finished)}件、未取得{len(result) - len(finished)}件")
+    return result
+
 
-def main():
+def main(argv=None):
     """メイン処理"""
+    parser = argparse.ArgumentParser(description="日経クロストレンドの記事を取得してRSSフィードを生成")
+    parser.add_argument('--resume', action='store_true', help="中断した実行をジャーナルから再開し、未取得の記事だけを取得する")
+    args = parser.parse_args(argv)
+    
     # 環境変数からログイン情報を取得
     username = os.environ.get('NIKKEI_USERNAME')
     password = os.environ.get('NIKKEI_PASSWORD')
@@ -485,44 +958,142 @@ def main():
         return 1
     
     scraper = None
+    pool = None
+    index = None
+    metrics = RunMetrics()
+    journal = RunJournal()
     try:
-        # スクレイパーを初期化
-        scraper = NikkeiXTrendScraper(headless=True)
+        # 記事索引を開く（初回やキャッシュが無い場合は既存の記事データから作り直す）
+        index = ArticleIndex()
+        if len(index) == 0 and ARTICLES_DATA_FILE.exists():
+            with open(ARTICLES_DATA_FILE, 'r', encoding='utf-8') as f:
+                index.record_all(json.load(f))
+            logger.info(f"既存の記事データを索引に取り込みました: {len(index)}件")
         
-        # ログイン
-        if not scraper.login(username, password):
-            logger.error("ログインに失敗しました")
-            return 1
+        # 中断した実行を再開する場合は、ジャーナルから発見済みの記事と取得済みの記事を復元
+        window = target_window()
+        articles, finished = None, {}
+        recovered = []
+        resumed = journal.replay(window) if args.resume else None
+        if resumed:
+            journal_articles, journal_finished, same_window = resumed
+            if same_window:
+                articles, finished = journal_articles, journal_finished
+            else:
+                # 別の期間（前日など）の中断した実行は、取得済みの記事を索引に記録し、
+                # 残りの記事は再試行キューに入れて今回の実行で取り直す
+                recovered = list(journal_finished.values())
+                index.record_all(interrupted_articles(journal_articles, journal_finished))
+                journal.finish()
         
-        # 昨日公開された記事を取得
-        articles = scraper.get_yesterday_articles()
+        if articles is None or len(finished) < len(articles):
+            # スクレイパーを初期化
+            with metrics.stage('browser_startup'):
+                scraper = NikkeiXTrendScraper(headless=True, metrics=metrics)
+            metrics.info['resource_blocking'] = scraper.blocking.describe()
+            metrics.info['browser'] = {'attached': scraper.attached, 'persistent_profile': USE_PROFILE and not scraper.attached}
+            
+            # ログイン（前回のセッションが有効なら再利用）
+            cache = SessionCache(os.environ.get('NIKKEI_SESSION_KEY') or password)
+            with metrics.stage('login'):
+                logged_in = scraper.login_with_cache(username, password, cache)
+            if not logged_in:
+                logger.error("ログインに失敗しました")
+                metrics.status = 'login_failed'
+                return 1
+            
+            # 昨日公開された記事のうち未取得のものを取得（一覧ページはHTTPで取得できればブラウザを使わない）
+            scraper.setup_http_session()
+            if articles is None:
+                with metrics.stage('discovery'):
+                    discovered = scraper.get_yesterday_articles(index, window)
+                
+                # 前回までの実行で取得できなかった記事（再試行キュー）を先に取得する
+                queued = index.retry_queue()
+                if queued:
+                    logger.info(f"再試行キューの記事を先に取得します: {len(queued)}件")
+                    metrics.add('retry_queue_drained', len(queued))
+                queued_ids = {a['id'] for a in queued}
+                articles = queued + [a for a in discovered if a['id'] not in queued_ids]
+                
+                if articles:
+                    journal.start(window, articles)
+                elif recovered:
+                    # 中断した実行から索引に記録した記事は、記事データとフィードに反映する
+                    logger.info("新しく取得する記事はありませんが、中断した実行から引き継いだ記事を保存します")
+                else:
+                    logger.warning("新しく取得する記事は見つかりませんでした")
+                    metrics.status = 'no_articles'
+                    return 0
+            
+            # 各記事の内容を並列に取得し、1件終わるたびにジャーナルへ追記
+            remaining = [a for a in articles if a['id'] not in finished]
+            if remaining:
+                with metrics.stage('pool_startup'):
+                    pool = ScraperPool(scraper, FETCH_WORKERS, headless=True)
+                with metrics.stage('fetch'):
+                    for article in pool.fetch_all(remaining, on_done=journal.append):
+                        finished[article['id']] = article
+                logger.info(f"取得経路: {pool.path_stats()}")
         
-        if not articles:
-            logger.warning("昨日公開された記事は見つかりませんでした")
-            return 0
+        # 発見した順序のまま取得結果に置き換える
+        articles = [finished[a['id']] for a in articles]
         
-        # 各記事の内容を取得
-        for article in articles:
-            scraper.fetch_article_content(article)
-            time.sleep(2)  # サーバー負荷軽減のため少し待機
+        # 取得した画像の縮小版とサムネイルを複数のプロセスで作成（変換済みの画像は飛ばす）
+        with metrics.stage('image_transcode'):
+            variants = ImageVariants()
+            transcode_stats = variants.process(path for article in recovered + articles for path in image_paths(article))
+            variants.save()
+        for key, value in transcode_stats.items():
+            metrics.add(f"transcode_{key}", value)
         
-        # 記事データを保存
-        with open(Path(__file__).parent.parent / "data" / "articles_data.json", 'w', encoding='utf-8') as f:
-            json.dump(articles, f, ensure_ascii=False, indent=2)
+        # 取得結果を索引に記録し、索引の全記事を記事データとして保存（一時ファイルに書き出してから置き換える）
+        with metrics.stage('index_write'):
+            index.record_all(articles)
+            # 本文がほぼ同じ既存の記事がある記事は、フィードではその記事にまとめる
+            duplicates = [a for a in articles if a.get('duplicate_of')]
+            if duplicates:
+                logger.info(f"本文が既存の記事とほぼ同じ記事: {len(duplicates)}件（フィードでは1件にまとめます）")
+            metrics.add('near_duplicates', len(duplicates))
+            retry_queue_size = index.retry_queue_size()
+            if retry_queue_size:
+                logger.info(f"再試行キューの記事: {retry_queue_size}件（次回の実行で先に取得します）")
+            metrics.add('retry_queue', retry_queue_size)
+            encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+            write_atomic(ARTICLES_DATA_FILE, encoder.iterencode(index.all_articles()))
         
         # RSSフィードを生成
-        scraper.generate_rss()
+        with metrics.stage('feed_render'):
+            generate_rss_feed()
+        
+        # 全ての結果を保存できたのでジャーナルは不要
+        journal.finish()
         
         logger.info("処理が完了しました")
+        metrics.status = 'ok'
         return 0
         
     except Exception as e:
         logger.error(f"処理中にエラーが発生しました: {e}")
+        metrics.status = 'error'
         return 1
         
     finally:
+        journal.close()
+        if scraper:
+            metrics.info['request_scheduler'] = scraper.scheduler.describe()
+        if pool:
+            pool.close()
         if scraper:
             scraper.close()
+        if index:
+            index.close()
+        
+        # 実行の計測結果を記事データと同じディレクトリに保存
+        try:
+            metrics.write()
+        except Exception as e:
+            logger.warning(f"計測結果の保存に失敗しました: {e}")
 
 if __name__ == "__main__":
     exit(main())
@@ -6,8 +6,15 @@ import json
 import logging
 import datetime
 import re
+import hashlib
+import tempfile
 from pathlib import Path
-from xml.sax.saxutils import escape
+from xml.sax.saxutils import escape, quoteattr
+from render_cache import RenderCache
+from feed_pages import FeedPages, fingerprint
+from precompress import precompress_docs
+from image_variants import ImageVariants
+from search_index import SearchIndex
 
 # ロギング設定
 logging.basicConfig(
@@ -22,10 +29,41 @@ IMAGES_DIR = Path(__file__).parent.parent / "data" / "images"
 DOCS_DIR = Path(__file__).parent.parent / "docs"
 RSS_FILE = DOCS_DIR / "feed.xml"
 INDEX_FILE = DOCS_DIR / "index.html"
+ARCHIVE_DIR = DOCS_DIR / "archive"  # 最新のフィードから外れた記事（RFC 5005 のアーカイブ）
+# アーカイブの各ページに載せた記事ID（ページの内容を固定するため、アーカイブと一緒にコミットする）
+ARCHIVE_PAGES_FILE = Path(__file__).parent.parent / "data" / "archive_pages.json"
+CATEGORY_DIR = DOCS_DIR / "categories"  # カテゴリごとのフィード
+
+# フィードに含める記事数（最新のフィードとカテゴリごとのフィード）と、アーカイブ1ページあたりの記事数
+FEED_SIZE = int(os.environ.get('NIKKEI_FEED_SIZE', '50'))
+ARCHIVE_PAGE_SIZE = int(os.environ.get('NIKKEI_ARCHIVE_PAGE_SIZE', '50'))
 
 # 日付フォーマット
 RSS_DATE_FORMAT = "%a, %d %b %Y %H:%M:%S GMT"
 
+# GitHub Pagesのベースパス
+REPO_NAME = "nikkei-xt-rss"  # リポジトリ名
+PAGES_BASE_URL = f"https://USERNAME.github.io/{REPO_NAME}"  # USERNAME部分は後で置き換え
+
+# フィードの名前空間（RFC 5005 のリンクとアーカイブの印）
+ATOM_NS = "http://www.w3.org/2005/Atom"
+FEED_HISTORY_NS = "http://purl.org/syndication/history/1.0"
+
+# ページのテンプレートを変更した場合はこの値を上げて全てのページを書き出し直す
+PAGE_VERSION = 2
+
+# 検索結果の最大件数
+SEARCH_RESULT_LIMIT = 50
+
+# 画像の表示幅（縮小版のうち、この幅以上で最小のものを src にする）
+IMAGE_DISPLAY_WIDTH = 640
+IMAGE_SIZES = f"(max-width: {IMAGE_DISPLAY_WIDTH}px) 100vw, {IMAGE_DISPLAY_WIDTH}px"
+
+# Markdownのインライン要素
+BOLD_PATTERN = re.compile(r'\*\*(.*?)\*\*')
+IMAGE_PATTERN = re.compile(r'!\[(.*?)\]\((.*?)\)')
+LINK_PATTERN = re.compile(r'\[(.*?)\]\((.*?)\)')
+
 def generate_rss_feed():
     """RSSフィードを生成"""
     logger.info("RSSフィード生成を開始します")
@@ -40,18 +78,47 @@ def generate_rss_feed():
         with open(articles_data_file, 'r', encoding='utf-8') as f:
             articles = json.load(f)
         
-        # 記事を日付順にソート（新しい順）
-        articles.sort(key=lambda x: x.get('date', ''), reverse=True)
+        # 記事を日付順にソート（新しい順。同じ日付ならIDの順に並べ、アーカイブの区切りを実行ごとに変えない）
+        articles.sort(key=lambda x: (x.get('date', ''), x['id']), reverse=True)
+        
+        # 変換済みの記事はキャッシュを使い、変更されたMarkdownだけを変換する
+        cache = RenderCache()
+        pages = FeedPages(root=DOCS_DIR)
+        variants = ImageVariants()
         
-        # RSSフィードのXMLを構築
-        rss_xml = generate_rss_xml(articles)
+        # フィードに載せる記事（エラーの記事とMarkdownファイルの無い記事を除く）と、その内容の指紋。
+        # 本文がほぼ同じ記事（duplicate_of）は、元の記事があればそちらにまとめる
+        article_ids = {article['id'] for article in articles}
+        items = {}
+        for article in articles:
+            if 'error' in article or article.get('duplicate_of') in article_ids:
+                continue
+            rendered = render_article(article, cache, variants)
+            if rendered is not None:
+                items[article['id']] = fingerprint(
+                    article['title'], article['url'], article.get('date'), rendered
+                )
+        articles = [article for article in articles if article['id'] in items]
         
-        # RSSファイルに保存
-        with open(RSS_FILE, 'w', encoding='utf-8') as f:
-            f.write(rss_xml)
+        # 最新のフィード・アーカイブ・カテゴリごとのフィードのうち、内容が変わったものだけを書き出す
+        write_main_and_archive_feeds(articles, items, cache, pages, variants)
+        categories = write_category_feeds(articles, items, cache, pages, variants)
         
         # インデックスページも生成
-        generate_index_html(articles)
+        current_year = datetime.datetime.now().year
+        if pages.changed(INDEX_FILE, fingerprint('index', PAGE_VERSION, [items[a['id']] for a in articles], categories, current_year)):
+            generate_index_html(articles, cache, categories, variants)
+        
+        # 全文検索の索引（追加・変更された記事だけを索引に加える）
+        SearchIndex().update(articles, ARTICLES_DIR)
+        
+        pages.remove_stale(ARCHIVE_DIR)
+        pages.remove_stale(CATEGORY_DIR)
+        pages.save()
+        cache.save(keep={f"{article['id']}.md" for article in articles})
+        
+        # 配信用の圧縮版とETagの一覧（内容が変わったファイルのみ作り直す）
+        precompress_docs(DOCS_DIR)
         
         logger.info(f"RSSフィードを生成しました: {RSS_FILE}")
         return True
@@ -60,31 +127,282 @@ def generate_rss_feed():
         logger.error(f"RSSフィード生成中にエラーが発生しました: {e}")
         return False
 
-def generate_rss_xml(articles):
+def page_url(path):
+    """docs/ 以下のファイルのGitHub Pages上のURL"""
+    return f"{PAGES_BASE_URL}/{Path(path).relative_to(DOCS_DIR).as_posix()}"
+
+def archive_file(number):
+    """アーカイブのページのパス（1が最も古い）"""
+    return ARCHIVE_DIR / f"feed-{number}.xml"
+
+def category_file(category):
+    """カテゴリごとのフィードのパス（カテゴリ名のハッシュをファイル名にする）"""
+    return CATEGORY_DIR / f"{hashlib.md5(category.encode('utf-8')).hexdigest()[:12]}.xml"
+
+def article_category(article):
+    """記事ページから抽出したカテゴリ"""
+    return (article.get('content') or {}).get('category')
+
+def write_feed(path, title, articles, items, cache, pages, links, archive=False, variants=None):
+    """
+    フィードを1ページ書き出す（内容が前回と同じなら書き出さない）
+    
+    Args:
+        path (Path): 出力先
+        title (str): フィードのタイトル
+        articles (list): 載せる記事（新しい順）
+        items (dict): 記事ID→記事の内容の指紋
+        cache (RenderCache): 変換結果のキャッシュ
+        pages (FeedPages): ページの指紋の記録
+        links (list): (rel, URL) のリスト
+        archive (bool): アーカイブのページか
+        variants (ImageVariants): 画像の縮小版
+    """
+    links = [('self', page_url(path))] + links
+    if not pages.changed(path, fingerprint(PAGE_VERSION, title, links, archive, [items[a['id']] for a in articles])):
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, iter_rss_xml(articles, cache, title=title, links=links, archive=archive, variants=variants))
+
+def load_archive_pages(path=None):
+    """アーカイブの各ページに載せた記事IDのリスト（古いページから。記録が無ければ空）"""
+    path = Path(path or ARCHIVE_PAGES_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def save_archive_pages(archive_pages, path=None):
+    """アーカイブの各ページに載せた記事IDを保存（変わらなければ書き出さない）"""
+    path = Path(path or ARCHIVE_PAGES_FILE)
+    text = json.dumps(archive_pages, ensure_ascii=False, indent=1)
+    if path.exists() and path.read_text(encoding='utf-8') == text:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, [text])
+
+def split_archive(articles, archive_pages=()):
+    """
+    記事を最新のフィードとアーカイブのページに分ける
+    
+    公開済みのアーカイブのページ（archive_pages）には記録した記事をそのまま載せ、まだアーカイブに載せていない記事から
+    古い順に ARCHIVE_PAGE_SIZE 件ずつ新しいページに詰める。いっぱいになったページだけをアーカイブにし、
+    埋まりきらない残りは最新のフィードに載せる（最新のフィードは FEED_SIZE 〜 FEED_SIZE + ARCHIVE_PAGE_SIZE - 1 件）。
+    再試行などで古い日付の記事が後から届いても、公開済みのページの区切りは変わらない（その記事は最新のフィードに載る）。
+    
+    Args:
+        articles (list): 記事のリスト（新しい順）
+        archive_pages (list): 公開済みのアーカイブの各ページの記事IDのリスト（古いページから）
+        
+    Returns:
+        tuple: (最新のフィードの記事, アーカイブのページごとの記事のリスト（古いページから、各ページは古い順）,
+                保存する各ページの記事IDのリスト)
+    """
+    by_id = {article['id']: article for article in articles}
+    archived = {article_id for page in archive_pages for article_id in page}
+    # 公開済みのページは、記事が無くなった（エラーや重複になった）場合もページの区切りは変えない
+    chunks = [[by_id[a] for a in page if a in by_id] for page in archive_pages]
+    pages = [list(page) for page in archive_pages]
+    
+    remaining = [article for article in articles if article['id'] not in archived]
+    count = max(0, len(remaining) - FEED_SIZE) // ARCHIVE_PAGE_SIZE * ARCHIVE_PAGE_SIZE
+    latest = remaining[:len(remaining) - count]
+    older = remaining[len(remaining) - count:][::-1]
+    for i in range(0, len(older), ARCHIVE_PAGE_SIZE):
+        chunk = older[i:i + ARCHIVE_PAGE_SIZE]
+        chunks.append(chunk)
+        pages.append([article['id'] for article in chunk])
+    return latest, chunks, pages
+
+def write_main_and_archive_feeds(articles, items, cache, pages, variants=None):
+    """
+    最新のフィードと、そこから外れた記事のアーカイブ（RFC 5005 Archived Feeds）を書き出す
+    
+    アーカイブは古い記事から順にページに詰め、いっぱいになったページだけを書き出し、各ページの記事を記録するため
+    （split_archive）、新しい記事や古い日付の記事が増えても一度書き出したページの内容は変わらない。
+    最新のフィードから最も新しいアーカイブへ prev-archive で、アーカイブ間は prev-archive / next-archive でたどれる。
+    
+    Args:
+        articles (list): 記事のリスト（新しい順）
+        items (dict): 記事ID→記事の内容の指紋
+        cache (RenderCache): 変換結果のキャッシュ
+        pages (FeedPages): ページの指紋の記録
+        variants (ImageVariants): 画像の縮小版
+    """
+    latest, chunks, archive_pages = split_archive(articles, load_archive_pages())
+    
+    links = [('prev-archive', page_url(archive_file(len(chunks))))] if chunks else []
+    write_feed(RSS_FILE, "日経クロストレンド 最新記事", latest, items, cache, pages, links, variants=variants)
+    
+    for number, chunk in enumerate(chunks, 1):
+        links = [('current', page_url(RSS_FILE))]
+        if number > 1:
+            links.append(('prev-archive', page_url(archive_file(number - 1))))
+        if number < len(chunks):
+            links.append(('next-archive', page_url(archive_file(number + 1))))
+        write_feed(
+            archive_file(number), f"日経クロストレンド 過去記事（{number}）", chunk[::-1],
+            items, cache, pages, links, archive=True, variants=variants
+        )
+    
+    save_archive_pages(archive_pages)
+    if chunks:
+        logger.info(f"最新のフィードに{len(latest)}件、アーカイブ{len(chunks)}ページに{sum(map(len, chunks))}件")
+
+def write_category_feeds(articles, items, cache, pages, variants=None):
+    """
+    カテゴリごとのフィード（各カテゴリの最新の記事のみ）を書き出す
+    
+    Args:
+        articles (list): 記事のリスト（新しい順）
+        items (dict): 記事ID→記事の内容の指紋
+        cache (RenderCache): 変換結果のキャッシュ
+        pages (FeedPages): ページの指紋の記録
+        variants (ImageVariants): 画像の縮小版
+        
+    Returns:
+        list: (カテゴリ名, フィードのファイル名, 記事数) のリスト（記事数の多い順）
+    """
+    by_category = {}
+    for article in articles:
+        category = article_category(article)
+        if category:
+            by_category.setdefault(category, []).append(article)
+    
+    categories = []
+    for category, category_articles in by_category.items():
+        path = category_file(category)
+        write_feed(
+            path, f"日経クロストレンド {category}", category_articles[:FEED_SIZE],
+            items, cache, pages, [('related', page_url(RSS_FILE))], variants=variants
+        )
+        categories.append((category, path.relative_to(DOCS_DIR).as_posix(), len(category_articles)))
+    
+    categories.sort(key=lambda c: (-c[2], c[0]))
+    return categories
+
+def write_atomic(path, chunks):
+    """
+    文字列の断片を一時ファイルに順に書き出し、完成後にアトミックに置き換える
+    
+    文書全体をメモリ上に組み立てないため、記事数が増えてもメモリ使用量は一定。
+    
+    Args:
+        path (Path): 出力先ファイル
+        chunks (iterable): 書き出す文字列の断片
+    """
+    path = Path(path)
+    tmp = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=f".{path.name}.", delete=False)
+    try:
+        with tmp as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except BaseException:
+        if os.path.exists(tmp.name):
+            os.unlink(tmp.name)
+        raise
+
+def render_article(article, cache=None, variants=None):
+    """
+    記事のMarkdownファイルを変換
+    
+    Args:
+        article (dict): 記事情報
+        cache (RenderCache): 変換結果のキャッシュ（省略時は毎回変換）
+        variants (ImageVariants): 画像の縮小版（省略時は元の画像を使う）
+        
+    Returns:
+        dict: {'content_html', 'description', 'author', 'thumbnail'}（Markdownファイルが無い場合はNone）
+    """
+    md_file = ARTICLES_DIR / f"{article['id']}.md"
+    if not md_file.exists():
+        return None
+    
+    def render(md_content):
+        # 著者情報
+        author_match = re.search(r'\*\*著者\*\*: (.*)', md_content)
+        return {
+            'content_html': markdown_to_html(md_content, article, variants),
+            'description': extract_description(md_content),
+            'author': author_match.group(1) if author_match else "日経クロストレンド",
+            'thumbnail': article_thumbnail(article, variants)
+        }
+    
+    if cache is not None:
+        # 縮小版が後から作成された場合も変換し直す
+        depends = [entry['hash'] for entry in map(variants.lookup, image_paths(article)) if entry] if variants else []
+        return cache.get(md_file, render, depends)
+    
+    with open(md_file, 'r', encoding='utf-8') as f:
+        return render(f.read())
+
+def image_paths(article):
+    """記事の画像のパス"""
+    return [image['path'] for image in article.get('images', [])]
+
+def article_thumbnail(article, variants=None):
+    """記事の最初の画像のサムネイルのURL（無ければNone）"""
+    if variants is None:
+        return None
+    for image_path in image_paths(article):
+        entry = variants.lookup(image_path)
+        if entry and entry.get('thumbnail'):
+            return f"{PAGES_BASE_URL}/{entry['thumbnail']['path']}"
+    return None
+
+def generate_rss_xml(articles, cache=None):
     """
     記事リストからRSS XMLを生成
     
     Args:
         articles (list): 記事情報のリスト
+        cache (RenderCache): 変換結果のキャッシュ
         
     Returns:
         str: RSS XML文字列
     """
+    return ''.join(iter_rss_xml(articles, cache))
+
+def iter_rss_xml(articles, cache=None, title="日経クロストレンド 最新記事", links=(), archive=False, variants=None):
+    """
+    記事リストからRSS XMLを断片ごとに生成
+    
+    Args:
+        articles (list): 記事情報のリスト
+        cache (RenderCache): 変換結果のキャッシュ
+        title (str): フィードのタイトル
+        links (list): フィード間のリンク（(rel, URL) のリスト。RFC 5005 の prev-archive など）
+        archive (bool): アーカイブのページとして出力するか（内容が今後変わらないことを示す）
+        variants (ImageVariants): 画像の縮小版
+        
+    Yields:
+        str: RSS XMLの断片（ヘッダー、各アイテム、フッター）
+    """
     # 現在時刻（GMT）
     now = datetime.datetime.now(datetime.timezone.utc)
     build_date = now.strftime(RSS_DATE_FORMAT)
     
+    # フィード間のリンク
+    link_elements = ''.join(
+        f'  <atom:link rel="{rel}" href={quoteattr(href)} type="application/rss+xml" />\n' for rel, href in links
+    )
+    if archive:
+        link_elements += "  <fh:archive />\n"
+    
     # RSSヘッダー
-    rss = f"""<?xml version="1.0" encoding="UTF-8" ?>
-<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    yield f"""<?xml version="1.0" encoding="UTF-8" ?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:atom="{ATOM_NS}" xmlns:fh="{FEED_HISTORY_NS}">
 <channel>
-  <title>日経クロストレンド 最新記事</title>
+  <title>{escape(title)}</title>
   <link>https://xtrend.nikkei.com/</link>
   <description>日経クロストレンドの最新記事を配信するRSSフィード</description>
   <language>ja</language>
   <lastBuildDate>{build_date}</lastBuildDate>
   <generator>Nikkei XTrend RSS Generator</generator>
-"""
+{link_elements}"""
     
     # 記事アイテム
     for article in articles:
@@ -92,14 +410,11 @@ def generate_rss_xml(articles):
         if 'error' in article:
             continue
         
-        # 記事のMarkdownファイルを読み込み
-        md_file = ARTICLES_DIR / f"{article['id']}.md"
-        if not md_file.exists():
+        # 記事のMarkdownファイルを変換（変更が無ければキャッシュを使う）
+        rendered = render_article(article, cache, variants)
+        if rendered is None:
             continue
         
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
         # 公開日をRSS形式に変換
         pub_date = ""
         if 'date' in article:
@@ -115,18 +430,13 @@ def generate_rss_xml(articles):
         else:
             pub_date = now.strftime(RSS_DATE_FORMAT)
         
-        # 記事内容をHTML形式に変換
-        content_html = markdown_to_html(md_content, article)
-        
-        # 記事の説明（先頭の数行）
-        description = extract_description(md_content)
-        
-        # 著者情報
-        author_match = re.search(r'\*\*著者\*\*: (.*)', md_content)
-        author = author_match.group(1) if author_match else "日経クロストレンド"
+        # 記事内容（HTML）、説明（先頭の数行）、著者情報
+        content_html = rendered['content_html']
+        description = rendered['description']
+        author = rendered['author']
         
         # RSSアイテムを追加
-        rss += f"""  
+        yield f"""  
   <item>
     <title>{escape(article['title'])}</title>
     <link>{escape(article['url'])}</link>
@@ -141,69 +451,105 @@ def generate_rss_xml(articles):
 """
     
     # RSSフッター
-    rss += """  
+    yield """  
 </channel>
 </rss>"""
-    
-    return rss
 
-def markdown_to_html(md_content, article):
+def markdown_to_html(md_content, article, variants=None):
     """
     Markdown形式の記事をHTML形式に変換
     
+    文書全体に正規表現を何度もかけるのではなく、段落ごとに一度だけ走査して変換する。
+    見出しやインライン要素の処理は、その記号を含む段落にだけ適用する。
+    
     Args:
         md_content (str): Markdown形式の記事内容
         article (dict): 記事情報
+        variants (ImageVariants): 画像の縮小版（あれば元の画像の代わりに使う）
         
     Returns:
         str: HTML形式の記事内容
     """
-    # 簡易的なMarkdown→HTML変換
+    # 簡易的なMarkdown→HTML変換（save_article_as_markdownが出力する範囲に対応）
     # 実際のプロジェクトではmarkdown2やmistune等のライブラリを使うことを推奨
+    blocks = []
+    for block in md_content.split('\n\n'):
+        # 見出しは行頭の記号で判定する（記号を含まない段落は行に分けない）
+        if '#' in block:
+            block = '\n'.join(map(heading_to_html, block.split('\n')))
+        
+        # 太字
+        if '**' in block:
+            block = BOLD_PATTERN.sub(r'<strong>\1</strong>', block)
+        
+        # 段落
+        block = block.strip()
+        if block and not block.startswith('<h') and not block.startswith('!['):
+            block = f'<p>{block}</p>'
+        
+        if '](' in block:
+            # 画像
+            if '![' in block:
+                block = IMAGE_PATTERN.sub(lambda match: replace_image(match, variants), block)
+            
+            # リンク
+            block = LINK_PATTERN.sub(r'<a href="\2">\1</a>', block)
+        
+        blocks.append(block)
     
-    # タイトル（H1）
-    html = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', md_content, flags=re.MULTILINE)
+    return '\n\n'.join(blocks)
+
+def heading_to_html(line):
+    """タイトル（H1）・見出し（H2）の行をHTMLに変換"""
+    if line.startswith('# '):
+        return f'<h1>{line[2:]}</h1>'
+    if line.startswith('## '):
+        return f'<h2>{line[3:]}</h2>'
+    return line
+
+def replace_image(match, variants=None):
+    """Markdownの画像をGitHub Pages上の画像を指すimgタグに変換"""
+    alt_text = match.group(1)
+    image_path = match.group(2)
     
-    # 見出し（H2）
-    html = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
+    # 相対パスを絶対URLに変換（GitHub Pages用）
+    if image_path.startswith('/'):
+        image_path = image_path[1:]  # 先頭の/を削除
     
-    # 太字
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
+    entry = variants.lookup(image_path) if variants else None
+    if entry:
+        return variant_image_html(entry, alt_text)
     
-    # 段落
-    paragraphs = []
-    for line in html.split('\n\n'):
-        line = line.strip()
-        if line and not line.startswith('<h') and not line.startswith('!['):
-            paragraphs.append(f'<p>{line}</p>')
-        else:
-            paragraphs.append(line)
+    return f'<img src="{PAGES_BASE_URL}/{image_path}" alt="{alt_text}" />'
+
+def variant_image_html(entry, alt_text):
+    """
+    縮小版を使う画像のタグ
     
-    html = '\n\n'.join(paragraphs)
+    src には表示幅以上で最小のWebPを使い、srcset で他の幅も示す。
+    AVIFがあれば対応するリーダー向けに picture 要素で優先する。
     
-    # 画像
-    def replace_image(match):
-        alt_text = match.group(1)
-        image_path = match.group(2)
-        
-        # 相対パスを絶対URLに変換（GitHub Pages用）
-        if image_path.startswith('/'):
-            image_path = image_path[1:]  # 先頭の/を削除
-        
-        # GitHub Pagesのベースパス
-        repo_name = "nikkei-xt-rss"  # リポジトリ名
-        base_url = f"https://USERNAME.github.io/{repo_name}"  # USERNAME部分は後で置き換え
-        
-        image_url = f"{base_url}/{image_path}"
+    Args:
+        entry (dict): ImageVariants の索引のエントリ
+        alt_text (str): 代替テキスト
         
-        return f'<img src="{image_url}" alt="{alt_text}" />'
-    
-    html = re.sub(r'!\[(.*?)\]\((.*?)\)', replace_image, html)
+    Returns:
+        str: HTML
+    """
+    def srcset(variants):
+        return ', '.join(f"{PAGES_BASE_URL}/{v['path']} {v['width']}w" for v in variants)
     
-    # リンク
-    html = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', html)
+    webp = [v for v in entry['variants'] if v['format'] == 'webp']
+    avif = [v for v in entry['variants'] if v['format'] == 'avif']
+    src = next((v for v in webp if v['width'] >= IMAGE_DISPLAY_WIDTH), webp[-1])
     
-    return html
+    img = (
+        f'<img src="{PAGES_BASE_URL}/{src["path"]}" srcset="{srcset(webp)}" sizes="{IMAGE_SIZES}" '
+        f'width="{src["width"]}" height="{src["height"]}" alt="{alt_text}" />'
+    )
+    if avif:
+        return f'<picture><source type="image/avif" srcset="{srcset(avif)}" sizes="{IMAGE_SIZES}" />{img}</picture>'
+    return img
 
 def extract_description(md_content):
     """
@@ -233,14 +579,130 @@ def extract_description(md_content):
     
     return "日経クロストレンドの記事"
 
-def generate_index_html(articles):
+# インデックスページの検索処理（search_index.py の tokenize / term_shard と同じ方法で索引語とシャードを求める）
+SEARCH_SCRIPT = r"""
+(function () {
+    const LIMIT = __LIMIT__;
+    const form = document.getElementById('search-form');
+    const input = document.getElementById('search-input');
+    const output = document.getElementById('search-results');
+    const files = {};
+
+    function load(name, options) {
+        if (!files[name]) {
+            files[name] = fetch('search/' + name, options).then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.json();
+            });
+        }
+        return files[name];
+    }
+
+    function tokenize(text) {
+        const terms = new Set();
+        for (const word of text.normalize('NFKC').toLowerCase().match(/[\p{L}\p{N}]+/gu) || []) {
+            const chars = Array.from(word);
+            if (chars.length === 1) terms.add(chars[0]);
+            for (let i = 0; i + 1 < chars.length; i++) terms.add(chars[i] + chars[i + 1]);
+        }
+        return Array.from(terms);
+    }
+
+    function termShard(term, count) {
+        let h = 0x811c9dc5;
+        for (const ch of term) h = Math.imul(h ^ ch.codePointAt(0), 0x01000193) >>> 0;
+        return h % count;
+    }
+
+    async function search(query) {
+        // マニフェストはファイル名が固定のため、毎回サーバーに確認する
+        const manifest = await load('manifest.json', {cache: 'no-cache'});
+        const terms = tokenize(query);
+        if (!terms.length) return [];
+        // 索引はセグメントに分かれている（古いセグメントほど文書番号が小さい）
+        const lists = await Promise.all(terms.map(async function (term) {
+            const shards = await Promise.all(manifest.segments.map(function (segment) {
+                const name = segment.shards[termShard(term, segment.shard_count)];
+                return name ? load(name) : {};
+            }));
+            return shards.flatMap(function (shard) {
+                let id = 0;
+                return (shard[term] || []).map(function (delta) { return id += delta; });
+            });
+        }));
+        lists.sort(function (a, b) { return a.length - b.length; });
+        let ids = lists[0];
+        for (const list of lists.slice(1)) {
+            const set = new Set(list);
+            ids = ids.filter(function (id) { return set.has(id); });
+        }
+        const found = [];
+        for (const id of ids.reverse()) {
+            const chunk = await load(manifest.docs[Math.floor(id / manifest.docs_per_chunk)]);
+            const doc = chunk[id % manifest.docs_per_chunk];
+            if (doc) {
+                found.push(doc);
+                if (found.length >= LIMIT) break;
+            }
+        }
+        return found;
+    }
+
+    form.addEventListener('submit', async function (event) {
+        event.preventDefault();
+        output.textContent = '検索中...';
+        try {
+            const found = await search(input.value);
+            output.textContent = found.length ? '' : '該当する記事は見つかりませんでした';
+            const list = document.createElement('ul');
+            for (const [title, url, date] of found) {
+                const item = document.createElement('li');
+                const link = document.createElement('a');
+                link.href = url;
+                link.textContent = title;
+                const span = document.createElement('span');
+                span.className = 'date';
+                span.textContent = date.replace(/\./g, '/');
+                item.append(link, span);
+                list.append(item);
+            }
+            if (found.length) output.append(list);
+        } catch (error) {
+            output.textContent = '検索索引を読み込めませんでした';
+        }
+    });
+})();
+"""
+
+def generate_index_html(articles, cache=None, categories=(), variants=None):
     """
     記事リストからインデックスHTMLを生成
     
     Args:
         articles (list): 記事情報のリスト
+        cache (RenderCache): 変換結果のキャッシュ
+        categories (list): write_category_feeds の戻り値
+        variants (ImageVariants): 画像の縮小版
+    """
+    # 一時ファイルに逐次書き出し、完成後に置き換える
+    write_atomic(INDEX_FILE, iter_index_html(articles, cache, categories, variants))
+    
+    logger.info(f"インデックスHTMLを生成しました: {INDEX_FILE}")
+
+def iter_index_html(articles, cache=None, categories=(), variants=None):
+    """
+    記事リストからインデックスHTMLを断片ごとに生成
+    
+    Args:
+        articles (list): 記事情報のリスト
+        cache (RenderCache): 変換結果のキャッシュ
+        categories (list): (カテゴリ名, フィードのファイル名, 記事数) のリスト
+        variants (ImageVariants): 画像の縮小版（サムネイルを表示する）
+        
+    Yields:
+        str: HTMLの断片（ヘッダー、各記事、フッター）
     """
-    html = """<!DOCTYPE html>
+    yield """<!DOCTYPE html>
 <html lang="ja">
 <head>
     <meta charset="UTF-8">
@@ -264,10 +726,17 @@ def generate_index_html(articles):
             margin-bottom: 30px;
             padding-bottom: 20px;
             border-bottom: 1px solid #eee;
+            overflow: hidden;
         }
         .article h2 {
             margin-bottom: 5px;
         }
+        .article .thumbnail {
+            float: right;
+            max-width: 120px;
+            max-height: 120px;
+            margin-left: 15px;
+        }
         .article .date {
             color: #666;
             font-size: 0.9em;
@@ -300,12 +769,58 @@ def generate_index_html(articles):
         .rss-link:hover {
             background-color: #e50;
         }
+        .search input {
+            width: 70%;
+            padding: 8px;
+            font-size: 1em;
+        }
+        .search button {
+            padding: 8px 15px;
+            font-size: 1em;
+        }
+        #search-results li {
+            margin-bottom: 8px;
+        }
+        #search-results .date {
+            color: #666;
+            font-size: 0.9em;
+            margin-left: 10px;
+        }
+        .categories {
+            padding-left: 20px;
+        }
+        .categories a {
+            color: #c00;
+        }
     </style>
 </head>
 <body>
     <h1>日経クロストレンド RSS</h1>
     <p>日経クロストレンドの最新記事を配信するRSSフィードです。</p>
     <a href="feed.xml" class="rss-link">RSSフィードを購読</a>
+"""
+    
+    # カテゴリごとのフィード
+    if categories:
+        yield """
+    <h2>カテゴリごとのフィード</h2>
+    <ul class="categories">
+"""
+        for name, href, count in categories:
+            yield f'        <li><a href="{escape(href)}">{escape(name)}</a>（{count}件）</li>\n'
+        yield "    </ul>\n"
+    
+    # 全文検索（検索語の索引語を含むシャードだけを読み込む）
+    yield f"""
+    <h2>記事の検索</h2>
+    <form id="search-form" class="search">
+        <input id="search-input" type="search" placeholder="キーワード（2文字以上）" autocomplete="off">
+        <button type="submit">検索</button>
+    </form>
+    <div id="search-results"></div>
+    <script>
+{SEARCH_SCRIPT.replace('__LIMIT__', str(SEARCH_RESULT_LIMIT))}
+    </script>
     
     <h2>最新記事</h2>
 """
@@ -316,22 +831,24 @@ def generate_index_html(articles):
         if 'error' in article:
             continue
         
-        # 記事のMarkdownファイルを読み込み
-        md_file = ARTICLES_DIR / f"{article['id']}.md"
-        if not md_file.exists():
+        # 記事のMarkdownファイルを変換（RSS生成時の結果を再利用）
+        rendered = render_article(article, cache, variants)
+        if rendered is None:
             continue
         
-        with open(md_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
-        
-        # 説明文を抽出
-        description = extract_description(md_content)
+        # 説明文
+        description = rendered['description']
         
         # 日付
         date_display = article.get('date', '').replace('.', '/')
         
-        html += f"""
-    <div class="article">
+        # サムネイル（縮小版がある場合）
+        thumbnail = ""
+        if rendered.get('thumbnail'):
+            thumbnail = f'\n        <img class="thumbnail" src="{escape(rendered["thumbnail"])}" alt="" loading="lazy" />'
+        
+        yield f"""
+    <div class="article">{thumbnail}
         <h2><a href="{escape(article['url'])}">{escape(article['title'])}</a></h2>
         <div class="date">{date_display}</div>
         <div class="description">{escape(description)}</div>
@@ -341,7 +858,7 @@ def generate_index_html(articles):
     
     # フッター
     current_year = datetime.datetime.now().year
-    html += f"""
+    yield f"""
     <div class="footer">
         <p>このRSSフィードは非公式なものです。コンテンツの著作権は日経BP社に帰属します。</p>
         <p>&copy; {current_year} Nikkei Business Publications, Inc. All Rights Reserved.</p>
@@ -349,12 +866,6 @@ def generate_index_html(articles):
 </body>
 </html>
 """
-    
-    # ファイルに保存
-    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-        f.write(html)
-    
-    logger.info(f"インデックスHTMLを生成しました: {INDEX_FILE}")
 
 if __name__ == "__main__":
     generate_rss_feed()
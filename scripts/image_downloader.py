@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from image_store import ImageStore
+from request_scheduler import RequestScheduler
+from retry_policy import RetryPolicy, RETRYABLE_STATUSES, status_error
+
+logger = logging.getLogger(__name__)
+
+# ダウンロードの設定
+MAX_WORKERS = 8  # 同時にダウンロードする画像の最大数（全ホスト合計）
+PER_HOST_LIMIT = 4  # ホストごとの同時接続数
+TIMEOUT = (5, 30)  # (接続, 読み込み)タイムアウト（秒）
+CHUNK_SIZE = 64 * 1024  # 書き込み単位（バイト）
+
+
+class ImageDownloader:
+    """ホストごとに接続を使い回しながら画像を並列にダウンロードし、ImageStoreに保存する"""
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, timeout=TIMEOUT, store=None,
+                 scheduler=None, retry_policy=None):
+        """
+        画像ダウンローダーの初期化
+
+        Args:
+            max_workers (int): 同時にダウンロードする画像の最大数
+            per_host_limit (int): ホストごとの同時接続数
+            timeout (tuple): (接続, 読み込み)タイムアウト（秒）
+            store (ImageStore): 画像の保存先（省略時はデフォルトの場所）
+            scheduler (RequestScheduler): リクエストの間隔を調整するスケジューラー（記事の取得と共有する）
+            retry_policy (RetryPolicy): 再試行の設定（省略時はデフォルト）
+        """
+        self.store = store or ImageStore()
+        self.scheduler = scheduler or RequestScheduler()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.stats = Counter()
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image')
+        self.sessions = {}
+        self.semaphores = {}
+        self.lock = threading.Lock()
+
+    def _host_resources(self, url):
+        """ホストごとのセッションと同時接続数の制限を取得"""
+        host = urlparse(url).netloc
+        with self.lock:
+            if host not in self.sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.sessions[host] = session
+                self.semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self.sessions[host], self.semaphores[host]
+
+    def _count(self, key, value=1, stats=None):
+        """統計を加算（statsを指定した場合はそちらにも加算する）"""
+        with self.lock:
+            self.stats[key] += value
+            if stats is not None:
+                stats[key] += value
+
+    def download(self, url, stats=None):
+        """
+        画像を1件取得してストアに保存
+
+        最近確認済みのURLはリクエストせず、それ以外は条件付きリクエストで変更の有無を確認する。
+        タイムアウト・接続エラー・429/5xxは指数バックオフで再試行する。
+
+        Args:
+            url (str): 画像URL
+            stats (Counter): 呼び出し元ごとの統計
+
+        Returns:
+            dict: ストアのエントリ（404などで取得できない場合はNone）
+
+        Raises:
+            Exception: 再試行しても取得できなかった場合
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._download_once(url, stats)
+            except Exception as e:
+                delay = self.retry_policy.delay(attempt, e) if self.retry_policy.should_retry(attempt, e) else None
+                if delay is None:
+                    raise
+                logger.info(f"画像の取得に失敗したため、{delay:.1f}秒後に再試行します（{attempt}回目）: {url}: {e}")
+                self._count('retries', stats=stats)
+                time.sleep(delay)
+
+    def _download_once(self, url, stats=None):
+        """画像を1回取得（429/5xxは FetchError を送出する）"""
+        with self.store.url_lock(url):
+            entry = self.store.lookup(url)
+            if entry and self.store.is_fresh(url):
+                self._count('skipped', stats=stats)
+                return entry
+
+            session, semaphore = self._host_resources(url)
+            with semaphore, self.scheduler.request(url, kind='image') as outcome:
+                headers = self.store.conditional_headers(entry)
+                response = outcome.response(session.get(url, stream=True, timeout=self.timeout, headers=headers))
+                with response:
+                    if response.status_code == 304 and entry:
+                        self._count('not_modified', stats=stats)
+                        return self.store.touch(url)
+
+                    if response.status_code in RETRYABLE_STATUSES:
+                        raise status_error(response.status_code, url)
+                    if response.status_code != 200:
+                        logger.warning(f"画像を取得できませんでした（status={response.status_code}）: {url}")
+                        return None
+
+                    entry = self.store.put(
+                        url,
+                        response.iter_content(CHUNK_SIZE),
+                        content_type=response.headers.get('Content-Type'),
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                    self._count('downloaded', stats=stats)
+                    self._count('bytes', entry['size'], stats=stats)
+                    return entry
+
+    def download_all(self, jobs, stats=None):
+        """
+        複数の画像を並列に取得
+
+        Args:
+            jobs (list): {'url', 'filename', 'alt'} のリスト
+            stats (Counter): この呼び出し分の統計（skipped, not_modified, downloaded, bytes, retries, failed）を加算する
+
+        Returns:
+            list: 取得できた画像の {'filename', 'path', 'alt'} のリスト（jobsと同じ順序）。
+                pathはストア内の画像を指す
+        """
+        futures = [(job, self.executor.submit(self.download, job['url'], stats)) for job in jobs]
+
+        images = []
+        for job, future in futures:
+            try:
+                entry = future.result()
+            except Exception as e:
+                logger.warning(f"画像 {job['filename']} のダウンロード中にエラーが発生しました: {e}")
+                self._count('failed', stats=stats)
+                continue
+            if entry is None:
+                continue
+
+            images.append({
+                'filename': job['filename'],
+                'path': entry['path'],
+                'alt': job['alt']
+            })
+            logger.info(f"画像を取得しました: {job['filename']} -> {entry['path']}")
+
+        return images
+
+    def close(self):
+        """スレッドプールとセッションを閉じ、画像索引を保存する"""
+        self.executor.shutdown(wait=True)
+        self.store.save()
+        logger.info(f"画像の取得結果: {dict(self.stats)}")
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
+            self.semaphores = {}
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# 定数
+ROOT_DIR = Path(__file__).parent.parent
+IMAGES_DIR = ROOT_DIR / "data" / "images"
+OBJECTS_DIR = IMAGES_DIR / "objects"
+INDEX_FILE = IMAGES_DIR / "index.json"
+# 再確認した時刻は実行のたびに変わるため、コミットする索引とは分けてキャッシュに置く
+CHECKS_FILE = ROOT_DIR / ".cache" / "image_checks.json"
+REVALIDATE_AFTER = 7 * 24 * 60 * 60  # この秒数以内に確認済みの画像は再確認せずに再利用する
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp',
+}
+
+
+class ImageStore:
+    """
+    画像を内容のハッシュで保存し、URL→ハッシュの索引で記事間・実行間の重複ダウンロードを防ぐ
+
+    索引には各URLのETag/Last-Modifiedも記録し、再確認時の条件付きリクエストに使う。
+    再確認した時刻は索引とは別のファイル（キャッシュ）に記録し、内容が変わらない限り索引は変わらない。
+    """
+
+    def __init__(self, objects_dir=OBJECTS_DIR, index_file=INDEX_FILE, revalidate_after=REVALIDATE_AFTER, root=ROOT_DIR,
+                 checks_file=CHECKS_FILE):
+        """
+        画像ストアの初期化
+
+        Args:
+            objects_dir (Path): 画像本体の保存先
+            index_file (Path): URL索引のファイル
+            revalidate_after (int): 再確認までの秒数
+            root (Path): 索引に記録するパスの基準（objects_dirを含むディレクトリ）
+            checks_file (Path): URLごとの再確認した時刻のファイル（無ければ全ての画像を再確認する）
+        """
+        self.root = Path(root)
+        self.objects_dir = Path(objects_dir)
+        self.index_file = Path(index_file)
+        self.checks_file = Path(checks_file)
+        self.revalidate_after = revalidate_after
+        self.lock = threading.Lock()
+        self.url_locks = {}  # URL→[ロック, 使用中のスレッド数]
+        self.index = self.load_json(self.index_file, "画像索引")
+        self.checks = self.load_json(self.checks_file, "画像の再確認時刻")
+
+        # 以前の形式の索引に含まれる再確認時刻はキャッシュへ移す
+        for url, entry in self.index.items():
+            if 'checked_at' in entry:
+                self.checks.setdefault(url, entry.pop('checked_at'))
+
+    def load_json(self, path, label):
+        """JSONファイルを読み込む（無いか読み込めなければ空）"""
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError as e:
+            logger.warning(f"{label}を読み込めませんでした: {e}")
+            return {}
+
+    @contextmanager
+    def url_lock(self, url):
+        """同じURLを複数のスレッドが同時にダウンロードしないためのロック（使い終わったら破棄する）"""
+        with self.lock:
+            holder = self.url_locks.setdefault(url, [threading.Lock(), 0])
+            holder[1] += 1
+        try:
+            with holder[0]:
+                yield
+        finally:
+            with self.lock:
+                holder[1] -= 1
+                if holder[1] == 0:
+                    del self.url_locks[url]
+
+    def lookup(self, url):
+        """
+        URLに対応する保存済みの画像を取得
+
+        Returns:
+            dict: 索引のエントリ（未保存または本体が無い場合はNone）
+        """
+        with self.lock:
+            entry = self.index.get(url)
+        if entry and (self.root / entry['path']).exists():
+            return entry
+        return None
+
+    def is_fresh(self, url):
+        """再確認せずに再利用してよいかどうか"""
+        with self.lock:
+            checked_at = self.checks.get(url, 0)
+        return time.time() - checked_at < self.revalidate_after
+
+    def conditional_headers(self, entry):
+        """
+        条件付きリクエスト用のヘッダーを作成
+
+        Returns:
+            dict: If-None-Match/If-Modified-Since ヘッダー
+        """
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def touch(self, url):
+        """304応答で内容が変わっていないことを確認した時刻を記録"""
+        with self.lock:
+            self.checks[url] = time.time()
+            return self.index[url]
+
+    def put(self, url, chunks, content_type=None, etag=None, last_modified=None):
+        """
+        画像を保存して索引に登録
+
+        Args:
+            url (str): 画像URL
+            chunks (iterable): 画像データ
+            content_type (str): Content-Typeヘッダー
+            etag (str): ETagヘッダー
+            last_modified (str): Last-Modifiedヘッダー
+
+        Returns:
+            dict: 索引のエントリ
+        """
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        # ハッシュを計算しながら一時ファイルに書き込む
+        fd, tmp_name = tempfile.mkstemp(dir=self.objects_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+
+            content_hash = digest.hexdigest()
+            object_path = self.objects_dir / content_hash[:2] / (content_hash + self.guess_extension(url, content_type))
+            if object_path.exists():
+                # 同じ内容の画像が既にある（別URL・別記事で使われている）
+                os.unlink(tmp_name)
+            else:
+                object_path.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, object_path)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        entry = {
+            'hash': content_hash,
+            'path': str(object_path.relative_to(self.root)),
+            'size': size,
+            'etag': etag,
+            'last_modified': last_modified
+        }
+        with self.lock:
+            self.index[url] = entry
+            self.checks[url] = time.time()
+        return entry
+
+    def guess_extension(self, url, content_type=None):
+        """URLまたはContent-Typeから拡張子を決める"""
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if suffix in IMAGE_EXTENSIONS:
+            return suffix
+        if content_type:
+            return CONTENT_TYPE_EXTENSIONS.get(content_type.split(';')[0].strip(), '.jpg')
+        return '.jpg'
+
+    def save(self):
+        """索引と再確認時刻をアトミックに保存"""
+        with self.lock:
+            index = json.dumps(self.index, ensure_ascii=False, indent=2, sort_keys=True)
+            # 索引から外れたURLの再確認時刻は残さない
+            checks = json.dumps({url: t for url, t in self.checks.items() if url in self.index}, sort_keys=True)
+
+        self.write_atomic(self.index_file, index)
+        self.write_atomic(self.checks_file, checks)
+        logger.info(f"画像索引を保存しました: {self.index_file}（{len(self.index)}件）")
+
+    def write_atomic(self, path, data):
+        """一時ファイルに書き出してから置き換える"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillowが無い環境では変換せず元の画像を使う
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# 定数
+ROOT_DIR = Path(__file__).parent.parent
+IMAGES_DIR = ROOT_DIR / "data" / "images"
+VARIANTS_DIR = IMAGES_DIR / "variants"
+VARIANTS_INDEX_FILE = IMAGES_DIR / "variants.json"
+
+VARIANT_WIDTHS = (320, 640, 1280)  # 作成する幅（元の画像より大きくはしない）
+THUMBNAIL_SIZE = (200, 200)  # サムネイルの最大サイズ
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+AVIF_SPEED = 6  # 0（遅い・高圧縮）〜10（速い）
+
+# 変換に使うプロセス数
+TRANSCODE_WORKERS = int(os.environ.get('NIKKEI_IMAGE_WORKERS', '0')) or os.cpu_count() or 1
+
+# AVIFも作成するか（NIKKEI_IMAGE_AVIF=0 で無効。Pillowが対応していない場合も作成しない）
+USE_AVIF = os.environ.get('NIKKEI_IMAGE_AVIF', '1') != '0'
+
+
+def variant_formats():
+    """作成する形式（WebPは必須、AVIFは対応していれば）"""
+    if Image is None or not features.check('webp'):
+        return []
+    if USE_AVIF and features.check('avif'):
+        return ['webp', 'avif']
+    return ['webp']
+
+
+def save_image(image, path, image_format):
+    """メタデータ（EXIF・ICCプロファイルなど）を含めずに保存"""
+    if image_format == 'avif':
+        image.save(path, 'AVIF', quality=AVIF_QUALITY, speed=AVIF_SPEED)
+    else:
+        image.save(path, 'WEBP', quality=WEBP_QUALITY, method=4)
+
+
+def transcode_image(source, content_hash, variants_dir, root, formats):
+    """
+    画像1枚の縮小版とサムネイルを作成（プロセスプールで実行する）
+
+    Args:
+        source (str): 元の画像のパス
+        content_hash (str): 元の画像の内容のハッシュ
+        variants_dir (str): 出力先
+        root (str): 記録するパスの基準
+        formats (list): 作成する形式
+
+    Returns:
+        dict: 索引のエントリ（元の画像のサイズ、縮小版とサムネイルのリスト）
+    """
+    root = Path(root)
+    out_dir = Path(variants_dir) / content_hash[:2]
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def record(image, path, image_format):
+        save_image(image, path, image_format)
+        return {
+            'path': str(path.relative_to(root)),
+            'width': image.width,
+            'height': image.height,
+            'format': image_format,
+            'size': path.stat().st_size
+        }
+
+    with Image.open(source) as original:
+        if getattr(original, 'is_animated', False):
+            # アニメーションは変換すると動かなくなるため元の画像を使う
+            return {'hash': content_hash, 'skipped': 'animated'}
+
+        # EXIFの向きを反映してからメタデータを捨てる
+        image = ImageOps.exif_transpose(original)
+        image.info = {}
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in original.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = []
+    for width in sorted({min(w, image.width) for w in VARIANT_WIDTHS}):
+        resized = image
+        if width != image.width:
+            resized = image.resize((width, max(1, round(image.height * width / image.width))), Image.LANCZOS)
+        for image_format in formats:
+            variants.append(record(resized, out_dir / f"{content_hash}-{width}.{image_format}", image_format))
+
+    thumbnail = image.copy()
+    thumbnail.thumbnail(THUMBNAIL_SIZE, Image.LANCZOS)
+
+    return {
+        'hash': content_hash,
+        'width': image.width,
+        'height': image.height,
+        'source_size': Path(source).stat().st_size,
+        'variants': variants,
+        'thumbnail': record(thumbnail, out_dir / f"{content_hash}-thumb.webp", 'webp')
+    }
+
+
+class ImageVariants:
+    """
+    保存した画像の縮小版（WebP/AVIF）とサムネイルを作成し、内容のハッシュごとに索引に記録する
+
+    一度変換したハッシュは再変換しない。変換は複数のプロセスで並列に行う。
+    """
+
+    def __init__(self, variants_dir=VARIANTS_DIR, index_file=VARIANTS_INDEX_FILE, root=ROOT_DIR):
+        """
+        索引を読み込む
+
+        Args:
+            variants_dir (Path): 縮小版の保存先
+            index_file (Path): 索引のファイル
+            root (Path): 索引に記録するパスの基準
+        """
+        self.variants_dir = Path(variants_dir)
+        self.index_file = Path(index_file)
+        self.root = Path(root)
+        self.index = {}
+
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except ValueError as e:
+                logger.warning(f"縮小版の索引を読み込めませんでした: {e}")
+
+    def lookup(self, image_path):
+        """
+        保存した画像の縮小版を取得
+
+        Args:
+            image_path (str): 画像のパス（ファイル名が内容のハッシュ）
+
+        Returns:
+            dict: 索引のエントリ（縮小版が無い場合はNone）
+        """
+        entry = self.index.get(Path(image_path).stem)
+        if entry and entry.get('variants'):
+            return entry
+        return None
+
+    def is_processed(self, content_hash):
+        """変換済み（または変換しないと判断済み）で、出力が揃っているか"""
+        entry = self.index.get(content_hash)
+        if entry is None:
+            return False
+        outputs = entry.get('variants', []) + ([entry['thumbnail']] if entry.get('thumbnail') else [])
+        return all((self.root / v['path']).exists() for v in outputs)
+
+    def process(self, image_paths, workers=TRANSCODE_WORKERS):
+        """
+        未変換の画像を変換
+
+        Args:
+            image_paths (iterable): 画像のパス（root からの相対パス）
+            workers (int): プロセス数
+
+        Returns:
+            Counter: transcoded / skipped / failed の件数
+        """
+        stats = Counter()
+        formats = variant_formats()
+        if not formats:
+            logger.info("Pillow（WebP対応）が無いため、画像の縮小版は作成しません")
+            return stats
+
+        jobs = {}
+        for image_path in image_paths:
+            content_hash = Path(image_path).stem
+            if content_hash in jobs:
+                continue
+            if self.is_processed(content_hash):
+                stats['skipped'] += 1
+                continue
+            jobs[content_hash] = self.root / image_path
+
+        if not jobs:
+            return stats
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            futures = {
+                content_hash: executor.submit(
+                    transcode_image, str(source), content_hash, str(self.variants_dir), str(self.root), formats
+                )
+                for content_hash, source in jobs.items()
+            }
+            for content_hash, future in futures.items():
+                try:
+                    self.index[content_hash] = future.result()
+                    stats['transcoded'] += 1
+                except Exception as e:
+                    # 壊れた画像などは毎回変換し直さないよう記録しておく
+                    logger.warning(f"画像 {jobs[content_hash]} を変換できませんでした: {e}")
+                    self.index[content_hash] = {'hash': content_hash, 'skipped': 'error'}
+                    stats['failed'] += 1
+
+        logger.info(f"画像の縮小版: {dict(stats)}（形式: {', '.join(formats)}）")
+        return stats
+
+    def save(self):
+        """索引をアトミックに保存"""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_file)
+
+
+def main():
+    """画像索引に登録された全ての画像を変換（Pillowを後から導入した場合など）"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    from image_store import INDEX_FILE
+
+    paths = []
+    if INDEX_FILE.exists():
+        with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+            paths = [entry['path'] for entry in json.load(f).values()]
+
+    variants = ImageVariants()
+    variants.process(paths)
+    variants.save()
+
+
+if __name__ == "__main__":
+    main()
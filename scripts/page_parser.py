@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import importlib.util
+import logging
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+
+def default_parser():
+    """lxmlがあればlxml、無ければ標準のhtml.parserを使う"""
+    return 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+
+# HTMLパーサーのバックエンド（環境変数 NIKKEI_HTML_PARSER で上書き可能）
+HTML_PARSER = os.environ.get('NIKKEI_HTML_PARSER') or default_parser()
+
+# 記事URLのパターン
+ARTICLE_HREF_PATTERN = re.compile(r'^/atcl/contents/')
+
+# 公開日の形式（YYYY.MM.DD または YYYY年MM月DD日）
+DATE_PATTERN = re.compile(r'(\d{4})[\.年](\d{1,2})[\.月](\d{1,2})')
+
+# 一覧ページの項目の日付（上記に加えて YYYY/MM/DD や <time datetime> の YYYY-MM-DD）
+LISTING_DATE_PATTERN = re.compile(r'(\d{4})[\.年/-](\d{1,2})[\.月/-](\d{1,2})')
+
+# セクション（記事一覧）ページのURLパターン
+LISTING_HREF_PATTERN = re.compile(r'^/atcl/(?:list|group)/')
+
+# 一覧ページで解析する要素（これらの要素の中だけを解析し、<head>のスクリプトや装飾の要素は読み飛ばす）。
+# 項目の公開日は記事リンクを含む項目の要素から読むため、リンク単体ではなく本文領域と項目の要素ごと残す
+LISTING_PARSE_TAGS = frozenset(['main', 'article', 'li', 'a'])
+
+# 次のページへのリンクとみなすテキスト
+NEXT_PAGE_TEXTS = ('次へ', '次のページ', '次', '>', '›', '»')
+
+# 本文の候補（優先順）
+CONTENT_SELECTORS = [
+    'article',
+    '.article-body',
+    '.article-content',
+    'main',
+    '#article-body',
+    '.content'
+]
+
+# 本文から除去する要素（ナビゲーション、広告、関連記事など）
+NOISE_SELECTOR = '.ad, .advertisement, .related, .share, .social, nav, footer, .footer'
+
+DEFAULT_AUTHOR = "日経クロストレンド"
+
+
+def make_soup(html, parse_only=None, parser=None):
+    """
+    HTMLを解析
+
+    Args:
+        html (str|bytes): HTML
+        parse_only (SoupStrainer): 解析対象を限定する場合に指定
+        parser (str): パーサー（省略時はHTML_PARSER）
+
+    Returns:
+        BeautifulSoup: 解析結果
+    """
+    return BeautifulSoup(html, parser or HTML_PARSER, parse_only=parse_only)
+
+
+def link_title(link):
+    """
+    記事リンクのタイトル（リンクのテキストまたはリンク内のタイトル要素）
+
+    Returns:
+        str: タイトル（有効なタイトルが無い場合はNone）
+    """
+    title = link.get_text(strip=True)
+    if not title:
+        title_elem = link.find('h2') or link.find('h3') or link.find('h4')
+        if title_elem:
+            title = title_elem.get_text(strip=True)
+
+    if title and len(title) > 5:  # 有効なタイトルのみ
+        return title
+    return None
+
+
+def format_date(match):
+    """日付の正規表現の一致を YYYY.MM.DD 形式にする"""
+    year, month, day = match.groups()
+    return f"{year}.{month.zfill(2)}.{day.zfill(2)}"
+
+
+def listing_entry(link):
+    """
+    一覧ページで記事リンクを含む項目の要素
+
+    他の記事へのリンクを含まない範囲で、最も外側の祖先を項目とみなす。
+    """
+    href = link['href']
+    entry = link
+    for parent in link.parents:
+        if parent.name in ('body', 'html', '[document]'):
+            break
+        if any(a['href'] != href for a in parent.find_all('a', href=ARTICLE_HREF_PATTERN)):
+            break
+        entry = parent
+    return entry
+
+
+def listing_entry_date(link):
+    """
+    一覧ページの項目に書かれた公開日
+
+    Returns:
+        str: YYYY.MM.DD 形式の日付（見つからない場合はNone）
+    """
+    entry = listing_entry(link)
+    for time_elem in entry.find_all('time'):
+        match = LISTING_DATE_PATTERN.search(time_elem.get('datetime') or time_elem.get_text(strip=True))
+        if match:
+            return format_date(match)
+    match = LISTING_DATE_PATTERN.search(entry.get_text(' ', strip=True))
+    return format_date(match) if match else None
+
+
+def parse_listing(html, page_url, parser=None):
+    """
+    記事一覧ページ（トップページ・セクションページ）を解析（LISTING_PARSE_TAGS の要素だけを解析する）
+
+    本文領域（<main>）や項目（<li>・<article>）の外にある記事リンクはリンク単体で解析するため、
+    その項目の公開日は読めない（取得後に記事ページの公開日を使う）。
+
+    Args:
+        html (str): ページのHTML
+        page_url (str): ページのURL（相対URLの基準）
+        parser (str): パーサー
+
+    Returns:
+        dict: {
+            'entries': (記事URL, タイトル, 公開日またはNone) のリスト（ページ内の出現順、重複あり）,
+            'next_pages': 次のページのURLのリスト,
+            'sections': セクションページのURLのリスト
+        }
+    """
+    strainer = SoupStrainer(lambda name: name in LISTING_PARSE_TAGS)
+    return parse_listing_soup(make_soup(html, parse_only=strainer, parser=parser), page_url)
+
+
+def parse_listing_soup(soup, page_url):
+    """
+    解析済みの記事一覧ページから記事の項目・次のページ・セクションページを取り出す
+
+    Args:
+        soup (BeautifulSoup): 解析結果
+        page_url (str): ページのURL（相対URLの基準）
+
+    Returns:
+        dict: parse_listing の戻り値と同じ
+    """
+    entries = []
+    for link in soup.find_all('a', href=ARTICLE_HREF_PATTERN):
+        title = link_title(link)
+        if title:
+            entries.append((urljoin(page_url, link['href']), title, listing_entry_date(link)))
+
+    next_pages = []
+    for link in soup.find_all('a', href=True):
+        rel = link.get('rel') or ()
+        if 'next' in rel or link.get_text(strip=True) in NEXT_PAGE_TEXTS:
+            next_pages.append(urljoin(page_url, link['href']))
+
+    sections = [urljoin(page_url, link['href']) for link in soup.find_all('a', href=LISTING_HREF_PATTERN)]
+
+    return {'entries': entries, 'next_pages': next_pages, 'sections': sections}
+
+
+def has_class(classes, *keywords):
+    """class属性のいずれかにキーワードが含まれるか（大文字小文字を区別しない）"""
+    return any(keyword in c.lower() for c in classes for keyword in keywords)
+
+
+def scan_article(soup):
+    """
+    記事ページを1回走査して、タイトル・公開日・カテゴリ・著者・本文候補の要素を集める
+
+    各要素は文書順で最初に見つかったものを使う（soup.find / select_one と同じ）。
+
+    Args:
+        soup (BeautifulSoup): 記事ページ
+
+    Returns:
+        dict: 要素の種類 → 要素
+    """
+    found = {}
+    slots = 11
+
+    def take(key, tag):
+        if key not in found:
+            found[key] = tag
+
+    for tag in soup.find_all(True):
+        name = tag.name
+        if name == 'h1':
+            take('title', tag)
+        elif name == 'time':
+            take('time', tag)
+        elif name == 'article' or name == 'main':
+            take(name, tag)
+
+        classes = tag.get('class') or ()
+        if classes:
+            if has_class(classes, 'date'):
+                take('date', tag)
+            if has_class(classes, 'category', 'cat'):
+                take('category', tag)
+            if has_class(classes, 'author'):
+                take('author', tag)
+            for selector in ('article-body', 'article-content', 'content'):
+                if selector in classes:
+                    take('.' + selector, tag)
+
+        if tag.get('id') == 'article-body':
+            take('#article-body', tag)
+
+        if len(found) == slots:
+            break
+
+    return found
+
+
+def text_longer_than(elem, length):
+    """get_text(strip=True)の文字数がlengthを超えるか（超えた時点で打ち切る）"""
+    total = 0
+    for text in elem.stripped_strings:
+        total += len(text)
+        if total > length:
+            return True
+    return False
+
+
+def parse_article_soup(soup):
+    """
+    記事ページのHTMLから記事本文を抽出
+
+    Args:
+        soup (BeautifulSoup): 記事ページ
+
+    Returns:
+        dict: 記事コンテンツ情報
+    """
+    found = scan_article(soup)
+
+    # 記事タイトル
+    title_elem = found.get('title')
+    title = title_elem.get_text(strip=True) if title_elem else "タイトルなし"
+
+    # 公開日
+    date_elem = found.get('time') or found.get('date')
+    publish_date = None
+    if date_elem:
+        date_match = DATE_PATTERN.search(date_elem.get_text(strip=True))
+        if date_match:
+            publish_date = format_date(date_match)
+
+    # カテゴリ
+    category_elem = found.get('category')
+    category = category_elem.get_text(strip=True) if category_elem else None
+
+    # 記事本文（複数の可能性のあるセレクタを優先順に試す）
+    content_elem = None
+    for selector in CONTENT_SELECTORS:
+        content_elem = found.get(selector)
+        if content_elem and text_longer_than(content_elem, 100):
+            break
+
+    # コンテンツ要素が見つからない場合は、本文らしき段落を全て取得
+    if not content_elem:
+        texts = (p.get_text(strip=True) for p in soup.find_all('p'))
+        content_text = "\n\n".join([text for text in texts if len(text) > 50])
+    else:
+        # 不要な要素を除去
+        for elem in content_elem.select(NOISE_SELECTOR):
+            elem.decompose()
+
+        # 本文テキストを取得
+        paragraphs = content_elem.find_all('p')
+        if paragraphs:
+            texts = (p.get_text(strip=True) for p in paragraphs)
+            content_text = "\n\n".join([text for text in texts if text])
+        else:
+            content_text = content_elem.get_text(strip=True)
+
+    # 著者情報（除去した要素の中にあった場合は残った要素から探し直す）
+    author_elem = found.get('author')
+    if author_elem is not None and getattr(author_elem, 'decomposed', False):
+        author_elem = soup.find(class_=lambda c: c and 'author' in c.lower())
+    author = author_elem.get_text(strip=True) if author_elem else DEFAULT_AUTHOR
+
+    return {
+        'title': title,
+        'publish_date': publish_date,
+        'category': category,
+        'content_text': content_text,
+        'author': author
+    }
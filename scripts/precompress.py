@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import tempfile
+from email.utils import formatdate
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # brotliが無い環境ではgzipのみ作成する
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 定数
+DOCS_DIR = Path(__file__).parent.parent / "docs"
+MANIFEST_NAME = "etags.json"
+
+# 圧縮版を作成するファイル
+COMPRESS_PATTERNS = ('*.xml', '*.html', '*.json')
+# 圧縮版を作成しないディレクトリ（検索索引のシャードは数が多く、GitHub Pagesは圧縮版を配信しないため、
+# 圧縮版を作ると毎日コミットするファイルが増えるだけになる）
+EXCLUDE_DIRS = ('search',)
+
+# 圧縮形式ごとの拡張子（Accept-Encoding の値と対応）
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def content_hash(data):
+    """ETagに使う内容のハッシュ"""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def compress(data, encoding):
+    """
+    内容を圧縮（同じ内容からは常に同じバイト列を作る）
+
+    Args:
+        data (bytes): 元の内容
+        encoding (str): 'gzip' または 'br'
+
+    Returns:
+        bytes: 圧縮した内容
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    # 更新時刻をヘッダーに含めない（内容が同じなら圧縮版も変わらないようにする）
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def available_encodings():
+    """作成できる圧縮形式"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def write_bytes_atomic(path, data):
+    """一時ファイルに書き出してから置き換える"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def load_manifest(root=DOCS_DIR):
+    """ETagの一覧を読み込む（無ければ空）"""
+    try:
+        with open(Path(root) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def precompress_docs(root=DOCS_DIR):
+    """
+    公開するファイルの圧縮版（.gz / .br）と、強いETagの一覧（etags.json）を作成
+
+    元のファイルの内容のハッシュが前回と同じなら圧縮版を作り直さず、ファイルにも触れない。
+    Last-Modified も前回の値を引き継ぐ（チェックアウトし直してファイルの更新時刻が変わっても、内容が同じなら変えない）。
+
+    Args:
+        root (Path): 公開するディレクトリ
+
+    Returns:
+        dict: パス→{'etag', 'size', 'last_modified', 'encodings': {形式: {'etag', 'size'}}}
+    """
+    root = Path(root)
+    previous = load_manifest(root)
+    encodings = available_encodings()
+    manifest = {}
+    compressed = 0
+
+    sources = sorted({p for pattern in COMPRESS_PATTERNS for p in root.rglob(pattern)
+                      if p.name != MANIFEST_NAME and p.relative_to(root).parts[0] not in EXCLUDE_DIRS})
+    for source in sources:
+        key = source.relative_to(root).as_posix()
+        data = source.read_bytes()
+        digest = content_hash(data)
+        entry = previous.get(key)
+        if not entry or entry.get('hash') != digest:
+            entry = {'hash': digest, 'etag': f'"{digest}"', 'size': len(data), 'encodings': {}}
+
+        for encoding in encodings:
+            variant = source.with_name(source.name + ENCODING_SUFFIXES[encoding])
+            if encoding in entry['encodings'] and variant.exists():
+                continue
+            body = compress(data, encoding)
+            write_bytes_atomic(variant, body)
+            # 表現ごとに異なる強いETagを付ける
+            entry['encodings'][encoding] = {'etag': f'"{digest}-{encoding}"', 'size': len(body)}
+            compressed += 1
+
+        if 'last_modified' not in entry:
+            entry['last_modified'] = formatdate(source.stat().st_mtime, usegmt=True)
+        manifest[key] = entry
+
+    # 元のファイルが無くなった（または対象外になった）圧縮版を削除
+    for suffix in ENCODING_SUFFIXES.values():
+        for variant in root.rglob(f"*{suffix}"):
+            if variant.with_name(variant.name[:-len(suffix)]).relative_to(root).as_posix() not in manifest:
+                variant.unlink()
+
+    text = json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True)
+    manifest_file = root / MANIFEST_NAME
+    if not manifest_file.exists() or manifest_file.read_text(encoding='utf-8') != text:
+        write_bytes_atomic(manifest_file, text.encode('utf-8'))
+
+    logger.info(f"圧縮版: {len(manifest)}ファイル中{compressed}件を作成（形式: {', '.join(encodings)}）")
+    return manifest
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    precompress_docs()
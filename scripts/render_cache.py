@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+RENDER_CACHE_FILE = Path(__file__).parent.parent / ".cache" / "render_cache.json"
+
+# 変換処理を変更した場合はこの値を上げて古いキャッシュを無効にする
+RENDER_VERSION = 2
+
+
+class RenderCache:
+    """
+    Markdownファイルごとの変換結果（HTML本文・説明文・著者）をキャッシュする
+
+    ファイルの更新時刻とサイズが変わっていなければそのまま使い、変わっていても
+    内容のハッシュが同じなら再変換しない。
+    """
+
+    def __init__(self, path=RENDER_CACHE_FILE):
+        """
+        キャッシュを読み込む
+
+        Args:
+            path (Path): キャッシュファイルのパス
+        """
+        self.path = Path(path)
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == RENDER_VERSION:
+                    self.entries = data.get('entries', {})
+            except ValueError as e:
+                logger.warning(f"変換キャッシュを読み込めませんでした: {e}")
+
+    def get(self, md_file, render, depends=None):
+        """
+        Markdownファイルの変換結果を取得（未キャッシュまたは変更があれば変換する）
+
+        Args:
+            md_file (Path): Markdownファイル
+            render (callable): Markdown文字列を受け取り変換結果(dict)を返す関数
+            depends (list): Markdown以外で変換結果が依存する値（画像の縮小版など）。変われば変換し直す
+
+        Returns:
+            dict: 変換結果
+        """
+        key = md_file.name
+        stat = md_file.stat()
+        entry = self.entries.get(key)
+        depends = depends or []
+        if entry and entry.get('depends', []) != depends:
+            entry = None
+
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            self.hits += 1
+            return entry['rendered']
+
+        with open(md_file, 'r', encoding='utf-8') as f:
+            md_content = f.read()
+        content_hash = hashlib.sha256(md_content.encode('utf-8')).hexdigest()
+
+        if entry and entry['hash'] == content_hash:
+            self.hits += 1
+            rendered = entry['rendered']
+        else:
+            self.misses += 1
+            rendered = render(md_content)
+
+        self.entries[key] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': content_hash,
+            'depends': depends,
+            'rendered': rendered
+        }
+        return rendered
+
+    def save(self, keep=None):
+        """
+        キャッシュを保存
+
+        Args:
+            keep (set): 残すMarkdownファイル名（省略時は全て残す）
+        """
+        if keep is not None:
+            self.entries = {k: v for k, v in self.entries.items() if k in keep}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': RENDER_VERSION, 'entries': self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        logger.info(f"変換キャッシュ: {self.hits}件再利用、{self.misses}件変換")
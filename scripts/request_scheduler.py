@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from retry_policy import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# 全ホスト合計の同時リクエスト数
+MAX_CONCURRENCY = int(os.environ.get('NIKKEI_MAX_CONCURRENCY', '8'))
+
+# ホストごとのリクエスト数/秒（開始時・下限・上限）
+INITIAL_RATE = float(os.environ.get('NIKKEI_RATE_INITIAL', '1.0'))
+MIN_RATE = float(os.environ.get('NIKKEI_RATE_MIN', '0.2'))
+MAX_RATE = float(os.environ.get('NIKKEI_RATE_MAX', '8.0'))
+
+# AIMDの調整
+INCREASE_STEP = 0.25  # 正常な応答が続く間、1秒あたりおおよそこの値ずつレートを上げる
+DECREASE_FACTOR = 0.5  # 429/5xx・接続エラーでレートに掛ける値
+SLOW_DECREASE_FACTOR = 0.8  # 応答が遅くなったときにレートに掛ける値
+DECREASE_COOLDOWN = 2.0  # 同時に返ってきた失敗でレートを何度も下げないよう、下げた後この秒数は下げない
+SLOW_LATENCY_FACTOR = 3.0  # 通常の応答時間のこの倍数を超えたら遅いとみなす
+MIN_SLOW_LATENCY = 0.5  # これより速い応答は遅いとみなさない（秒）
+LATENCY_ALPHA = 0.2  # 通常の応答時間の移動平均の重み
+SLOW_LATENCY_ALPHA = 0.02  # 遅い応答を通常の応答時間に反映する重み（サイト全体が遅くなった場合に追従する）
+MAX_RETRY_AFTER = 120  # Retry-After で待つ最大の秒数
+
+
+def parse_retry_after(value):
+    """
+    Retry-After ヘッダー（秒数またはHTTP日付）を秒数に変換
+
+    Returns:
+        float: 待つ秒数（ヘッダーが無いか解釈できなければNone）
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+class RequestOutcome:
+    """リクエストの結果（スケジューラーがレートの調整に使う）"""
+
+    def __init__(self):
+        self.status = None
+        self.latency = None
+        self.retry_after = None
+        self.failed = False
+
+    def response(self, response):
+        """
+        requests の応答からステータスと応答時間を記録
+
+        Args:
+            response (requests.Response): 応答
+
+        Returns:
+            requests.Response: 引数の応答（呼び出しを包んで使う）
+        """
+        self.status = response.status_code
+        # 本文の転送時間（画像の大きさ）に左右されないよう、ヘッダーを受け取るまでの時間を使う
+        self.latency = response.elapsed.total_seconds()
+        self.retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        return response
+
+
+class HostState:
+    """ホストごとのトークンバケットと応答時間"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = float('-inf')
+        self.latency = {}  # リクエストの種類（http/browser/image）ごとの通常の応答時間
+        self.stats = Counter()
+
+    def refill(self, now):
+        capacity = max(1.0, self.rate)  # 1秒分まで貯められる
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RequestScheduler:
+    """
+    サイトへの全てのリクエスト（ブラウザのページ遷移・HTTP取得・画像取得）が通る共有のスケジューラー
+
+    ホストごとのトークンバケットでリクエストの間隔を空け、全体の同時リクエスト数を制限する。
+    レートはAIMD（加算増加・乗算減少）で調整し、正常で速い応答が続けば少しずつ上げ、
+    429/5xx・接続エラーでは半分に、応答が通常より遅くなれば少し下げる。
+    Retry-After が付いた応答では、その秒数だけホストへのリクエストを止める。
+    障害が続くホストへのリクエストは、サーキットブレーカーで送る前に失敗させる（CircuitOpenError）。
+    """
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, initial_rate=INITIAL_RATE,
+                 min_rate=MIN_RATE, max_rate=MAX_RATE, breaker=None):
+        """
+        Args:
+            max_concurrency (int): 全ホスト合計の同時リクエスト数
+            initial_rate (float): ホストごとの開始時のリクエスト数/秒
+            min_rate (float): レートの下限
+            max_rate (float): レートの上限
+            breaker (CircuitBreaker): ホストごとのサーキットブレーカー（省略時は新しく作成）
+        """
+        self.max_concurrency = max_concurrency
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.breaker = breaker or CircuitBreaker()
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def host_state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = HostState(self.initial_rate)
+        return state
+
+    def acquire_token(self, host):
+        """
+        ホストのトークンを1つ取得（無ければ貯まるまで待つ）
+
+        Returns:
+            float: 待った秒数
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                state = self.host_state(host)
+                now = time.monotonic()
+                state.refill(now)
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    state.stats['wait_seconds'] += waited
+                    return waited
+                else:
+                    wait = (1 - state.tokens) / state.rate
+            # 待つ間にレートが変わることがあるため、起きたら確認し直す
+            time.sleep(min(wait, 1.0))
+            waited += min(wait, 1.0)
+
+    @contextmanager
+    def request(self, url, kind='http'):
+        """
+        リクエストを1件行う枠を確保する
+
+        with の中でリクエストを行い、requests の応答は outcome.response() に渡す
+        （ブラウザのページ遷移などはステータスを outcome.status に設定する）。
+        with の中で例外が発生した場合は失敗として扱う。
+        ホストへのリクエストをサーキットブレーカーが止めている場合は CircuitOpenError を送出する。
+
+        Args:
+            url (str): リクエストするURL
+            kind (str): リクエストの種類（応答時間は種類ごとに比べる）
+
+        Yields:
+            RequestOutcome: リクエストの結果の記録先
+        """
+        host = urlparse(url).netloc
+        self.breaker.before_request(host)
+        self.acquire_token(host)
+        outcome = RequestOutcome()
+        with self.slots:
+            started = time.monotonic()
+            try:
+                yield outcome
+            except Exception:
+                outcome.failed = True
+                raise
+            finally:
+                if outcome.latency is None:
+                    outcome.latency = time.monotonic() - started
+                self.record(host, kind, outcome)
+
+    def record(self, host, kind, outcome):
+        """リクエストの結果でレートを調整（AIMD）"""
+        with self.lock:
+            state = self.host_state(host)
+            now = time.monotonic()
+            state.stats['requests'] += 1
+            status = outcome.status
+            # 429はレートの調整で対応するため、ブレーカーでは接続エラーと5xxだけを失敗として数える
+            server_error = status >= 500 if status is not None else outcome.failed
+            self.breaker.record(host, not server_error)
+
+            if outcome.failed or status == 429 or (status is not None and status >= 500):
+                state.stats['throttled' if status == 429 else 'errors'] += 1
+                if outcome.retry_after:
+                    state.blocked_until = max(state.blocked_until, now + outcome.retry_after)
+                self.decrease(state, now, DECREASE_FACTOR)
+                return
+
+            baseline = state.latency.get(kind)
+            slow = (baseline is not None and outcome.latency > MIN_SLOW_LATENCY
+                    and outcome.latency > SLOW_LATENCY_FACTOR * baseline)
+            alpha = SLOW_LATENCY_ALPHA if slow else LATENCY_ALPHA
+            state.latency[kind] = outcome.latency if baseline is None else (1 - alpha) * baseline + alpha * outcome.latency
+
+            if slow:
+                state.stats['slow'] += 1
+                self.decrease(state, now, SLOW_DECREASE_FACTOR)
+            elif now - state.last_decrease >= DECREASE_COOLDOWN:
+                # 1件ごとに step/rate ずつ上げると、1秒あたりおおよそ step ずつ上がる
+                state.rate = min(self.max_rate, state.rate + INCREASE_STEP / state.rate)
+
+    def decrease(self, state, now, factor):
+        if now - state.last_decrease < DECREASE_COOLDOWN:
+            return
+        state.rate = max(self.min_rate, state.rate * factor)
+        state.tokens = min(state.tokens, 1.0)
+        state.last_decrease = now
+        state.stats['decreases'] += 1
+
+    def describe(self):
+        """
+        ホストごとの現在のレートと集計（計測結果に記録する）
+
+        Returns:
+            dict: {ホスト: {'rate', 'latency', 'circuit', 'requests', ...}}
+        """
+        circuits = self.breaker.describe()
+        with self.lock:
+            result = {}
+            for host, state in self.hosts.items():
+                stats = dict(state.stats)
+                stats['wait_seconds'] = round(stats.get('wait_seconds', 0.0), 3)
+                result[host] = {
+                    'rate': round(state.rate, 3),
+                    'latency': {kind: round(value, 3) for kind, value in state.latency.items()},
+                    'circuit': circuits.get(host),
+                    **stats
+                }
+            return result
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def env_list(name):
+    """カンマ区切りの環境変数をリストにする"""
+    return [item.strip() for item in os.environ.get(name, '').split(',') if item.strip()]
+
+
+# 本文の抽出に不要なため読み込まないリソース（広告・計測・SNSウィジェット・Webフォント・動画）
+DEFAULT_BLOCKED_URLS = [
+    '*googletagmanager.com/*',
+    '*google-analytics.com/*',
+    '*doubleclick.net/*',
+    '*googlesyndication.com/*',
+    '*adservice.google.*',
+    '*amazon-adsystem.com/*',
+    '*facebook.net/*',
+    '*connect.facebook.*',
+    '*platform.twitter.com/*',
+    '*/analytics.js*',
+    '*/gtm.js*',
+    '*fonts.googleapis.com/*',
+    '*fonts.gstatic.com/*',
+    '*.woff',
+    '*.woff?*',
+    '*.woff2',
+    '*.woff2?*',
+    '*.ttf',
+    '*.otf',
+    '*.mp4',
+    '*.webm',
+]
+
+# スタイルシートを読み込まない場合に追加するパターン
+CSS_URL_PATTERNS = ['*.css', '*.css?*']
+
+
+class BlockingConfig:
+    """ブラウザで読み込まないリソースの設定"""
+
+    def __init__(self, enabled=True, blocked=None, allowed=None, images=False, css=False):
+        """
+        Args:
+            enabled (bool): リソースの遮断を行うか
+            blocked (list): 遮断するURLのパターン（* はワイルドカード）
+            allowed (list): 遮断しないパターン（blockedから除外する。デフォルトのパターンを個別に解除する場合に使う）
+            images (bool): 画像を読み込まない（画像のURLはDOMに残るためダウンロードには影響しない）
+            css (bool): スタイルシートを読み込まない
+        """
+        self.enabled = enabled
+        self.blocked = list(DEFAULT_BLOCKED_URLS if blocked is None else blocked)
+        self.allowed = list(allowed or [])
+        self.images = images
+        self.css = css
+
+    @classmethod
+    def from_env(cls):
+        """
+        環境変数から設定を作成
+
+        NIKKEI_BLOCK_RESOURCES=0 で遮断を無効にし、NIKKEI_BLOCK_URLS で遮断するパターンを追加、
+        NIKKEI_ALLOW_URLS で遮断しないパターンを指定する。
+        NIKKEI_BLOCK_IMAGES=1 / NIKKEI_BLOCK_CSS=1 で画像・スタイルシートも読み込まない。
+        """
+        return cls(
+            enabled=os.environ.get('NIKKEI_BLOCK_RESOURCES', '1') != '0',
+            blocked=DEFAULT_BLOCKED_URLS + env_list('NIKKEI_BLOCK_URLS'),
+            allowed=env_list('NIKKEI_ALLOW_URLS'),
+            images=os.environ.get('NIKKEI_BLOCK_IMAGES') == '1',
+            css=os.environ.get('NIKKEI_BLOCK_CSS') == '1'
+        )
+
+    @classmethod
+    def disabled(cls):
+        """何も遮断しない設定"""
+        return cls(enabled=False)
+
+    def blocked_patterns(self):
+        """遮断するURLのパターン"""
+        if not self.enabled:
+            return []
+        patterns = self.blocked + (CSS_URL_PATTERNS if self.css else [])
+        return [p for p in patterns if p not in self.allowed]
+
+    def browser_arguments(self):
+        """Chromeの起動オプション"""
+        if self.enabled and self.images:
+            # 画像の読み込みとデコードを行わない
+            return ['--blink-settings=imagesEnabled=false']
+        return []
+
+    def describe(self):
+        """計測結果に記録する設定の要約"""
+        return {
+            'enabled': self.enabled,
+            'patterns': len(self.blocked_patterns()),
+            'images': self.enabled and self.images,
+            'css': self.enabled and self.css
+        }
+
+    def apply(self, driver):
+        """
+        Chrome DevTools Protocol の Network.setBlockedURLs で遮断を設定
+
+        設定はブラウザのタブに対して有効で、以降の全てのページ読み込みに適用される。
+
+        Args:
+            driver (webdriver): 対象のWebDriver（Chrome）
+        """
+        patterns = self.blocked_patterns()
+        if not patterns:
+            return
+
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        logger.info(f"{len(patterns)}個のパターンに一致するリソースを読み込まないよう設定しました")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import time
+import random
+import logging
+import threading
+
+import requests
+
+try:
+    from selenium.common.exceptions import WebDriverException
+except ImportError:  # 画像の取得だけを使う場合など
+    WebDriverException = None
+
+logger = logging.getLogger(__name__)
+
+# 1回の実行の中での再試行（記事・画像ごと）
+RETRY_ATTEMPTS = int(os.environ.get('NIKKEI_RETRY_ATTEMPTS', '3'))  # 最初の試行を含む回数
+RETRY_BASE_DELAY = 1.0  # 1回目の再試行までの待ち時間の上限（秒）。以降は倍々に増やす
+RETRY_MAX_DELAY = 30.0  # 待ち時間の上限（秒）
+
+# 再試行キューに残した記事を、後の実行で取り直す回数
+RETRY_RUNS = int(os.environ.get('NIKKEI_RETRY_RUNS', '3'))
+
+# サーキットブレーカー（ホストごと）
+BREAKER_THRESHOLD = 5  # 連続してこの回数失敗したら、ホストへのリクエストを止める
+BREAKER_OPEN_SECONDS = 60.0  # 止める秒数（止めるたびに倍にする）
+BREAKER_MAX_OPEN_SECONDS = 600.0
+
+# 時間をおけば成功する可能性のあるHTTPステータス
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """取得の失敗（retryable は時間をおいて再試行できるか）"""
+
+    def __init__(self, message, retryable=True, status=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.status = status
+
+
+class CircuitOpenError(FetchError):
+    """サーキットブレーカーが開いているため、リクエストを送らなかった"""
+
+    def __init__(self, host, retry_in):
+        super().__init__(f"{host} へのリクエストを一時停止しています（あと{retry_in:.0f}秒）", retryable=True)
+        self.host = host
+        self.retry_in = retry_in
+
+
+def status_error(status, url):
+    """HTTPステータスの失敗を FetchError にする（429/5xx などは再試行可能）"""
+    return FetchError(f"HTTP {status}: {url}", retryable=status in RETRYABLE_STATUSES, status=status)
+
+
+def is_retryable(error):
+    """
+    失敗が再試行で解決する可能性があるか
+
+    タイムアウト・接続エラー・429/5xx・ブラウザの一時的な失敗は再試行可能、
+    4xx や解析の失敗（ページの構造が想定と違うなど）は再試行しても同じ結果になるため再試行しない。
+
+    Args:
+        error (Exception): 発生した例外
+
+    Returns:
+        bool: 再試行可能ならTrue
+    """
+    if isinstance(error, FetchError):
+        return error.retryable
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRYABLE_STATUSES
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                          TimeoutError, ConnectionError)):
+        return True
+    if WebDriverException is not None and isinstance(error, WebDriverException):
+        # 要素が見つからないのはページの構造の問題なので再試行しない
+        return type(error).__name__ not in ('NoSuchElementException', 'InvalidArgumentException')
+    return False
+
+
+class RetryPolicy:
+    """指数バックオフとジッターによる再試行の設定"""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+        """
+        Args:
+            attempts (int): 最初の試行を含む最大の試行回数
+            base_delay (float): 1回目の再試行までの待ち時間の上限（秒）
+            max_delay (float): 待ち時間の上限（秒）
+        """
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt, error=None):
+        """
+        再試行までの待ち時間（full jitter: 0〜base×2^(attempt-1) の一様乱数。同時に失敗した取得が同時に再試行しない）
+
+        Args:
+            attempt (int): 失敗した試行の回数（1から）
+            error (Exception): 失敗の原因（ブレーカーが閉じるまでの時間がわかる場合はそれ以上待つ）
+
+        Returns:
+            float: 待つ秒数（待っても間に合わない場合はNone）
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        if isinstance(error, CircuitOpenError):
+            if error.retry_in > self.max_delay:
+                return None
+            delay = max(delay, error.retry_in)
+        return delay
+
+    def should_retry(self, attempt, error):
+        """attempt 回目の試行が error で失敗したときに再試行するか"""
+        return attempt < self.attempts and is_retryable(error)
+
+
+class CircuitBreaker:
+    """
+    ホストごとのサーキットブレーカー
+
+    連続して BREAKER_THRESHOLD 回失敗したホストへのリクエストを一定時間止め（open）、
+    時間が経ったら1件だけ試し（half-open）、成功すれば再開、失敗すれば止める時間を倍にして止め直す。
+    障害中のホストに対して、残りの記事が全てタイムアウトまで待つことを防ぐ。
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, open_seconds=BREAKER_OPEN_SECONDS,
+                 max_open_seconds=BREAKER_MAX_OPEN_SECONDS):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.lock = threading.Lock()
+        self.hosts = {}
+
+    def host_state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = self.hosts[host] = {'failures': 0, 'opened_until': 0.0, 'trips': 0, 'trial': False}
+        return state
+
+    def before_request(self, host):
+        """
+        リクエストを送ってよいか確認
+
+        Raises:
+            CircuitOpenError: ホストへのリクエストを止めている場合
+        """
+        with self.lock:
+            state = self.host_state(host)
+            if state['failures'] < self.threshold:
+                return
+            now = time.monotonic()
+            if now < state['opened_until']:
+                raise CircuitOpenError(host, state['opened_until'] - now)
+            if state['trial']:
+                # 試しのリクエストの結果が出るまでは他のリクエストを送らない
+                raise CircuitOpenError(host, 1.0)
+            state['trial'] = True
+
+    def record(self, host, success):
+        """リクエストの結果を記録"""
+        with self.lock:
+            state = self.host_state(host)
+            state['trial'] = False
+            if success:
+                if state['failures'] >= self.threshold:
+                    logger.info(f"{host} へのリクエストを再開します")
+                state['failures'] = 0
+                state['trips'] = 0
+                return
+            state['failures'] += 1
+            # 止めている間に返ってきた失敗では止め直さない
+            if state['failures'] >= self.threshold and time.monotonic() >= state['opened_until']:
+                state['trips'] += 1
+                seconds = min(self.max_open_seconds, self.open_seconds * 2 ** (state['trips'] - 1))
+                state['opened_until'] = time.monotonic() + seconds
+                logger.warning(f"{host} への失敗が{state['failures']}回続いたため、{seconds:.0f}秒間リクエストを止めます")
+
+    def describe(self):
+        """ホストごとの状態（計測結果に記録する）"""
+        with self.lock:
+            return {
+                host: {'failures': state['failures'], 'trips': state['trips'],
+                       'open': state['failures'] >= self.threshold}
+                for host, state in self.hosts.items()
+            }
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import logging
+import datetime
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+JOURNAL_FILE = Path(__file__).parent.parent / ".cache" / "run_journal.jsonl"
+
+
+class RunJournal:
+    """
+    実行の途中経過を記録する追記専用のジャーナル（JSON Lines）
+
+    1行目に発見した記事の一覧、以降に取得が終わった記事を1件ずつ追記し、その都度ディスクに書き出す。
+    実行が中断しても、再開時に取得済みの記事を復元して残りだけを取得できる。
+    """
+
+    def __init__(self, path=JOURNAL_FILE):
+        """
+        Args:
+            path (Path): ジャーナルファイルのパス
+        """
+        self.path = Path(path)
+        self.file = None
+        self.lock = threading.Lock()
+
+    def start(self, window, articles):
+        """
+        新しい実行のジャーナルを作成（前回のものは破棄する）
+
+        Args:
+            window (tuple): 検索対象の期間（再開時に同じ期間の実行かを確認する）
+            articles (list): 発見した記事のリスト
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.close()
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self._write({
+            'type': 'run',
+            'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'window': list(window),
+            'articles': articles
+        })
+
+    def replay(self, window):
+        """
+        前回の実行のジャーナルを読み込む（今回と同じ検索対象期間の実行なら追記を再開する）
+
+        書き込み途中で中断した最終行は破棄する。
+
+        Args:
+            window (tuple): 今回の検索対象の期間
+
+        Returns:
+            tuple: (発見した記事のリスト, {記事ID: 取得が終わった記事}, 今回と同じ期間の実行か)。
+                ジャーナルが無ければNone
+        """
+        if not self.path.exists():
+            logger.info("再開するジャーナルがありません")
+            return None
+
+        # 改行で終わっていない末尾は書き込み途中の行なので切り詰める（追記が同じ行に続かないようにする）
+        data = self.path.read_bytes()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            logger.warning("ジャーナルの書き込み途中の行を破棄します")
+            with open(self.path, 'r+b') as f:
+                f.truncate(complete)
+
+        header = None
+        finished = {}
+        for line in data[:complete].decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("ジャーナルの不完全な行を無視します")
+                continue
+            if record.get('type') == 'run':
+                header = record
+            elif record.get('type') == 'article' and 'error' not in record['article']:
+                finished[record['article']['id']] = record['article']
+
+        if header is None:
+            logger.info("ジャーナルに実行の記録が無いため、最初から実行します")
+            return None
+
+        if header.get('window') != list(window):
+            logger.info(
+                f"ジャーナルは別の検索対象期間（{'〜'.join(header.get('window') or [])}）の実行のものです: "
+                f"{len(header['articles'])}件中{len(finished)}件取得済み"
+            )
+            return header['articles'], finished, False
+
+        self.close()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        logger.info(f"ジャーナルから再開します: {len(header['articles'])}件中{len(finished)}件取得済み")
+        return header['articles'], finished, True
+
+    def append(self, article):
+        """取得が終わった記事を追記（複数のスレッドから呼び出せる）"""
+        self._write({'type': 'article', 'article': article})
+
+    def _write(self, record):
+        """1行書き込み、ディスクへの書き出しまで待つ"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def finish(self):
+        """実行が完了したのでジャーナルを削除"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+    def close(self):
+        """ジャーナルを閉じる（ファイルは残す）"""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
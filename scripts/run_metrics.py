@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import logging
+import datetime
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+DATA_DIR = Path(__file__).parent.parent / "data"
+REPORT_FILE = DATA_DIR / "run_metrics.json"  # 最新の実行の詳細（記事ごとの計測値を含む）
+HISTORY_FILE = DATA_DIR / "run_metrics.jsonl"  # 実行ごとの集計を1行ずつ追記
+PROMETHEUS_FILE = DATA_DIR / "run_metrics.prom"
+
+# Prometheusのテキスト形式でも出力するか（環境変数 NIKKEI_METRICS_PROMETHEUS=1 で有効）
+WRITE_PROMETHEUS = os.environ.get('NIKKEI_METRICS_PROMETHEUS', '') not in ('', '0')
+
+METRIC_PREFIX = "nikkei_xtrend"
+
+
+def percentile(values, ratio):
+    """最近傍順位法によるパーセンタイル"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(ratio * len(ordered)) - 1))]
+
+
+def distribution(values):
+    """所要時間の分布（秒）"""
+    if not values:
+        return {'count': 0, 'total': 0}
+    return {
+        'count': len(values),
+        'total': round(sum(values), 3),
+        'mean': round(sum(values) / len(values), 3),
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+        'max': max(values)
+    }
+
+
+class ArticleMetrics:
+    """記事1件の取得にかかった時間・転送量・回数"""
+
+    def __init__(self, article):
+        """
+        Args:
+            article (dict): 記事情報
+        """
+        self.article_id = article['id']
+        self.url = article['url']
+        self.started = time.monotonic()
+        self.steps = {}
+        self.counters = Counter()
+        self.fetch_path = None
+        self.error = None
+        self.total = None
+
+    @contextmanager
+    def step(self, name):
+        """ステップの所要時間を計測（同じステップを複数回実行した場合は合計する）"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.steps[name] = round(self.steps.get(name, 0) + time.monotonic() - started, 3)
+
+    def add(self, name, value=1):
+        """バイト数や回数を加算"""
+        self.counters[name] += value
+
+    def finish(self, fetch_path=None, error=None):
+        """記事の取得が終わった時点で全体の所要時間を確定する"""
+        self.fetch_path = fetch_path
+        self.error = error
+        self.total = round(time.monotonic() - self.started, 3)
+
+    def to_dict(self):
+        return {
+            'id': self.article_id,
+            'url': self.url,
+            'fetch_path': self.fetch_path,
+            'error': self.error,
+            'total': self.total,
+            'steps': self.steps,
+            'counters': dict(self.counters)
+        }
+
+
+class RunMetrics:
+    """
+    1回の実行の計測値を集め、JSON/JSONL（必要ならPrometheusのテキスト形式）で出力する
+
+    実行全体のステップ（ログイン、記事検索、フィード生成など）と、記事ごとのステップ
+    （ページ読み込み、ボタン展開、抽出、画像取得、Markdown保存）を記録する。複数のスレッドから使用できる。
+    """
+
+    def __init__(self):
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.started = time.monotonic()
+        self.stages = {}
+        self.counters = Counter()
+        self.articles = []
+        self.status = 'running'
+        self.info = {}  # 実行時の設定など、数値以外の付加情報
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """実行全体のステップの所要時間を計測"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = round(time.monotonic() - started, 3)
+            with self.lock:
+                self.stages[name] = round(self.stages.get(name, 0) + elapsed, 3)
+            logger.info(f"ステップ「{name}」: {elapsed:.2f}秒")
+
+    def record_once(self, name, seconds):
+        """最初の1回だけ所要時間を記録（起動から最初のページ読み込みまでの時間など）"""
+        with self.lock:
+            if name in self.stages:
+                return
+            self.stages[name] = round(seconds, 3)
+        logger.info(f"ステップ「{name}」: {seconds:.2f}秒")
+
+    def add(self, name, value=1):
+        """実行全体のバイト数や回数を加算"""
+        with self.lock:
+            self.counters[name] += value
+
+    def article(self, article):
+        """
+        記事1件の計測を開始
+
+        Args:
+            article (dict): 記事情報
+
+        Returns:
+            ArticleMetrics: 記事の計測値（取得を行うスレッドだけが更新する）
+        """
+        metrics = ArticleMetrics(article)
+        with self.lock:
+            self.articles.append(metrics)
+        return metrics
+
+    def summary(self):
+        """
+        実行全体の集計
+
+        Returns:
+            dict: 所要時間・ステップごとの分布・記事の件数・カウンターの合計
+        """
+        with self.lock:
+            articles = list(self.articles)
+            stages = dict(self.stages)
+            counters = Counter(self.counters)
+
+        steps = {}
+        for article in articles:
+            for name, seconds in article.steps.items():
+                steps.setdefault(name, []).append(seconds)
+            counters.update(article.counters)
+
+        totals = [a.total for a in articles if a.total is not None]
+        paths = Counter(a.fetch_path for a in articles if a.fetch_path)
+        errors = sum(1 for a in articles if a.error)
+        duration = time.monotonic() - self.started
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration': round(duration, 3),
+            'status': self.status,
+            'info': self.info,
+            'articles': len(articles),
+            'errors': errors,
+            'articles_per_minute': round((len(articles) - errors) / duration * 60, 2) if duration else None,
+            'stages': stages,
+            'article_total': distribution(totals),
+            'article_steps': {name: distribution(values) for name, values in steps.items()},
+            'fetch_paths': dict(paths),
+            'counters': dict(counters)
+        }
+
+    def write(self, report_file=REPORT_FILE, history_file=HISTORY_FILE, prometheus_file=None):
+        """
+        計測結果を出力
+
+        Args:
+            report_file (Path): 最新の実行の詳細（記事ごとの計測値を含むJSON）
+            history_file (Path): 実行ごとの集計を追記するJSONL
+            prometheus_file (Path): Prometheusのテキスト形式の出力先（省略時、WRITE_PROMETHEUSが有効ならPROMETHEUS_FILE）
+
+        Returns:
+            dict: 実行全体の集計
+        """
+        summary = self.summary()
+        with self.lock:
+            articles = [a.to_dict() for a in self.articles]
+
+        write_text_atomic(report_file, json.dumps(dict(summary, article_metrics=articles), ensure_ascii=False, indent=2))
+        with open(history_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+
+        if prometheus_file is None and WRITE_PROMETHEUS:
+            prometheus_file = PROMETHEUS_FILE
+        if prometheus_file:
+            write_text_atomic(prometheus_file, to_prometheus(summary))
+
+        logger.info(
+            f"計測結果を保存しました: {report_file}（全体 {summary['duration']:.1f}秒、"
+            f"{summary['articles']}件、{summary['articles_per_minute']}件/分）"
+        )
+        return summary
+
+
+def write_text_atomic(path, text):
+    """一時ファイルに書き出してから置き換える"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def to_prometheus(summary):
+    """
+    集計をPrometheusのテキスト形式（node_exporterのtextfileコレクター向け）に変換
+
+    Args:
+        summary (dict): RunMetrics.summary の戻り値
+
+    Returns:
+        str: テキスト形式のメトリクス
+    """
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        full_name = f"{METRIC_PREFIX}_{name}"
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        for labels, value in samples:
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+            lines.append(f"{full_name}{{{label_text}}} {value}" if label_text else f"{full_name} {value}")
+
+    metric('run_duration_seconds', 'gauge', "Wall-clock duration of the run",
+           [({}, summary['duration'])])
+    metric('run_articles', 'gauge', "Articles processed in the run",
+           [({'result': 'ok'}, summary['articles'] - summary['errors']),
+            ({'result': 'error'}, summary['errors'])])
+    metric('run_stage_seconds', 'gauge', "Duration of each run stage",
+           [({'stage': name}, seconds) for name, seconds in summary['stages'].items()])
+    metric('article_step_seconds_sum', 'gauge', "Total time spent in each per-article step",
+           [({'step': name}, dist['total']) for name, dist in summary['article_steps'].items()])
+    metric('article_step_seconds_count', 'gauge', "Number of articles that ran each step",
+           [({'step': name}, dist['count']) for name, dist in summary['article_steps'].items()])
+    metric('article_fetch_path', 'gauge', "Articles fetched by each path",
+           [({'path': path}, count) for path, count in summary['fetch_paths'].items()])
+    metric('run_counter', 'gauge', "Bytes and counts recorded during the run",
+           [({'name': name}, value) for name, value in sorted(summary['counters'].items())])
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import json
+import hashlib
+import logging
+import unicodedata
+from array import array
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# 定数
+ROOT_DIR = Path(__file__).parent.parent
+SEARCH_DIR = ROOT_DIR / "docs" / "search"
+STATE_FILE = ROOT_DIR / "data" / "search_index.json"
+MANIFEST_NAME = "manifest.json"
+
+# 索引の形式を変更した場合はこの値を上げて作り直す
+INDEX_VERSION = 3
+
+# 転置索引を分割するシャード数の上限（検索時は検索語のシャードだけを読み込む）
+SHARD_COUNT = int(os.environ.get('NIKKEI_SEARCH_SHARDS', '1024'))
+POSTINGS_PER_SHARD = 4096  # セグメントのシャード数は、シャード1つあたりの索引語と文書の組がこの数程度になるように決める
+DOCS_PER_CHUNK = 200  # 記事情報（タイトル・URL・日付）のファイル1つあたりの記事数
+REBUILD_RATIO = 0.2  # 削除済みの文書がこの割合を超えたら作り直す
+
+WORD_PATTERN = re.compile(r'[^\W_]+')
+IMAGE_LINE_PATTERN = re.compile(r'^!\[.*?\]\(.*?\)$', re.MULTILINE)
+META_LINE_PATTERN = re.compile(r'^\*\*.*?\*\*:.*?$', re.MULTILINE)
+
+
+def normalize(text):
+    """全角・半角と大文字・小文字を揃える（クライアント側の normalize と同じ処理）"""
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def tokenize(text):
+    """
+    文字bigramに分割（日本語は単語の区切りが無いため、連続する2文字を索引語にする）
+
+    Args:
+        text (str): 本文
+
+    Returns:
+        set: 索引語（1文字だけの語はその1文字）
+    """
+    terms = set()
+    for word in WORD_PATTERN.findall(normalize(text)):
+        if len(word) == 1:
+            terms.add(word)
+        else:
+            terms.update(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+def document_version(article, markdown):
+    """
+    索引した記事の内容を表す値（変わった記事だけを索引し直す）
+
+    ファイルの更新時刻はチェックアウトのたびに変わるため使わず、Markdownとタイトル・URL・日付のハッシュにする。
+
+    Args:
+        article (dict): 記事情報
+        markdown (str): 記事のMarkdown
+
+    Returns:
+        str: ハッシュ
+    """
+    data = json.dumps([article['title'], article['url'], article.get('date', ''), markdown], ensure_ascii=False)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+def term_shard(term, shard_count=SHARD_COUNT):
+    """索引語のシャード番号（FNV-1a。クライアント側の termShard と同じ計算）"""
+    h = 0x811c9dc5
+    for ch in term:
+        h = ((h ^ ord(ch)) * 0x01000193) & 0xffffffff
+    return h % shard_count
+
+
+def segment_shards(postings, shard_count=SHARD_COUNT):
+    """
+    セグメントのシャード数（索引語と文書の組の数に比例させた2の累乗。上限は shard_count）
+
+    Args:
+        postings (int): セグメントに含まれる索引語と文書の組の数
+        shard_count (int): シャード数の上限
+
+    Returns:
+        int: シャード数
+    """
+    count = 1
+    while count < shard_count and count * POSTINGS_PER_SHARD < postings:
+        count *= 2
+    return count
+
+
+def article_text(md_content):
+    """Markdownから検索対象の本文を取り出す（画像・メタデータ行と見出しの記号を除く）"""
+    text = IMAGE_LINE_PATTERN.sub('', md_content)
+    text = META_LINE_PATTERN.sub('', text)
+    return re.sub(r'^#+ ', '', text, flags=re.MULTILINE)
+
+
+def encode_postings(doc_ids):
+    """文書番号のリストを差分で表す（JSONを小さくする）"""
+    previous = 0
+    deltas = []
+    for doc_id in doc_ids:
+        deltas.append(doc_id - previous)
+        previous = doc_id
+    return deltas
+
+
+def decode_postings(deltas):
+    """encode_postings の逆変換"""
+    doc_id = 0
+    doc_ids = []
+    for delta in deltas:
+        doc_id += delta
+        doc_ids.append(doc_id)
+    return doc_ids
+
+
+class SearchIndex:
+    """
+    記事の全文検索用の転置索引を、docs/ に静的なJSONファイルとして出力する
+
+    索引語（文字bigram）をハッシュでシャードに分け、シャードと記事情報はファイル名に内容のハッシュを含めて
+    書き出す（変わらないファイルはそのまま残り、ブラウザのキャッシュも有効なまま）。
+    追加・変更された記事は新しいセグメント（その記事だけの小さな転置索引）として加え、直前のセグメントが
+    新しいセグメント以下の大きさになったら統合する。既存の大きなセグメントは書き換えないため、
+    毎日の更新で書き出すファイルは追加した記事の量に比例する。変更・削除された記事は削除済みの印を付ける。
+    """
+
+    def __init__(self, out_dir=SEARCH_DIR, state_file=STATE_FILE, shard_count=SHARD_COUNT):
+        """
+        Args:
+            out_dir (Path): 索引の出力先
+            state_file (Path): 索引済みの記事を記録するファイル
+            shard_count (int): シャード数
+        """
+        self.out_dir = Path(out_dir)
+        self.state_file = Path(state_file)
+        self.shard_count = shard_count
+        self.state = self.load_state()
+        self.manifest = self.load_json(self.out_dir / MANIFEST_NAME) or {}
+
+    def load_json(self, path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_state(self):
+        """索引済みの記事の記録（形式やシャード数が異なれば空）"""
+        state = self.load_json(self.state_file)
+        if (not state or state.get('version') != INDEX_VERSION
+                or state.get('shard_count') != self.shard_count):
+            return None
+        return state
+
+    def empty_state(self):
+        return {
+            'version': INDEX_VERSION,
+            'shard_count': self.shard_count,
+            'next_doc': 0,
+            'removed': 0,
+            'docs': {}  # 記事ID→[文書番号, 索引した内容のハッシュ（document_version）]
+        }
+
+    def update(self, articles, articles_dir):
+        """
+        索引を更新
+
+        Args:
+            articles (list): 検索対象の記事（Markdownファイルがあるもの）
+            articles_dir (Path): Markdownファイルのディレクトリ
+
+        Returns:
+            dict: 追加・削除した文書数と、書き出したファイル数
+        """
+        articles_dir = Path(articles_dir)
+        texts = {}
+        versions = {}
+        for article in articles:
+            with open(articles_dir / f"{article['id']}.md", 'r', encoding='utf-8') as f:
+                texts[article['id']] = f.read()
+            versions[article['id']] = document_version(article, texts[article['id']])
+
+        state = self.state
+        manifest_ok = self.manifest.get('version') == INDEX_VERSION
+        changed = [] if state else list(versions)
+        removed_ids = []
+        if state and manifest_ok:
+            for article_id, (doc_id, version) in state['docs'].items():
+                if versions.get(article_id) != version:
+                    removed_ids.append(doc_id)
+            changed = [a for a in versions if state['docs'].get(a, [None, None])[1] != versions[a]]
+
+        # 削除済みの文書が多くなったら（または記録が無ければ）作り直す
+        rebuild = not state or not manifest_ok
+        if state and not rebuild:
+            live = len(state['docs']) - len(removed_ids) + len(changed)
+            rebuild = (state['removed'] + len(removed_ids)) > REBUILD_RATIO * max(1, live)
+        if rebuild:
+            state = self.empty_state()
+            self.manifest = {}
+            removed_ids = []
+            changed = list(versions)
+        elif not changed and not removed_ids:
+            logger.info("検索索引: 変更なし")
+            return {'added': 0, 'removed': 0, 'files': 0, 'rebuild': False}
+
+        # 変更・削除された記事は記録から外し、記事情報に削除済みの印を付ける
+        removed = set(removed_ids)
+        state['docs'] = {a: v for a, v in state['docs'].items() if v[0] not in removed}
+        state['removed'] += len(removed_ids)
+
+        # 追加する記事に文書番号を振り、索引語ごとの文書番号を集める（古い記事から順に番号を振る）
+        by_id = {article['id']: article for article in articles}
+        new_docs = sorted((by_id[a] for a in changed), key=lambda a: (a.get('date', ''), a['id']))
+        postings = {}
+        doc_info = {}
+        for article in new_docs:
+            doc_id = state['next_doc']
+            state['next_doc'] += 1
+            state['docs'][article['id']] = [doc_id, versions[article['id']]]
+            doc_info[doc_id] = [article['title'], article['url'], article.get('date', '')]
+
+            text = article['title'] + "\n" + article_text(texts[article['id']])
+            for term in tokenize(text):
+                postings.setdefault(term, array('I')).append(doc_id)
+
+        files = self.write_files(postings, doc_info, removed, rebuild)
+        self.save_state(state)
+
+        logger.info(
+            f"検索索引: {len(new_docs)}件追加、{len(removed_ids)}件削除、{files}ファイル書き出し"
+            f"{'（作り直し）' if rebuild else ''}"
+        )
+        return {'added': len(new_docs), 'removed': len(removed_ids), 'files': files, 'rebuild': rebuild}
+
+    def write_files(self, postings, doc_info, removed, rebuild):
+        """
+        追加した記事のセグメントと変更のあった記事情報のファイルを書き出し、マニフェストを更新
+
+        Returns:
+            int: 書き出したファイル数
+        """
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        segments = [] if rebuild else list(self.manifest.get('segments', []))
+        chunks = {} if rebuild else dict(self.manifest.get('docs', {}))
+        written = 0
+
+        if postings:
+            start = min(doc_info)
+            count = sum(len(doc_ids) for doc_ids in postings.values())
+            # 直前のセグメントが新しいセグメント以下の大きさなら統合する（セグメント数は記事数の対数程度に収まる）
+            while segments and segments[-1]['postings'] <= count:
+                older = segments.pop()
+                terms = self.load_segment(older)
+                for term, doc_ids in postings.items():
+                    # 新しい文書番号は既存のものより大きいため、後ろに続けられる
+                    terms.setdefault(term, []).extend(doc_ids)
+                postings = terms
+                start = older['start']
+                count += older['postings']
+            segment, files = self.write_segment(start, postings, count)
+            segments.append(segment)
+            written += files
+
+        touched = {doc_id // DOCS_PER_CHUNK for doc_id in list(doc_info) + list(removed)}
+        for chunk_id in touched:
+            key = str(chunk_id)
+            entries = []
+            if key in chunks:
+                entries = self.load_json(self.out_dir / chunks[key]) or []
+            entries += [None] * (DOCS_PER_CHUNK - len(entries))
+            for doc_id in range(chunk_id * DOCS_PER_CHUNK, (chunk_id + 1) * DOCS_PER_CHUNK):
+                if doc_id in doc_info:
+                    entries[doc_id % DOCS_PER_CHUNK] = doc_info[doc_id]
+                elif doc_id in removed:
+                    entries[doc_id % DOCS_PER_CHUNK] = None
+            while entries and entries[-1] is None:
+                entries.pop()
+            chunks[key] = self.write_hashed(f"d{chunk_id}", entries)
+            written += 1
+
+        self.manifest = {
+            'version': INDEX_VERSION,
+            'docs_per_chunk': DOCS_PER_CHUNK,
+            'segments': segments,
+            'docs': chunks
+        }
+        with open(self.out_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, separators=(',', ':'), sort_keys=True)
+
+        # マニフェストから参照されなくなったファイルを削除
+        referenced = {name for segment in segments for name in segment['shards'].values()}
+        referenced |= set(chunks.values()) | {MANIFEST_NAME}
+        for path in self.out_dir.glob("*.json"):
+            if path.name not in referenced:
+                path.unlink()
+        return written
+
+    def load_segment(self, segment):
+        """セグメントの全シャードを読み込む（索引語→文書番号のリスト）"""
+        terms = {}
+        for name in segment['shards'].values():
+            for term, deltas in (self.load_json(self.out_dir / name) or {}).items():
+                terms[term] = decode_postings(deltas)
+        return terms
+
+    def write_segment(self, start, postings, count):
+        """
+        セグメントをシャードに分けて書き出す
+
+        Args:
+            start (int): セグメントの最初の文書番号
+            postings (dict): 索引語→文書番号のリスト（昇順）
+            count (int): 索引語と文書の組の数
+
+        Returns:
+            tuple: (マニフェストに記録するセグメントの情報, 書き出したファイル数)
+        """
+        shard_count = segment_shards(count, self.shard_count)
+        shards = {}
+        for term, doc_ids in postings.items():
+            shards.setdefault(term_shard(term, shard_count), {})[term] = encode_postings(doc_ids)
+        names = {str(shard_id): self.write_hashed(f"s{start}-{shard_id:03x}", data)
+                 for shard_id, data in shards.items()}
+        segment = {'start': start, 'postings': count, 'shard_count': shard_count, 'shards': names}
+        return segment, len(names)
+
+    def write_hashed(self, prefix, data):
+        """内容のハッシュを含むファイル名で書き出す（同じ内容のファイルがあれば書き出さない）"""
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        name = f"{prefix}.{hashlib.sha1(text.encode('utf-8')).hexdigest()[:10]}.json"
+        path = self.out_dir / name
+        if not path.exists():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return name
+
+    def save_state(self, state):
+        """索引済みの記事の記録を保存"""
+        self.state = state
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_file)
+
+    def search(self, query, limit=20):
+        """
+        索引を検索（クライアント側と同じ手順。確認・ベンチマーク用）
+
+        Args:
+            query (str): 検索語
+            limit (int): 最大件数
+
+        Returns:
+            list: [タイトル, URL, 日付] のリスト（新しく索引に加えた順）
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        result = None
+        shards = {}
+        for term in terms:
+            doc_ids = set()
+            for segment in self.manifest['segments']:
+                name = segment['shards'].get(str(term_shard(term, segment['shard_count'])))
+                if not name:
+                    continue
+                if name not in shards:
+                    shards[name] = self.load_json(self.out_dir / name) or {}
+                doc_ids.update(decode_postings(shards[name].get(term, [])))
+            result = doc_ids if result is None else result & doc_ids
+            if not result:
+                return []
+
+        found = []
+        chunks = {}
+        for doc_id in sorted(result, reverse=True):
+            key = str(doc_id // DOCS_PER_CHUNK)
+            if key not in chunks:
+                chunks[key] = self.load_json(self.out_dir / self.manifest['docs'][key]) or []
+            entries = chunks[key]
+            index = doc_id % DOCS_PER_CHUNK
+            if index < len(entries) and entries[index]:
+                found.append(entries[index])
+                if len(found) >= limit:
+                    break
+        return found
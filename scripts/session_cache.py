@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+from pathlib import Path
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # cryptographyが無い環境ではキャッシュを無効にする
+    Fernet = None
+    InvalidToken = Exception
+
+logger = logging.getLogger(__name__)
+
+# 定数
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
+SESSION_CACHE_FILE = CACHE_DIR / "session.bin"
+# キャッシュしたセッションの有効期間（秒）。1日1回の実行でも次の実行まで残るよう1日より長くし、
+# セッションが実際に有効かどうかは再利用時にサーバーで確認する
+SESSION_TTL = float(os.environ.get('NIKKEI_SESSION_TTL_HOURS', '168')) * 60 * 60
+KEY_SALT = b"nikkei-xt-rss-session"
+KEY_ITERATIONS = 200000
+
+
+class SessionCache:
+    """ログイン済みのCookieを暗号化してファイルに保存し、次回以降の実行で再利用する"""
+
+    def __init__(self, secret, path=SESSION_CACHE_FILE, ttl=SESSION_TTL):
+        """
+        セッションキャッシュの初期化
+
+        Args:
+            secret (str): 暗号化キーの元になる秘密の文字列
+            path (Path): キャッシュファイルのパス
+            ttl (int): 有効期間（秒）
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.fernet = None
+
+        if Fernet is None:
+            logger.warning("cryptographyがインストールされていないため、セッションキャッシュは使用しません")
+        elif not secret:
+            logger.warning("暗号化キーが無いため、セッションキャッシュは使用しません")
+        else:
+            key = hashlib.pbkdf2_hmac('sha256', secret.encode(), KEY_SALT, KEY_ITERATIONS)
+            self.fernet = Fernet(base64.urlsafe_b64encode(key))
+
+    @property
+    def enabled(self):
+        """キャッシュが使用可能かどうか"""
+        return self.fernet is not None
+
+    def load(self):
+        """
+        キャッシュからCookieを読み込む
+
+        Returns:
+            list: Cookie情報のリスト（無効・期限切れの場合はNone）
+        """
+        if not self.enabled or not self.path.exists():
+            return None
+
+        try:
+            data = json.loads(self.fernet.decrypt(self.path.read_bytes()))
+            if not isinstance(data, dict) or not isinstance(data.get('cookies'), list):
+                raise ValueError("Cookieが含まれていません")
+        except (InvalidToken, ValueError) as e:
+            logger.warning(f"セッションキャッシュを読み込めませんでした: {e}")
+            self.clear()
+            return None
+
+        if data.get('expires_at', 0) <= time.time():
+            logger.info("セッションキャッシュの有効期限が切れています")
+            self.clear()
+            return None
+
+        # 期限切れのCookieは設定しても意味が無いので除外する
+        return [c for c in data['cookies'] if not c.get('expiry') or c['expiry'] > time.time()]
+
+    def save(self, cookies):
+        """
+        Cookieを暗号化して保存
+
+        Args:
+            cookies (list): Cookie情報のリスト
+        """
+        if not self.enabled:
+            return
+
+        now = time.time()
+        data = {'saved_at': now, 'expires_at': now + self.ttl, 'cookies': cookies}
+        token = self.fernet.encrypt(json.dumps(data).encode())
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(token)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, self.path)
+        logger.info(f"セッションをキャッシュに保存しました: {self.path}")
+
+    def clear(self):
+        """キャッシュファイルを削除"""
+        if self.path.exists():
+            self.path.unlink()
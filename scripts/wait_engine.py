@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+logger = logging.getLogger(__name__)
+
+# 各待機ステップのタイムアウト（秒）
+WAIT_TIMEOUTS = {
+    'document_ready': 15,
+    'page_settled': 15,
+    'button_expanded': 10,
+}
+
+# DOMやネットワークが変化しない状態がこの秒数続いたら「安定」とみなす
+QUIET_PERIOD = 0.5
+
+# 状態確認の間隔（秒）
+POLL_INTERVAL = 0.1
+
+# ブラウザ内で待機するスクリプト
+# 読み込み完了後、DOMの変更とリソースの読み込みがQUIET_PERIODの間止まり、
+# 指定した要素（クリックしたボタンなど）が消えたら終了する。状態確認のための通信が不要になる。
+SETTLE_SCRIPT = """
+const [quietMs, timeoutMs, element] = arguments;
+const done = arguments[arguments.length - 1];
+const start = performance.now();
+let lastChange = start;
+let resources = performance.getEntriesByType('resource').length;
+const observer = new MutationObserver(() => { lastChange = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+
+function gone() {
+    return !element || !element.isConnected || element.offsetParent === null;
+}
+
+(function check() {
+    const now = performance.now();
+    const count = performance.getEntriesByType('resource').length;
+    if (count !== resources) {
+        resources = count;
+        lastChange = now;
+    }
+    const settled = document.readyState === 'complete' && gone() && now - lastChange >= quietMs;
+    if (settled || now - start >= timeoutMs) {
+        observer.disconnect();
+        done(!settled);
+        return;
+    }
+    setTimeout(check, 50);
+})();
+"""
+
+
+class WaitEngine:
+    """固定時間のsleepの代わりに、ページの状態を見て待機を終える"""
+
+    def __init__(self, driver, timeouts=None):
+        """
+        待機エンジンの初期化
+
+        Args:
+            driver (webdriver): 対象のWebDriverインスタンス
+            timeouts (dict): ステップごとのタイムアウト（WAIT_TIMEOUTSを上書き）
+        """
+        self.driver = driver
+        self.timeouts = dict(WAIT_TIMEOUTS, **(timeouts or {}))
+        self.timings = []
+
+        # ブラウザ内での待機がタイムアウトより先に打ち切られないようにする
+        self.driver.set_script_timeout(max(self.timeouts.values()) + 5)
+
+    def reset(self):
+        """記録した待機時間をクリア"""
+        self.timings = []
+
+    def summary(self):
+        """
+        ステップごとの待機時間の合計を取得
+
+        Returns:
+            dict: {ステップ名: {'count', 'total', 'timeouts'}}
+        """
+        result = {}
+        for timing in self.timings:
+            entry = result.setdefault(timing['step'], {'count': 0, 'total': 0.0, 'timeouts': 0})
+            entry['count'] += 1
+            entry['total'] = round(entry['total'] + timing['elapsed'], 3)
+            if timing['timed_out']:
+                entry['timeouts'] += 1
+        return result
+
+    def _record(self, step, started, timed_out):
+        """待機時間を記録"""
+        elapsed = time.monotonic() - started
+        self.timings.append({'step': step, 'elapsed': round(elapsed, 3), 'timed_out': timed_out})
+        if timed_out:
+            logger.warning(f"待機ステップ「{step}」が{self.timeouts[step]}秒でタイムアウトしました")
+        else:
+            logger.debug(f"待機ステップ「{step}」: {elapsed:.2f}秒")
+        return not timed_out
+
+    def _until(self, step, condition):
+        """WebDriverWaitで条件が満たされるまで待機"""
+        started = time.monotonic()
+        try:
+            WebDriverWait(self.driver, self.timeouts[step], poll_frequency=POLL_INTERVAL).until(condition)
+            return self._record(step, started, False)
+        except TimeoutException:
+            return self._record(step, started, True)
+
+    def document_ready(self):
+        """document.readyStateがcompleteになるまで待機"""
+        return self._until(
+            'document_ready',
+            lambda d: d.execute_script("return document.readyState") == 'complete'
+        )
+
+    def settle(self, step='page_settled', element=None):
+        """
+        ブラウザ内で、読み込み完了・DOM安定・ネットワーク停止（・要素の消失）をまとめて待機
+
+        WebDriverとの通信は1回で済む。
+
+        Args:
+            step (str): 記録するステップ名（タイムアウトの設定にも使う）
+            element (WebElement): 消えるのを待つ要素
+        """
+        started = time.monotonic()
+        timed_out = self.driver.execute_async_script(
+            SETTLE_SCRIPT, int(QUIET_PERIOD * 1000), int(self.timeouts[step] * 1000), element
+        )
+        return self._record(step, started, bool(timed_out))
+
+    def page_settled(self):
+        """ページの読み込み完了・DOM安定・ネットワーク停止をまとめて待機"""
+        return self.settle('page_settled')
+
+    def expanded(self, button):
+        """クリックしたボタンが消え、展開された本文の描画が落ち着くまで待機"""
+        try:
+            return self.settle('button_expanded', element=button)
+        except StaleElementReferenceException:
+            # クリックでボタンが取り除かれていると、要素を引数として渡せない（消えたものとして描画だけを待つ）
+            return self.settle('button_expanded')
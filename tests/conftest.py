@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+from pathlib import Path
+
+# scripts/ のモジュールは同じディレクトリのモジュールを直接 import するため、パスに加える
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+
+class FakeClock:
+    """time.monotonic の代わりに使う、進め方を指定できる時計"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
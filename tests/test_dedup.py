@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from dedup import MAX_DISTANCE, SIMHASH_BITS, SimHashIndex, canonicalize_url, hamming_distance, simhash
+
+WORDS = ["日経", "クロストレンド", "マーケティング", "消費者", "データ", "戦略", "店舗", "ブランド", "顧客体験", "売り上げ",
+         "新商品", "調査", "若年層", "サブスクリプション", "広告", "物流", "決済", "会員", "地域", "価格"]
+
+
+def article_text(seed, sentences=40):
+    rng = random.Random(seed)
+    return "".join("、".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))) + "。" for _ in range(sentences))
+
+
+@pytest.mark.parametrize('url, expected', [
+    ("http://XTREND.nikkei.com/atcl/contents/casestudy/00012/00001/",
+     "https://xtrend.nikkei.com/atcl/contents/casestudy/00012/00001/"),
+    ("https://xtrend.nikkei.com:443/atcl/contents/1/#section2", "https://xtrend.nikkei.com/atcl/contents/1/"),
+    ("https://xtrend.nikkei.com/atcl/contents/1/?i_cid=nbpnxr_top&utm_source=x&n_cid=abc",
+     "https://xtrend.nikkei.com/atcl/contents/1/"),
+    ("https://xtrend.nikkei.com/atcl/contents/1/?P=2", "https://xtrend.nikkei.com/atcl/contents/1/"),
+    ("https://xtrend.nikkei.com/atcl/contents/1/index.html", "https://xtrend.nikkei.com/atcl/contents/1/"),
+    ("https://xtrend.nikkei.com//atcl//contents/1/", "https://xtrend.nikkei.com/atcl/contents/1/"),
+    ("https://xtrend.nikkei.com/atcl/list/?b=2&a=1", "https://xtrend.nikkei.com/atcl/list/?a=1&b=2"),
+    ("http://127.0.0.1:8080/atcl/contents/1/", "https://127.0.0.1:8080/atcl/contents/1/"),
+])
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_short_text_has_no_simhash():
+    assert simhash("会員限定の記事です。ログインしてください。") is None
+
+
+def test_simhash_is_deterministic():
+    text = article_text(1)
+    assert simhash(text) == simhash(text)
+    assert 0 <= simhash(text) < 1 << SIMHASH_BITS
+
+
+def test_simhash_ignores_width_case_and_spaces():
+    text = article_text(2)
+    assert simhash(text) == simhash(" ".join(text).replace("、", "､"))
+
+
+def test_near_duplicate_is_close_and_different_text_is_far():
+    original = article_text(3)
+    edited = original.replace("。", "！", 2) + "（追記）本記事は更新しました。"
+    assert hamming_distance(simhash(original), simhash(edited)) <= MAX_DISTANCE
+    assert hamming_distance(simhash(original), simhash(article_text(4))) > MAX_DISTANCE * 3
+
+
+def test_index_finds_values_within_max_distance():
+    index = SimHashIndex(max_distance=3)
+    rng = random.Random(0)
+    base = rng.getrandbits(SIMHASH_BITS)
+    index.add('a', base)
+    index.add('b', rng.getrandbits(SIMHASH_BITS))
+
+    # 3ビットが異なる値は、どの区画にまたがっていても見つかる
+    for bits in ([0, 1, 2], [0, 20, 40], [15, 31, 63], [5, 37, 50]):
+        value = base
+        for bit in bits:
+            value ^= 1 << bit
+        assert index.find(value) == 'a'
+
+    far = base ^ 0b1111
+    assert index.find(far) is None
+
+
+def test_index_excludes_self_and_prefers_closest():
+    index = SimHashIndex(max_distance=3)
+    index.add('a', 0)
+    index.add('b', 0b1)
+    assert index.find(0, exclude='a') == 'b'
+    assert index.find(0b11) == 'b'
+    # 同じ距離なら記事IDの小さい方
+    index.add('a2', 0b10)
+    assert index.find(0b11) == 'a2'
+    assert index.find(0b11, exclude='a2') == 'b'
+
+
+def test_index_remove_and_replace():
+    index = SimHashIndex(max_distance=3)
+    index.add('a', 0)
+    index.add('a', (1 << 63) | 0xFFFF)
+    assert len(index) == 1
+    assert index.find(0) is None
+    index.remove('a')
+    index.remove('missing')
+    assert len(index) == 0
+    assert all(not table for table in index.tables)
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+
+import pytest
+
+import generate_rss
+from feed_pages import FeedPages, fingerprint
+from render_cache import RenderCache
+
+FEED_SIZE = 5
+PAGE_SIZE = 4
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    """出力先と記事のMarkdownを一時ディレクトリにしたフィードの生成"""
+    docs_dir = tmp_path / "docs"
+    articles_dir = tmp_path / "articles"
+    articles_dir.mkdir()
+    monkeypatch.setattr(generate_rss, 'DOCS_DIR', docs_dir)
+    monkeypatch.setattr(generate_rss, 'RSS_FILE', docs_dir / "feed.xml")
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_DIR', docs_dir / "archive")
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGES_FILE', tmp_path / "archive_pages.json")
+    monkeypatch.setattr(generate_rss, 'ARTICLES_DIR', articles_dir)
+    monkeypatch.setattr(generate_rss, 'FEED_SIZE', FEED_SIZE)
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGE_SIZE', PAGE_SIZE)
+    return tmp_path
+
+
+def article_date(number):
+    return f"2026.{number // 28 + 1:02d}.{number % 28 + 1:02d}"
+
+
+def make_article(articles_dir, number, date=None):
+    article_id = f"a{number:03d}"
+    (articles_dir / f"{article_id}.md").write_text(f"# 記事{number}\n\n本文{number}\n", encoding='utf-8')
+    return {'id': article_id, 'title': f"記事{number}", 'url': f"https://example.com/{number}/",
+            'date': date or article_date(number)}
+
+
+def make_articles(articles_dir, count):
+    """新しい順の記事（番号が大きいほど新しい）"""
+    return [make_article(articles_dir, number) for number in range(count)][::-1]
+
+
+def sort_articles(articles):
+    """generate_rss_feed と同じ順（新しい順）に並べる"""
+    return sorted(articles, key=lambda a: (a.get('date', ''), a['id']), reverse=True)
+
+
+def numbered(count):
+    """番号をIDにした新しい順の記事"""
+    return [{'id': number} for number in range(count)][::-1]
+
+
+def ids(articles):
+    return [article['id'] for article in articles]
+
+
+def write_feeds(tmp_path, articles):
+    """最新のフィードとアーカイブを書き出す"""
+    pages = FeedPages(path=tmp_path / "feed_pages.json", root=generate_rss.DOCS_DIR)
+    items = {a['id']: fingerprint(a['id']) for a in articles}
+    generate_rss.write_main_and_archive_feeds(articles, items, RenderCache(tmp_path / "render_cache.json"), pages)
+    pages.remove_stale(generate_rss.ARCHIVE_DIR)
+    pages.save()
+    return pages
+
+
+def feed_titles(path):
+    return re.findall(r'<item>\s*<title>(.*?)</title>', path.read_text(encoding='utf-8'))
+
+
+def without_build_date(path):
+    return re.sub(r'<lastBuildDate>.*?</lastBuildDate>', '', path.read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('count, latest, pages', [
+    (0, 0, 0), (3, 3, 0), (5, 5, 0), (8, 8, 0), (9, 5, 1), (12, 8, 1), (13, 5, 2), (30, 6, 6),
+])
+def test_split_archive_publishes_only_full_pages(monkeypatch, count, latest, pages):
+    monkeypatch.setattr(generate_rss, 'FEED_SIZE', FEED_SIZE)
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGE_SIZE', PAGE_SIZE)
+    feed, chunks, archive_pages = generate_rss.split_archive(numbered(count))
+    assert len(feed) == latest
+    assert FEED_SIZE <= len(feed) < FEED_SIZE + PAGE_SIZE or count < FEED_SIZE
+    assert len(chunks) == pages
+    assert all(len(chunk) == PAGE_SIZE for chunk in chunks)
+    # 古い記事から順にページを埋める
+    assert [n for chunk in chunks for n in ids(chunk)] + ids(feed)[::-1] == list(range(count))
+    assert archive_pages == [ids(chunk) for chunk in chunks]
+
+
+def test_archive_pages_do_not_change_as_articles_are_added(monkeypatch):
+    monkeypatch.setattr(generate_rss, 'FEED_SIZE', FEED_SIZE)
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGE_SIZE', PAGE_SIZE)
+    published = {}
+    archive_pages = []
+    for count in range(0, 40):
+        _, chunks, archive_pages = generate_rss.split_archive(numbered(count), archive_pages)
+        for number, chunk in enumerate(chunks, 1):
+            # 一度アーカイブにしたページの内容は、その後も変わらない
+            assert published.setdefault(number, ids(chunk)) == ids(chunk)
+
+
+def test_late_older_article_does_not_shift_archive_pages(monkeypatch):
+    """古い日付の記事が後から届いても、公開済みのページの区切りは変わらない"""
+    monkeypatch.setattr(generate_rss, 'FEED_SIZE', FEED_SIZE)
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGE_SIZE', PAGE_SIZE)
+    articles = [{'id': f"a{n:03d}", 'date': article_date(n)} for n in range(14)]
+    _, before, archive_pages = generate_rss.split_archive(sort_articles(articles))
+    assert len(before) == 2
+
+    # 再試行キューから、最も古いアーカイブより古い日付の記事が届く
+    articles.append({'id': "late", 'date': "2025.12.31"})
+    latest, after, saved = generate_rss.split_archive(sort_articles(articles), archive_pages)
+    assert after == before
+    assert saved == archive_pages
+    assert ids(latest)[-1] == "late"
+
+    # 次のページは、まだアーカイブに載せていない記事から古い順に詰める
+    articles += [{'id': f"a{n:03d}", 'date': article_date(n)} for n in range(14, 17)]
+    latest, after, saved = generate_rss.split_archive(sort_articles(articles), saved)
+    assert after[:2] == before
+    assert ids(after[2]) == ["late", "a008", "a009", "a010"]
+    assert len(latest) == FEED_SIZE + 1
+
+
+def test_archive_page_keeps_its_place_when_an_article_drops_out(monkeypatch):
+    monkeypatch.setattr(generate_rss, 'FEED_SIZE', FEED_SIZE)
+    monkeypatch.setattr(generate_rss, 'ARCHIVE_PAGE_SIZE', PAGE_SIZE)
+    articles = numbered(14)
+    _, _, archive_pages = generate_rss.split_archive(articles)
+    # アーカイブの記事が（重複やエラーで）フィードから外れても、他の記事は別のページに移らない
+    latest, chunks, saved = generate_rss.split_archive([a for a in articles if a['id'] != 1], archive_pages)
+    assert [ids(chunk) for chunk in chunks] == [[0, 2, 3], [4, 5, 6, 7]]
+    assert saved == archive_pages
+    assert len(latest) == 6
+
+
+def test_write_feeds_marks_only_archives(docs):
+    articles = make_articles(docs / "articles", 14)
+    write_feeds(docs, articles)
+
+    feed = docs / "docs" / "feed.xml"
+    archives = sorted((docs / "docs" / "archive").glob("*.xml"))
+    assert [p.name for p in archives] == ["feed-1.xml", "feed-2.xml"]
+    assert feed_titles(feed) == [f"記事{n}" for n in range(13, 7, -1)]
+    assert feed_titles(archives[0]) == [f"記事{n}" for n in range(3, -1, -1)]
+    assert feed_titles(archives[1]) == [f"記事{n}" for n in range(7, 3, -1)]
+
+    assert "<fh:archive />" not in feed.read_text(encoding='utf-8')
+    assert all("<fh:archive />" in p.read_text(encoding='utf-8') for p in archives)
+    newest_archive = generate_rss.page_url(archives[1])
+    assert f'rel="prev-archive" href="{newest_archive}"' in feed.read_text(encoding='utf-8')
+    assert 'rel="next-archive"' in archives[0].read_text(encoding='utf-8')
+    assert 'rel="prev-archive"' in archives[1].read_text(encoding='utf-8')
+
+
+def test_published_archive_is_not_rewritten(docs):
+    articles = make_articles(docs / "articles", 14)
+    write_feeds(docs, articles)
+    archive = docs / "docs" / "archive" / "feed-1.xml"
+    before = without_build_date(archive)
+    mtime = archive.stat().st_mtime_ns
+
+    # 新しい記事が増えて最新のフィードから記事が外れても、既存のアーカイブは書き出し直さない
+    # （feed-2.xml は次のページへのリンクが増えるため書き出し直す）
+    articles = make_articles(docs / "articles", 19)
+    pages = write_feeds(docs, articles)
+    assert archive.stat().st_mtime_ns == mtime
+    assert without_build_date(archive) == before
+    assert (docs / "docs" / "archive" / "feed-3.xml").exists()
+    assert pages.kept >= 1
+
+
+def test_late_older_article_keeps_published_archives(docs):
+    articles = make_articles(docs / "articles", 14)
+    write_feeds(docs, articles)
+    archives = sorted((docs / "docs" / "archive").glob("*.xml"))
+    before = [without_build_date(path) for path in archives]
+
+    late = make_article(docs / "articles", 99, date="2025.12.31")
+    write_feeds(docs, sort_articles(articles + [late]))
+    assert [without_build_date(path) for path in archives] == before
+    assert feed_titles(docs / "docs" / "feed.xml")[-1] == "記事99"
+    assert (docs / "archive_pages.json").exists()
+
+
+def test_feed_pages_tracks_changes_and_removes_stale(tmp_path):
+    root = tmp_path / "docs"
+    (root / "archive").mkdir(parents=True)
+    page = root / "archive" / "feed-1.xml"
+    stale = root / "archive" / "feed-9.xml"
+    stale.write_text("old")
+
+    pages = FeedPages(path=tmp_path / "pages.json", root=root)
+    assert pages.changed(page, fingerprint('a')) is True
+    page.write_text("a")
+    pages.remove_stale(root / "archive")
+    pages.save()
+    assert not stale.exists()
+
+    pages = FeedPages(path=tmp_path / "pages.json", root=root)
+    assert pages.changed(page, fingerprint('a')) is False
+    assert pages.changed(page, fingerprint('b')) is True
+    # ファイルが無くなっていれば、指紋が同じでも書き出す
+    page.unlink()
+    assert FeedPages(path=tmp_path / "pages.json", root=root).changed(page, fingerprint('a')) is True
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import urllib.request
+from urllib.error import HTTPError
+
+import pytest
+
+from feed_server import FeedServer, parse_accept_encoding, etag_matches
+from precompress import precompress_docs
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "feed.xml").write_text("<rss>" + "記事" * 200 + "</rss>", encoding='utf-8')
+    precompress_docs(tmp_path)
+    server = FeedServer(tmp_path, port=0).start()
+    yield server
+    server.stop()
+
+
+def get(server, path, headers=None):
+    """ステータス・ヘッダー・本文を返す（304もそのまま返す）"""
+    request = urllib.request.Request(server.base_url + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.8, deflate;q=0") == {'gzip', 'br'}
+    assert parse_accept_encoding(None) == set()
+
+
+def test_etag_matches():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('*', '"a"')
+    assert not etag_matches('"a"', '"b"')
+
+
+def test_serves_precompressed_variant(server):
+    status, headers, body = get(server, "feed.xml", {'Accept-Encoding': 'gzip'})
+    assert status == 200
+    assert headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(body) == (server.root / "feed.xml").read_bytes()
+    assert headers['ETag'] == server.manifest['feed.xml']['encodings']['gzip']['etag']
+
+
+def test_conditional_requests(server):
+    _, headers, _ = get(server, "feed.xml")
+    assert get(server, "feed.xml", {'If-None-Match': headers['ETag']})[0] == 304
+    assert get(server, "feed.xml", {'If-Modified-Since': headers['Last-Modified']})[0] == 304
+    assert get(server, "feed.xml", {'If-None-Match': '"other"'})[0] == 200
+
+
+def test_same_size_rewrite_is_not_served_from_stale_manifest(server):
+    """etags.json の更新前に同じサイズの別の内容に書き換えられたファイルに、古いETagで304を返さない"""
+    _, headers, _ = get(server, "feed.xml")
+    path = server.root / "feed.xml"
+    path.write_text("<rss>" + "更新" * 200 + "</rss>", encoding='utf-8')
+
+    status, new_headers, body = get(server, "feed.xml", {'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert new_headers['ETag'] != headers['ETag']
+    assert 'Content-Encoding' not in new_headers
+    assert body == path.read_bytes()
+
+    # etags.json を作り直せば、また圧縮版とそのETagを使う
+    precompress_docs(server.root)
+    _, headers, _ = get(server, "feed.xml", {'Accept-Encoding': 'gzip'})
+    assert headers['Content-Encoding'] == 'gzip'
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+
+import pytest
+
+import image_store
+from image_store import ImageStore
+
+URL = "https://example.com/images/photo.jpg"
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    def make(**kwargs):
+        return ImageStore(tmp_path / "images" / "objects", tmp_path / "images" / "index.json", root=tmp_path,
+                          checks_file=tmp_path / ".cache" / "image_checks.json", **kwargs)
+    return make
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """image_store の time.time を固定した時計"""
+    now = {'value': 1_800_000_000.0}
+    monkeypatch.setattr(image_store.time, 'time', lambda: now['value'])
+    return now
+
+
+def test_put_deduplicates_by_content(make_store, tmp_path):
+    store = make_store()
+    first = store.put(URL, [b"image", b"data"], etag='"v1"')
+    second = store.put("https://example.com/other.jpg", [b"imagedata"])
+    assert first['path'] == second['path']
+    assert (tmp_path / first['path']).read_bytes() == b"imagedata"
+    assert store.lookup(URL) == first
+    assert store.conditional_headers(first) == {'If-None-Match': '"v1"'}
+
+
+def test_revalidation_time_is_not_in_committed_index(make_store, tmp_path, clock):
+    """304で再確認しても、コミットする索引は変わらない"""
+    store = make_store()
+    store.put(URL, [b"imagedata"], etag='"v1"')
+    store.save()
+    index_text = (tmp_path / "images" / "index.json").read_text(encoding='utf-8')
+    assert 'checked_at' not in index_text
+
+    clock['value'] += 8 * 24 * 60 * 60
+    store = make_store()
+    assert not store.is_fresh(URL)
+    store.touch(URL)
+    assert store.is_fresh(URL)
+    store.save()
+    assert (tmp_path / "images" / "index.json").read_text(encoding='utf-8') == index_text
+    assert make_store().is_fresh(URL)
+
+
+def test_missing_checks_file_revalidates(make_store, tmp_path, clock):
+    store = make_store()
+    store.put(URL, [b"imagedata"])
+    store.save()
+    (tmp_path / ".cache" / "image_checks.json").unlink()
+    store = make_store()
+    assert store.lookup(URL) is not None
+    assert not store.is_fresh(URL)
+
+
+def test_migrates_checked_at_from_old_index(make_store, tmp_path, clock):
+    store = make_store()
+    store.put(URL, [b"imagedata"])
+    store.save()
+    index_file = tmp_path / "images" / "index.json"
+    index = json.loads(index_file.read_text(encoding='utf-8'))
+    index[URL]['checked_at'] = clock['value']
+    index_file.write_text(json.dumps(index), encoding='utf-8')
+    (tmp_path / ".cache" / "image_checks.json").unlink()
+
+    store = make_store()
+    assert store.is_fresh(URL)
+    store.save()
+    assert 'checked_at' not in index_file.read_text(encoding='utf-8')
+
+
+def test_url_lock_excludes_and_is_released(make_store):
+    """同じURLのロックは同時に1つのスレッドだけが持ち、使い終わったら破棄する"""
+    store = make_store()
+    entered = threading.Event()
+    release = threading.Event()
+    acquired = threading.Event()
+
+    def hold():
+        with store.url_lock(URL):
+            entered.set()
+            release.wait(5)
+
+    def wait_for_lock():
+        with store.url_lock(URL):
+            acquired.set()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait(5)
+    waiter = threading.Thread(target=wait_for_lock)
+    waiter.start()
+    assert not acquired.wait(0.1)
+    # 別のURLは待たされない
+    with store.url_lock("https://example.com/other.jpg"):
+        pass
+
+    release.set()
+    holder.join(5)
+    waiter.join(5)
+    assert acquired.is_set()
+    assert store.url_locks == {}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import gzip
+import json
+
+import pytest
+
+from precompress import MANIFEST_NAME, available_encodings, compress, precompress_docs
+
+
+@pytest.fixture
+def docs(tmp_path):
+    (tmp_path / "archive").mkdir()
+    (tmp_path / "feed.xml").write_text("<rss>" + "記事" * 500 + "</rss>", encoding='utf-8')
+    (tmp_path / "archive" / "feed-1.xml").write_text("<rss>過去記事</rss>", encoding='utf-8')
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG")
+    return tmp_path
+
+
+def test_compress_is_deterministic():
+    data = "日経クロストレンド".encode('utf-8') * 100
+    for encoding in available_encodings():
+        assert compress(data, encoding) == compress(data, encoding)
+    assert gzip.decompress(compress(data, 'gzip')) == data
+
+
+def test_creates_variants_and_manifest(docs):
+    manifest = precompress_docs(docs)
+    assert sorted(manifest) == ["archive/feed-1.xml", "feed.xml"]
+
+    entry = manifest["feed.xml"]
+    data = (docs / "feed.xml").read_bytes()
+    assert entry['size'] == len(data)
+    assert entry['etag'] == f'"{entry["hash"]}"'
+    assert gzip.decompress((docs / "feed.xml.gz").read_bytes()) == data
+    assert set(entry['encodings']) == set(available_encodings())
+    # 表現ごとに異なる強いETag
+    etags = [entry['etag']] + [variant['etag'] for variant in entry['encodings'].values()]
+    assert len(set(etags)) == len(etags)
+    assert not (docs / "logo.png.gz").exists()
+    assert json.loads((docs / MANIFEST_NAME).read_text(encoding='utf-8')) == manifest
+
+
+def test_unchanged_content_keeps_manifest_after_checkout(docs):
+    """チェックアウトし直して更新時刻が変わっても、内容が同じならETagとLast-Modifiedを変えない"""
+    os.utime(docs / "feed.xml", (1_000_000_000, 1_000_000_000))
+    precompress_docs(docs)
+    manifest_text = (docs / MANIFEST_NAME).read_text(encoding='utf-8')
+    variant_mtime = (docs / "feed.xml.gz").stat().st_mtime_ns
+
+    for path in docs.rglob("*.xml"):
+        os.utime(path, None)
+    manifest = precompress_docs(docs)
+    assert (docs / MANIFEST_NAME).read_text(encoding='utf-8') == manifest_text
+    assert manifest["feed.xml"]['last_modified'] == "Sun, 09 Sep 2001 01:46:40 GMT"
+    assert (docs / "feed.xml.gz").stat().st_mtime_ns == variant_mtime
+
+
+def test_changed_content_gets_new_etag_and_last_modified(docs):
+    os.utime(docs / "feed.xml", (1_000_000_000, 1_000_000_000))
+    before = precompress_docs(docs)["feed.xml"]
+
+    (docs / "feed.xml").write_text("<rss>更新</rss>", encoding='utf-8')
+    after = precompress_docs(docs)["feed.xml"]
+    assert after['etag'] != before['etag']
+    assert after['last_modified'] != before['last_modified']
+    assert gzip.decompress((docs / "feed.xml.gz").read_bytes()) == "<rss>更新</rss>".encode('utf-8')
+
+
+def test_removes_variants_of_deleted_files(docs):
+    precompress_docs(docs)
+    (docs / "archive" / "feed-1.xml").unlink()
+    manifest = precompress_docs(docs)
+    assert "archive/feed-1.xml" not in manifest
+    assert list((docs / "archive").iterdir()) == []
+
+
+def test_recreates_missing_variant(docs):
+    precompress_docs(docs)
+    (docs / "feed.xml.gz").unlink()
+    precompress_docs(docs)
+    assert (docs / "feed.xml.gz").exists()
+
+
+def test_search_index_is_not_precompressed(docs):
+    """検索索引のシャードは圧縮版もETagも作らない（既に作られた圧縮版は削除する）"""
+    (docs / "search").mkdir()
+    (docs / "search" / "manifest.json").write_text('{"segments": []}', encoding='utf-8')
+    (docs / "search" / "s0-000.0123456789.json").write_text('{"ab": [1]}', encoding='utf-8')
+    (docs / "search" / "manifest.json.gz").write_bytes(b"old")
+
+    manifest = precompress_docs(docs)
+    assert sorted(manifest) == ["archive/feed-1.xml", "feed.xml"]
+    assert sorted(p.name for p in (docs / "search").iterdir()) == ["manifest.json", "s0-000.0123456789.json"]
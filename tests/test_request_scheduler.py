@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+import request_scheduler
+from conftest import FakeClock
+from request_scheduler import (DECREASE_COOLDOWN, DECREASE_FACTOR, INCREASE_STEP, MAX_RETRY_AFTER,
+                               SLOW_DECREASE_FACTOR, RequestOutcome, RequestScheduler, parse_retry_after)
+from retry_policy import CircuitBreaker, CircuitOpenError
+
+URL = "https://example.com/atcl/contents/1/"
+HOST = "example.com"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(request_scheduler.time, 'monotonic', clock)
+    monkeypatch.setattr(request_scheduler.time, 'sleep', clock.advance)
+    return clock
+
+
+def outcome(status=200, latency=0.1, retry_after=None, failed=False):
+    result = RequestOutcome()
+    result.status = status
+    result.latency = latency
+    result.retry_after = retry_after
+    result.failed = failed
+    return result
+
+
+def rate(scheduler):
+    return scheduler.hosts[HOST].rate
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('7') == 7.0
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after('100000') == MAX_RETRY_AFTER
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+
+
+def test_success_increases_rate(clock):
+    scheduler = RequestScheduler(initial_rate=1.0, max_rate=1.4)
+    scheduler.record(HOST, 'http', outcome())
+    assert rate(scheduler) == pytest.approx(1.0 + INCREASE_STEP)
+    scheduler.record(HOST, 'http', outcome())
+    assert rate(scheduler) == 1.4
+
+
+def test_throttle_halves_rate_once_per_cooldown(clock):
+    scheduler = RequestScheduler(initial_rate=4.0, min_rate=0.5)
+    scheduler.record(HOST, 'http', outcome(status=429))
+    assert rate(scheduler) == pytest.approx(4.0 * DECREASE_FACTOR)
+
+    # 同時に返ってきた失敗では何度も下げない
+    scheduler.record(HOST, 'http', outcome(status=429))
+    assert rate(scheduler) == pytest.approx(4.0 * DECREASE_FACTOR)
+
+    clock.advance(DECREASE_COOLDOWN)
+    scheduler.record(HOST, 'http', outcome(status=503))
+    assert rate(scheduler) == pytest.approx(4.0 * DECREASE_FACTOR ** 2)
+
+    clock.advance(DECREASE_COOLDOWN)
+    scheduler.record(HOST, 'http', outcome(failed=True, status=None))
+    assert rate(scheduler) == 0.5
+    assert scheduler.describe()[HOST]['throttled'] == 2
+    assert scheduler.describe()[HOST]['errors'] == 2
+
+
+def test_retry_after_blocks_host(clock, monkeypatch):
+    scheduler = RequestScheduler(initial_rate=10.0)
+    scheduler.record(HOST, 'http', outcome(status=429, retry_after=5))
+    assert scheduler.hosts[HOST].blocked_until == pytest.approx(clock.now + 5)
+
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        clock.advance(seconds)
+
+    monkeypatch.setattr(request_scheduler.time, 'sleep', sleep)
+    waited = scheduler.acquire_token(HOST)
+    assert waited >= 5
+    assert sum(slept) == pytest.approx(waited)
+
+
+def test_token_bucket_spaces_requests(clock):
+    scheduler = RequestScheduler(initial_rate=2.0)
+    assert scheduler.acquire_token(HOST) == 0
+    # 1つ目のトークンを使い切ると、次は 1/rate 秒待つ
+    assert scheduler.acquire_token(HOST) == pytest.approx(0.5)
+
+
+def test_slow_response_decreases_rate(clock):
+    scheduler = RequestScheduler(initial_rate=4.0)
+    scheduler.record(HOST, 'browser', outcome(latency=0.3))
+    before = rate(scheduler)
+    clock.advance(DECREASE_COOLDOWN)
+    scheduler.record(HOST, 'browser', outcome(latency=3.0))
+    assert rate(scheduler) == pytest.approx(before * SLOW_DECREASE_FACTOR)
+    # 応答時間は種類ごとに比べる（画像が遅くてもブラウザの基準では判定しない）
+    clock.advance(DECREASE_COOLDOWN)
+    scheduler.record(HOST, 'image', outcome(latency=3.0))
+    assert scheduler.describe()[HOST]['slow'] == 1
+
+
+def test_request_marks_exceptions_as_failures(clock):
+    scheduler = RequestScheduler(initial_rate=64.0)
+    with pytest.raises(RuntimeError):
+        with scheduler.request(URL):
+            raise RuntimeError("接続できません")
+    assert scheduler.describe()[HOST]['errors'] == 1
+
+
+def test_server_errors_open_the_breaker(clock):
+    scheduler = RequestScheduler(initial_rate=64.0, breaker=CircuitBreaker(threshold=2, open_seconds=60))
+    for _ in range(2):
+        with scheduler.request(URL) as result:
+            result.status = 503
+    with pytest.raises(CircuitOpenError):
+        with scheduler.request(URL):
+            pass
+
+
+def test_throttling_does_not_open_the_breaker(clock):
+    scheduler = RequestScheduler(initial_rate=64.0, breaker=CircuitBreaker(threshold=2))
+    for _ in range(3):
+        clock.advance(1)
+        with scheduler.request(URL) as result:
+            result.status = 429
+    # 429 はレートの調整で対応する
+    assert scheduler.describe()[HOST]['circuit']['failures'] == 0
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+import requests
+
+import retry_policy
+from conftest import FakeClock
+from retry_policy import CircuitBreaker, CircuitOpenError, FetchError, RetryPolicy, is_retryable, status_error
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(retry_policy.time, 'monotonic', clock)
+    return clock
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+@pytest.mark.parametrize('status, retryable', [(429, True), (503, True), (500, True), (404, False), (403, False)])
+def test_status_error(status, retryable):
+    error = status_error(status, "https://example.com/")
+    assert error.status == status
+    assert error.retryable is retryable
+    assert is_retryable(error) is retryable
+
+
+@pytest.mark.parametrize('error, retryable', [
+    (requests.Timeout(), True),
+    (requests.ConnectionError(), True),
+    (TimeoutError(), True),
+    (http_error(502), True),
+    (http_error(410), False),
+    (FetchError("解析できません", retryable=False), False),
+    (ValueError(), False),
+])
+def test_is_retryable(error, retryable):
+    assert is_retryable(error) is retryable
+
+
+def test_delay_is_bounded_by_exponential_cap(monkeypatch):
+    monkeypatch.setattr(retry_policy.random, 'uniform', lambda low, high: high)
+    policy = RetryPolicy(attempts=10, base_delay=1.0, max_delay=30.0)
+    assert [policy.delay(attempt) for attempt in range(1, 7)] == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0]
+
+
+def test_delay_waits_for_open_circuit():
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0)
+    assert policy.delay(1, CircuitOpenError('example.com', 12.0)) >= 12.0
+    # ブレーカーが閉じるまで待つと上限を超える場合は、この実行では再試行しない
+    assert policy.delay(1, CircuitOpenError('example.com', 60.0)) is None
+
+
+def test_should_retry():
+    policy = RetryPolicy(attempts=3)
+    assert policy.should_retry(1, requests.Timeout())
+    assert policy.should_retry(2, requests.Timeout())
+    assert not policy.should_retry(3, requests.Timeout())
+    assert not policy.should_retry(1, http_error(404))
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(threshold=3, open_seconds=60)
+    for _ in range(2):
+        breaker.before_request('example.com')
+        breaker.record('example.com', False)
+    breaker.before_request('example.com')
+    breaker.record('example.com', False)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request('example.com')
+    assert excinfo.value.retry_in == pytest.approx(60)
+    assert excinfo.value.retryable
+    # 他のホストへのリクエストは止めない
+    breaker.before_request('other.example.com')
+
+
+def test_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker(threshold=3)
+    for success in (False, False, True, False, False):
+        breaker.record('example.com', success)
+    breaker.before_request('example.com')
+    assert breaker.describe()['example.com'] == {'failures': 2, 'trips': 0, 'open': False}
+
+
+def test_breaker_half_open_allows_one_trial(clock):
+    breaker = CircuitBreaker(threshold=2, open_seconds=10)
+    breaker.record('example.com', False)
+    breaker.record('example.com', False)
+
+    clock.advance(10)
+    breaker.before_request('example.com')
+    # 試しのリクエストの結果が出るまでは他のリクエストを送らない
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request('example.com')
+
+    breaker.record('example.com', True)
+    breaker.before_request('example.com')
+    assert breaker.describe()['example.com']['open'] is False
+
+
+def test_breaker_doubles_open_time_when_trial_fails(clock):
+    breaker = CircuitBreaker(threshold=2, open_seconds=10, max_open_seconds=25)
+    breaker.record('example.com', False)
+    breaker.record('example.com', False)
+
+    expected = [20, 25]
+    for seconds in expected:
+        clock.advance(100)
+        breaker.before_request('example.com')
+        breaker.record('example.com', False)
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.before_request('example.com')
+        assert excinfo.value.retry_in == pytest.approx(seconds)
+
+
+def test_breaker_ignores_failures_while_open(clock):
+    breaker = CircuitBreaker(threshold=2, open_seconds=10)
+    breaker.record('example.com', False)
+    breaker.record('example.com', False)
+    clock.advance(5)
+    # 止める前に送ったリクエストの失敗では止め直さない
+    breaker.record('example.com', False)
+    with pytest.raises(CircuitOpenError) as excinfo:
+        breaker.before_request('example.com')
+    assert excinfo.value.retry_in == pytest.approx(5)
+    assert breaker.describe()['example.com']['trips'] == 1
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from run_journal import RunJournal
+
+WINDOW = ('2026.10.16', '2026.10.16')
+ARTICLES = [{'id': 'a', 'url': 'https://example.com/a/'}, {'id': 'b', 'url': 'https://example.com/b/'},
+            {'id': 'c', 'url': 'https://example.com/c/'}]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "run_journal.jsonl"
+
+
+def fetched(article_id):
+    return {'id': article_id, 'content': {'content_text': f"本文{article_id}"}}
+
+
+def test_replay_without_journal(path):
+    assert RunJournal(path).replay(WINDOW) is None
+
+
+def test_replay_restores_finished_articles(path):
+    journal = RunJournal(path)
+    journal.start(WINDOW, ARTICLES)
+    journal.append(fetched('a'))
+    journal.append({'id': 'b', 'error': "HTTP 503", 'retryable': True})
+    journal.close()
+
+    articles, finished, same_window = RunJournal(path).replay(WINDOW)
+    assert articles == ARTICLES
+    # 失敗した記事は取得済みとしない（再開時に取り直す）
+    assert finished == {'a': fetched('a')}
+    assert same_window is True
+
+
+def test_replay_resumes_appending(path):
+    journal = RunJournal(path)
+    journal.start(WINDOW, ARTICLES)
+    journal.append(fetched('a'))
+    journal.close()
+
+    journal = RunJournal(path)
+    journal.replay(WINDOW)
+    journal.append(fetched('c'))
+    journal.close()
+    assert set(RunJournal(path).replay(WINDOW)[1]) == {'a', 'c'}
+
+
+def test_replay_drops_partial_last_line(path):
+    journal = RunJournal(path)
+    journal.start(WINDOW, ARTICLES)
+    journal.append(fetched('a'))
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'article', 'article': fetched('b')})[:20])
+
+    journal = RunJournal(path)
+    assert set(journal.replay(WINDOW)[1]) == {'a'}
+    # 切り詰めた後の追記は新しい行から始まる
+    journal.append(fetched('b'))
+    journal.close()
+    assert set(RunJournal(path).replay(WINDOW)[1]) == {'a', 'b'}
+
+
+def test_replay_of_other_window_does_not_resume(path):
+    journal = RunJournal(path)
+    journal.start(('2026.10.15', '2026.10.15'), ARTICLES)
+    journal.append(fetched('a'))
+    journal.close()
+
+    journal = RunJournal(path)
+    articles, finished, same_window = journal.replay(WINDOW)
+    assert (articles, set(finished), same_window) == (ARTICLES, {'a'}, False)
+    # 別の期間のジャーナルには追記しない
+    journal.append(fetched('b'))
+    journal.close()
+    assert set(RunJournal(path).replay(WINDOW)[1]) == {'a'}
+
+
+def test_start_replaces_previous_journal(path):
+    journal = RunJournal(path)
+    journal.start(WINDOW, ARTICLES)
+    journal.append(fetched('a'))
+    journal.start(WINDOW, ARTICLES[:1])
+    journal.close()
+    assert RunJournal(path).replay(WINDOW)[:2] == (ARTICLES[:1], {})
+
+
+def test_finish_removes_journal(path):
+    journal = RunJournal(path)
+    journal.start(WINDOW, ARTICLES)
+    journal.finish()
+    assert not path.exists()
+    assert RunJournal(path).replay(WINDOW) is None
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+import search_index
+from search_index import (MANIFEST_NAME, SearchIndex, decode_postings, encode_postings, segment_shards, term_shard,
+                          tokenize)
+
+SHARDS = 16
+
+
+@pytest.fixture
+def site(tmp_path):
+    """記事のMarkdownのディレクトリと、索引の出力先"""
+    articles_dir = tmp_path / "articles"
+    articles_dir.mkdir()
+    return articles_dir, tmp_path / "search", tmp_path / "search_index.json"
+
+
+def write_article(articles_dir, number, body):
+    (articles_dir / f"a{number}.md").write_text(
+        f"# 記事{number}\n\n**公開日**: 2026.10.{number % 28 + 1:02d}\n\n{body}\n", encoding='utf-8'
+    )
+    return {'id': f"a{number}", 'title': f"記事{number}", 'url': f"https://example.com/{number}/",
+            'date': f"2026.10.{number % 28 + 1:02d}"}
+
+
+def open_index(site):
+    _, out_dir, state_file = site
+    return SearchIndex(out_dir, state_file, SHARDS)
+
+
+def urls(results):
+    return sorted(url for _, url, _ in results)
+
+
+def test_tokenize():
+    assert tokenize("AI活用") == {'ai', 'i活', '活用'}
+    assert tokenize("ＡＢＣ　店舗") == {'ab', 'bc', '店舗'}
+    assert tokenize("円") == {'円'}
+    assert tokenize("、。") == set()
+
+
+def test_postings_round_trip_and_shards():
+    assert decode_postings(encode_postings([3, 7, 8, 20])) == [3, 7, 8, 20]
+    assert all(0 <= term_shard(term, SHARDS) < SHARDS for term in tokenize("日経クロストレンドの記事"))
+    # クライアント側と同じ計算（FNV-1a）
+    assert term_shard('ab', 1 << 32) == 0x4d2505ca
+
+
+def test_build_and_search(site):
+    articles_dir = site[0]
+    articles = [
+        write_article(articles_dir, 1, "コンビニの新商品が若年層に人気です。"),
+        write_article(articles_dir, 2, "物流の自動化で店舗の在庫を減らします。"),
+        write_article(articles_dir, 3, "新商品の広告と店舗の売り上げ。"),
+    ]
+    result = open_index(site).update(articles, articles_dir)
+    assert result == {'added': 3, 'removed': 0, 'files': result['files'], 'rebuild': True}
+
+    index = open_index(site)
+    assert urls(index.search("新商品")) == ["https://example.com/1/", "https://example.com/3/"]
+    assert urls(index.search("店舗の在庫")) == ["https://example.com/2/"]
+    assert index.search("存在しない語句") == []
+    # メタデータ行（公開日など）は検索対象にしない
+    assert index.search("公開日") == []
+
+
+def test_touching_files_does_not_reindex(site):
+    """チェックアウトし直して更新時刻だけが変わっても、索引を作り直さない"""
+    articles_dir, out_dir, _ = site
+    articles = [write_article(articles_dir, n, f"記事{n}の本文です。") for n in range(20)]
+    open_index(site).update(articles, articles_dir)
+    files = sorted(p.name for p in out_dir.iterdir())
+
+    for path in articles_dir.iterdir():
+        os.utime(path, (1, 1))
+    assert open_index(site).update(articles, articles_dir) == {'added': 0, 'removed': 0, 'files': 0, 'rebuild': False}
+    assert sorted(p.name for p in out_dir.iterdir()) == files
+
+
+def test_changed_article_is_reindexed_incrementally(site):
+    articles_dir = site[0]
+    articles = [write_article(articles_dir, n, f"記事{n}の本文です。共通の話題。") for n in range(20)]
+    open_index(site).update(articles, articles_dir)
+
+    articles[4] = write_article(articles_dir, 4, "差し替えた本文で新しい話題を扱います。")
+    result = open_index(site).update(articles, articles_dir)
+    assert (result['added'], result['removed'], result['rebuild']) == (1, 1, False)
+
+    index = open_index(site)
+    assert urls(index.search("差し替え")) == ["https://example.com/4/"]
+    assert "https://example.com/4/" not in urls(index.search("共通の話題"))
+    assert len(index.search("共通の話題", limit=100)) == 19
+
+
+def test_title_change_is_reindexed(site):
+    articles_dir = site[0]
+    articles = [write_article(articles_dir, n, "本文。") for n in range(10)]
+    open_index(site).update(articles, articles_dir)
+
+    articles[0] = dict(articles[0], title="改題した見出し")
+    result = open_index(site).update(articles, articles_dir)
+    assert (result['added'], result['removed']) == (1, 1)
+    assert urls(open_index(site).search("改題")) == ["https://example.com/0/"]
+
+
+def test_removed_articles_trigger_rebuild(site):
+    articles_dir = site[0]
+    articles = [write_article(articles_dir, n, f"記事{n}の本文。") for n in range(10)]
+    open_index(site).update(articles, articles_dir)
+
+    # 1件の削除は削除済みの印を付けるだけ
+    result = open_index(site).update(articles[1:], articles_dir)
+    assert (result['removed'], result['rebuild']) == (1, False)
+    assert open_index(site).search("記事0の本文") == []
+
+    # 削除済みが2割を超えたら作り直す
+    result = open_index(site).update(articles[3:], articles_dir)
+    assert result['rebuild'] is True
+    assert result['added'] == 7
+
+
+def test_missing_manifest_triggers_rebuild(site):
+    articles_dir, out_dir, _ = site
+    articles = [write_article(articles_dir, n, "本文。") for n in range(3)]
+    open_index(site).update(articles, articles_dir)
+    (out_dir / MANIFEST_NAME).unlink()
+    assert open_index(site).update(articles, articles_dir)['rebuild'] is True
+
+
+def test_segment_shards():
+    assert segment_shards(0) == 1
+    assert segment_shards(search_index.POSTINGS_PER_SHARD + 1) == 2
+    assert segment_shards(10 ** 9, 1024) == 1024
+
+
+def test_daily_update_keeps_existing_segment_files(site, monkeypatch):
+    """記事を追加しても、既存のセグメントのシャードは書き換えない"""
+    monkeypatch.setattr(search_index, 'POSTINGS_PER_SHARD', 16)
+    articles_dir, out_dir, _ = site
+    articles = [write_article(articles_dir, n, f"記事{n}の本文です。共通の話題。") for n in range(30)]
+    open_index(site).update(articles, articles_dir)
+    base = {p.name for p in out_dir.glob("s*.json")}
+    assert len(base) > 8
+
+    articles.append(write_article(articles_dir, 30, "追加した記事の新しい話題。"))
+    result = open_index(site).update(articles, articles_dir)
+    assert base <= {p.name for p in out_dir.glob("s*.json")}
+    assert result['files'] < len(base)
+
+    index = open_index(site)
+    assert len(index.manifest['segments']) == 2
+    assert urls(index.search("新しい話題")) == ["https://example.com/30/"]
+    assert len(index.search("共通の話題", limit=100)) == 30
+
+
+def test_segments_are_merged(site):
+    articles_dir = site[0]
+    articles = [write_article(articles_dir, 0, "最初の記事。")]
+    open_index(site).update(articles, articles_dir)
+    for n in range(1, 33):
+        articles.append(write_article(articles_dir, n, f"{n}日目の記事です。共通の話題。"))
+        open_index(site).update(articles, articles_dir)
+
+    index = open_index(site)
+    # 同じ大きさの追加が続けばセグメント数は記事数の対数程度
+    assert len(index.manifest['segments']) <= 6
+    starts = [segment['start'] for segment in index.manifest['segments']]
+    assert starts == sorted(starts)
+    assert len(index.search("共通の話題", limit=100)) == 32
+    assert urls(index.search("17日目")) == ["https://example.com/17/"]
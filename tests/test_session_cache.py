@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import stat
+
+import pytest
+
+pytest.importorskip('cryptography')
+
+import session_cache
+from session_cache import SessionCache
+
+NOW = 1_800_000_000.0
+COOKIES = [
+    {'name': 'xtsession', 'value': 'token', 'domain': 'xtrend.nikkei.com', 'path': '/'},
+    {'name': 'remember', 'value': '1', 'domain': 'xtrend.nikkei.com', 'path': '/', 'expiry': int(NOW) + 3600},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """session_cache の time.time を固定した時計"""
+    now = {'value': NOW}
+    monkeypatch.setattr(session_cache.time, 'time', lambda: now['value'])
+    return now
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / ".cache" / "session.bin"
+
+
+def test_save_and_load_round_trip(clock, path):
+    SessionCache("secret", path=path, ttl=600).save(COOKIES)
+    assert SessionCache("secret", path=path, ttl=600).load() == COOKIES
+
+
+def test_cache_file_is_private(clock, path):
+    SessionCache("secret", path=path).save(COOKIES)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert b'token' not in path.read_bytes()
+
+
+def test_expired_cache_is_cleared(clock, path):
+    SessionCache("secret", path=path, ttl=600).save(COOKIES)
+    clock['value'] += 600
+    assert SessionCache("secret", path=path, ttl=600).load() is None
+    assert not path.exists()
+
+
+def test_expired_cookies_are_dropped(clock, path):
+    SessionCache("secret", path=path, ttl=24 * 60 * 60).save(COOKIES)
+    clock['value'] += 3600
+    assert SessionCache("secret", path=path).load() == COOKIES[:1]
+
+
+def test_wrong_key_is_treated_as_corrupt(clock, path):
+    SessionCache("secret", path=path).save(COOKIES)
+    assert SessionCache("other", path=path).load() is None
+    assert not path.exists()
+
+
+def test_corrupt_file_is_cleared(clock, path):
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a fernet token")
+    assert SessionCache("secret", path=path).load() is None
+    assert not path.exists()
+
+
+@pytest.mark.parametrize('payload', [b'{"saved_at": 0, "expires_at": 9999999999}', b'[]', b'{"cookies": null}'])
+def test_payload_without_cookies_is_cleared(clock, path, payload):
+    cache = SessionCache("secret", path=path)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(cache.fernet.encrypt(payload))
+    assert cache.load() is None
+    assert not path.exists()
+
+
+def test_disabled_without_secret(path):
+    cache = SessionCache("", path=path)
+    cache.save(COOKIES)
+    assert not cache.enabled
+    assert cache.load() is None
+    assert not path.exists()
+
+
+def test_default_ttl_outlives_daily_runs(clock, path):
+    """1日1回の実行でも、前日に保存したセッションを再利用できる"""
+    SessionCache("secret", path=path).save(COOKIES[:1])
+    clock['value'] += 25 * 60 * 60
+    assert SessionCache("secret", path=path).load() == COOKIES[:1]